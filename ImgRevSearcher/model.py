@@ -1,12 +1,46 @@
 import io
 from pathlib import Path
 from typing import Any, Optional
+from httpx import URL, Limits, Timeout
 from PIL import Image, ImageDraw, ImageFont
-from .utils import Network
+from .utils import (
+    AdaptiveTimeout,
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    DownloadLimits,
+    FaultInjector,
+    FaultRule,
+    HedgePolicy,
+    NearDuplicateIndex,
+    Network,
+    PersistentResultCache,
+    ProxyPool,
+    ProxySpec,
+    RateLimit,
+    RateLimitExceeded,
+    RenderCache,
+    ResultCache,
+    RetryPolicy,
+    SingleFlight,
+    StoredResult,
+    bandwidth_meter,
+    client_pool,
+    dns_cache,
+    http_cache,
+    image_hashes,
+    is_engine_failure,
+    rate_limiter,
+    stream_download,
+)
+from .utils.api_request.base_req import BaseSearchReq
+from .utils.upload import ImageBuffer, load_image
 from .utils.types import FileContent
 from .utils.api_request import AnimeTrace, BaiDu, Bing, Copyseeker, EHentai, GoogleLens, SauceNAO, Tineye
 import time
 import asyncio
+import hashlib
+import json
 
 
 ENGINE_MAP = {
@@ -20,6 +54,25 @@ ENGINE_MAP = {
     "tineye": Tineye,
 }
 
+# 无结果缓存中每个条目的估算字节数
+NEGATIVE_ENTRY_SIZE = 256
+
+# 结果图像的渲染设置，修改渲染布局时同时递增RENDER_VERSION，使已缓存的结果图像失效
+RENDER_VERSION = 1
+RESULT_IMAGE_QUALITY = 85
+RESULT_MAX_SOURCE_WIDTH = 800
+
+ENGINE_WARMUP_URLS = {
+    "animetrace": ["https://api.animetrace.com"],
+    "baidu": ["https://graph.baidu.com"],
+    "bing": ["https://www.bing.com"],
+    "copyseeker": ["https://copyseeker.net"],
+    "ehentai": ["https://upld.e-hentai.org"],
+    "google": ["https://lens.google.com", "https://www.google.com"],
+    "saucenao": ["https://saucenao.com"],
+    "tineye": ["https://tineye.com"],
+}
+
 
 class BaseSearchModel:
     """
@@ -31,7 +84,17 @@ class BaseSearchModel:
 
     def __init__(self, proxies: Optional[str] = None, cookies: Optional[dict] = None,
                  timeout: int = 60, default_params: Optional[dict] = None, 
-                 default_cookies: Optional[dict] = None, auto_google_config: Optional[dict] = None):
+                 default_cookies: Optional[dict] = None, auto_google_config: Optional[dict] = None,
+                 http2_modes: Optional[dict] = None, connection_settings: Optional[dict] = None,
+                 retry_settings: Optional[dict] = None, hedge_settings: Optional[dict] = None,
+                 circuit_breaker: Optional[dict] = None, rate_limit: Optional[dict] = None,
+                 download_settings: Optional[dict] = None, proxy_routing: Optional[dict] = None,
+                 proxy_servers: Optional[list[str]] = None, proxy_pool: Optional[dict] = None,
+                 dns_settings: Optional[dict] = None, fault_injection: Optional[dict] = None,
+                 http_cache_settings: Optional[dict] = None, adaptive_timeout: Optional[dict] = None,
+                 result_cache: Optional[dict] = None, persistent_cache: Optional[dict] = None,
+                 data_dir: Optional[str] = None, near_duplicate: Optional[dict] = None,
+                 negative_cache: Optional[dict] = None, render_cache: Optional[dict] = None):
         """
         初始化搜索模型
 
@@ -41,6 +104,26 @@ class BaseSearchModel:
             timeout: 请求超时时间(秒)
             default_params: 各引擎的默认参数
             default_cookies: 各引擎的默认Cookie
+            http2_modes: 各引擎的HTTP/2模式(auto/on/off)，默认off
+            connection_settings: 各引擎的连接数、keep-alive及分阶段超时设置
+            retry_settings: 各引擎的重试次数与退避参数
+            hedge_settings: 各引擎的对冲请求设置
+            circuit_breaker: 熔断器设置，为每个引擎维护独立的熔断器
+            rate_limit: 各引擎的限流速率、突发数与最长排队时间
+            download_settings: 图片下载的大小上限(MB)与内存缓冲阈值(MB)
+            proxy_routing: 各引擎的代理路由(default/direct/pool/命名代理/代理地址)
+            proxy_servers: 命名代理列表，每项格式为 名称=代理地址
+            proxy_pool: 代理池设置，包括代理列表、剔除阈值与剔除时间
+            dns_settings: DNS缓存设置，包括是否启用及各项缓存时间
+            fault_injection: 故障注入设置，按引擎主机注入延迟与错误，仅用于本地压测
+            http_cache_settings: GET响应缓存设置，包括容量及各引擎的启发式缓存有效期
+            adaptive_timeout: 各引擎按历史耗时计算请求超时的设置
+            result_cache: 搜索结果缓存设置(默认不启用)，包括容量及各引擎的缓存有效期
+            persistent_cache: 持久化结果缓存设置(默认不启用，且需同时启用搜索结果缓存)，包括容量、批量写入间隔与过期清理间隔
+            data_dir: 插件数据目录，持久化结果缓存的数据库存放于此
+            near_duplicate: 近似重复图像查找设置(默认不启用)，包括dHash/pHash最大汉明距离、有效期与索引容量
+            negative_cache: 无结果缓存设置(默认不启用)，包括各引擎的缓存有效期
+            render_cache: 结果图像缓存设置(默认不启用)，包括内存容量与磁盘溢出容量，溢出目录位于插件数据目录下
         """
         self.proxies = proxies
         self.cookies = cookies
@@ -48,8 +131,353 @@ class BaseSearchModel:
         self.default_params = default_params or {}
         self.default_cookies = default_cookies or {}
         self.auto_google_config = auto_google_config or {}
+        self.http2_modes = http2_modes or {}
+        self.connection_settings = connection_settings or {}
+        self.retry_settings = retry_settings or {}
+        self.hedge_settings = hedge_settings or {}
+        self.adaptive_timeout_settings = adaptive_timeout or {}
+        self.rate_limit_settings = rate_limit or {}
+        download_config = download_settings or {}
+        self.proxy_routing = proxy_routing or {}
+        self.proxy_servers: dict[str, str] = {}
+        for entry in proxy_servers or []:
+            name, sep, address = str(entry).partition("=")
+            if sep and name.strip() and address.strip():
+                self.proxy_servers[name.strip()] = address.strip()
+        pool_config = proxy_pool or {}
+        pool_proxies = [
+            self.proxy_servers.get(str(item).strip(), str(item).strip())
+            for item in pool_config.get("proxies") or []
+            if str(item).strip()
+        ]
+        self.proxy_pool: Optional[ProxyPool] = None
+        if pool_proxies:
+            self.proxy_pool = ProxyPool(
+                "pool",
+                pool_proxies,
+                failure_threshold=pool_config.get("failure_threshold", 3),
+                eject_seconds=pool_config.get("eject_seconds", 60),
+            )
+        self.download_limits = DownloadLimits(
+            max_bytes=int(download_config.get("max_size_mb", 20) * 1024 * 1024),
+            spool_threshold=int(download_config.get("spool_threshold_mb", 2) * 1024 * 1024),
+        )
+        dns_config = dns_settings or {}
+        if dns_config.get("enabled", True):
+            dns_cache.configure(
+                ttl=dns_config.get("ttl", 300),
+                min_ttl=dns_config.get("min_ttl", 30),
+                max_ttl=dns_config.get("max_ttl", 3600),
+                stale_ttl=dns_config.get("stale_ttl", 3600),
+            )
+            client_pool.dns_cache = dns_cache
+        else:
+            client_pool.dns_cache = None
+        client_pool.fault_injector = self._build_fault_injector(fault_injection or {})
+        self.http_cache_settings = http_cache_settings or {}
+        if self.http_cache_settings.get("enabled", False):
+            http_cache.configure(
+                max_bytes=int(self.http_cache_settings.get("max_size_mb", 32) * 1024 * 1024),
+                max_entry_bytes=int(self.http_cache_settings.get("max_entry_mb", 4) * 1024 * 1024),
+            )
+        breaker_config = circuit_breaker or {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        if breaker_config.get("enabled", True):
+            self._breakers = {
+                api: CircuitBreaker(
+                    failure_threshold=breaker_config.get("failure_threshold", 5),
+                    window=breaker_config.get("window", 60),
+                    recovery_timeout=breaker_config.get("recovery_timeout", 30),
+                )
+                for api in ENGINE_MAP
+            }
         self._google_cookie = None
         self._google_cookie_timestamp = 0
+        self._warmup_timestamps: dict[str, float] = {}
+        self._flights: SingleFlight[Optional[str]] = SingleFlight()
+        self.result_cache_settings = result_cache or {}
+        self.result_cache = ResultCache(int(self.result_cache_settings.get("max_size_mb", 64) * 1024 * 1024))
+        self.negative_cache_settings = negative_cache or {}
+        # 无结果缓存只记录键，每个条目按NEGATIVE_ENTRY_SIZE估算占用
+        self.negative_cache = ResultCache(NEGATIVE_ENTRY_SIZE * self.negative_cache_settings.get("max_entries", 10000))
+        near_duplicate_config = near_duplicate or {}
+        self.near_duplicates: Optional[NearDuplicateIndex] = None
+        if near_duplicate_config.get("enabled", False):
+            self.near_duplicates = NearDuplicateIndex(
+                max_distance=near_duplicate_config.get("max_distance", 6),
+                ttl=near_duplicate_config.get("ttl", 3600),
+                max_entries=near_duplicate_config.get("max_entries", 10000),
+                max_phash_distance=near_duplicate_config.get("max_phash_distance", 8),
+            )
+        render_config = render_cache or {}
+        self.render_cache: Optional[RenderCache] = None
+        if render_config.get("enabled", False):
+            spill_dir = None
+            if data_dir and render_config.get("spill_to_disk", True):
+                spill_dir = Path(data_dir) / "render_cache"
+            self.render_cache = RenderCache(
+                max_bytes=int(render_config.get("max_size_mb", 32) * 1024 * 1024),
+                spill_dir=spill_dir,
+                max_spill_bytes=int(render_config.get("max_disk_mb", 256) * 1024 * 1024),
+            )
+        persistent_config = persistent_cache or {}
+        self.persistent_cache: Optional[PersistentResultCache] = None
+        if data_dir and persistent_config.get("enabled", False) and self.result_cache_settings.get("enabled", False):
+            self.persistent_cache = PersistentResultCache(
+                Path(data_dir) / "result_cache.sqlite3",
+                max_bytes=int(persistent_config.get("max_size_mb", 256) * 1024 * 1024),
+                flush_interval=persistent_config.get("flush_interval", 2.0),
+                sweep_interval=persistent_config.get("sweep_interval", 600),
+            )
+
+    def _resolve_proxy(self, api: str) -> ProxySpec:
+        """
+        按代理路由确定引擎使用的代理
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            ProxySpec: 代理地址、代理池，或None表示直连
+        """
+        route = str(self.proxy_routing.get(api) or "default").strip()
+        if route.lower() == "direct":
+            return None
+        if route.lower() == "pool" and self.proxy_pool is not None:
+            return self.proxy_pool
+        if route in self.proxy_servers:
+            return self.proxy_servers[route]
+        if "://" in route:
+            return route
+        return self.proxies or None
+
+    def _build_network_kwargs(self, api: str) -> dict:
+        """
+        构建指定引擎使用的网络客户端参数（不含Cookie）
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            dict: Network初始化参数
+        """
+        network_kwargs = {}
+        settings = self.connection_settings.get(api, {})
+        proxies = self._resolve_proxy(api)
+        if proxies:
+            network_kwargs["proxies"] = proxies
+        if self.timeout or settings:
+            network_kwargs["timeout"] = Timeout(
+                self.timeout,
+                connect=settings.get("connect_timeout") or self.timeout,
+                read=settings.get("read_timeout") or self.timeout,
+                write=settings.get("write_timeout") or self.timeout,
+                pool=settings.get("pool_timeout") or self.timeout,
+            )
+        if settings:
+            network_kwargs["limits"] = Limits(
+                max_connections=settings.get("max_connections") or None,
+                max_keepalive_connections=settings.get("max_keepalive_connections") or None,
+                keepalive_expiry=settings.get("keepalive_expiry", 5.0),
+            )
+        network_kwargs["http2"] = self.http2_modes.get(api, "off")
+        return network_kwargs
+
+    def _build_retry_policy(self, api: str) -> RetryPolicy:
+        """
+        构建指定引擎的重试策略，重试总耗时不超过搜索超时时间
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            RetryPolicy: 重试策略
+        """
+        settings = self.retry_settings.get(api, {})
+        return RetryPolicy(
+            max_attempts=max(1, settings.get("max_attempts", 1)),
+            base_delay=settings.get("base_delay", 0.5),
+            max_delay=settings.get("max_delay", 5.0),
+            budget=self.timeout or None,
+        )
+
+    def _build_hedge_policy(self, api: str) -> HedgePolicy:
+        """
+        构建指定引擎的对冲请求策略
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            HedgePolicy: 对冲请求策略
+        """
+        settings = self.hedge_settings.get(api, {})
+        return HedgePolicy(
+            enabled=settings.get("enabled", False),
+            quantile=settings.get("quantile", 0.95),
+            min_samples=settings.get("min_samples", 20),
+            min_delay=settings.get("min_delay", 0.5),
+        )
+
+    def _build_timeout_policy(self, api: str) -> AdaptiveTimeout:
+        """
+        构建指定引擎的自适应超时策略，超时上限默认为搜索超时时间
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            AdaptiveTimeout: 自适应超时策略
+        """
+        settings = self.adaptive_timeout_settings.get(api, {})
+        return AdaptiveTimeout(
+            enabled=settings.get("enabled", False),
+            quantile=settings.get("quantile", 0.99),
+            factor=settings.get("factor", 3.0),
+            min_timeout=settings.get("min_timeout", 5.0),
+            max_timeout=settings.get("max_timeout") or self.timeout or None,
+            min_samples=settings.get("min_samples", 20),
+        )
+
+    def _build_rate_limit(self, api: str) -> Optional[RateLimit]:
+        """
+        构建指定引擎的静态限流配置
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            Optional[RateLimit]: 限流配置，未配置时返回None
+        """
+        settings = self.rate_limit_settings.get(api)
+        if not settings:
+            return None
+        return RateLimit(
+            requests_per_minute=settings.get("requests_per_minute", 0),
+            burst=settings.get("burst", 1),
+            max_wait=settings.get("max_wait", 10.0),
+        )
+
+    def _build_fault_injector(self, settings: dict) -> Optional[FaultInjector]:
+        """
+        根据配置构建故障注入器，规则作用于各引擎的主机及其子域名
+
+        参数:
+            settings: 故障注入配置
+
+        返回:
+            Optional[FaultInjector]: 未启用或没有生效的规则时返回None
+        """
+        if not settings.get("enabled", False):
+            return None
+        rules: dict[str, FaultRule] = {}
+        for api in ENGINE_MAP:
+            engine_settings = settings.get(api, {})
+            statuses = [s.strip() for s in str(engine_settings.get("error_statuses", "")).split(",")]
+            rule = FaultRule(
+                latency=engine_settings.get("latency", 0.0),
+                jitter=engine_settings.get("jitter", 0.0),
+                distribution=engine_settings.get("distribution", "uniform"),
+                connect_error_rate=engine_settings.get("connect_error_rate", 0.0),
+                error_rate=engine_settings.get("error_rate", 0.0),
+                error_statuses=tuple(int(s) for s in statuses if s.isdigit()) or FaultRule.error_statuses,
+                retry_after=engine_settings.get("retry_after") or None,
+                drop_rate=engine_settings.get("drop_rate", 0.0),
+                truncate_rate=engine_settings.get("truncate_rate", 0.0),
+            )
+            if rule.is_active():
+                rules.update((URL(url).host, rule) for url in self._get_warmup_urls(api))
+        if not rules:
+            return None
+        seed = settings.get("seed", 0)
+        return FaultInjector(rules, seed=seed or None)
+
+    def _build_cache_kwargs(self, api: str) -> dict:
+        """
+        构建指定引擎的GET响应缓存参数
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            dict: 传递给请求类的http_cache与cache_ttl，未启用缓存时为空
+        """
+        if not self.http_cache_settings.get("enabled", False):
+            return {}
+        return {
+            "http_cache": http_cache,
+            "cache_ttl": self.http_cache_settings.get(api, {}).get("heuristic_ttl", 0),
+        }
+
+    def _get_warmup_urls(self, api: str) -> list[str]:
+        """
+        获取引擎搜索时会访问的主机地址
+
+        参数:
+            api: 搜索引擎API名称
+
+        返回:
+            list[str]: 需要预热的URL列表
+        """
+        if api == "ehentai" and self.default_params.get("ehentai", {}).get("is_ex"):
+            return ["https://upld.exhentai.org"]
+        return ENGINE_WARMUP_URLS.get(api, [])
+
+    async def prewarm(self, engines: list[str], min_interval: float = 0, timeout: float = 10) -> None:
+        """
+        预热引擎主机连接
+
+        对引擎主机发送HEAD请求，提前完成DNS解析、TCP连接和TLS握手，
+        建立的连接保留在共享连接池中，供随后的搜索请求直接复用
+
+        参数:
+            engines: 需要预热的引擎名称列表
+            min_interval: 同一引擎两次预热的最小间隔(秒)，间隔内的重复预热会被跳过
+            timeout: 单个预热请求的超时时间(秒)
+
+        返回:
+            None
+        """
+        now = time.time()
+        targets = []
+        for api in engines:
+            if api not in ENGINE_MAP or now - self._warmup_timestamps.get(api, 0) < min_interval:
+                continue
+            self._warmup_timestamps[api] = now
+            targets.extend((api, url) for url in self._get_warmup_urls(api))
+
+        async def warm(api: str, url: str) -> None:
+            try:
+                async with Network(**{**self._build_network_kwargs(api), "timeout": timeout}) as client:
+                    await client.head(url)
+            except Exception:
+                pass
+
+        await asyncio.gather(*(warm(api, url) for api, url in targets))
+
+    async def prefetch_dns(self, engines: list[str]) -> None:
+        """
+        预解析引擎主机及代理主机的DNS
+
+        只解析主机名而不建立连接，使首次连接时直接使用缓存的解析结果；
+        未启用DNS缓存时不做任何操作
+
+        参数:
+            engines: 需要预解析的引擎名称列表
+
+        返回:
+            None
+        """
+        if client_pool.dns_cache is None:
+            return
+        urls = [url for api in engines if api in ENGINE_MAP for url in self._get_warmup_urls(api)]
+        urls.extend(self.proxy_servers.values())
+        if self.proxies:
+            urls.append(self.proxies)
+        if self.proxy_pool is not None:
+            urls.extend(self.proxy_pool.snapshot())
+        hosts = {URL(url).host for url in urls if "://" in url}
+        await client_pool.dns_cache.prefetch(host for host in hosts if host)
 
     def _prepare_engine_params(self, api: str, search_params: dict) -> dict:
         """
@@ -134,8 +562,8 @@ class BaseSearchModel:
         """
         if isinstance(file, (str, Path)):
             return str(file).lower().endswith('.gif')
-        elif isinstance(file, bytes):
-            return file.startswith((b'GIF87a', b'GIF89a'))
+        elif isinstance(file, (bytes, memoryview)):
+            return bytes(file[:6]) in (b'GIF87a', b'GIF89a')
         return False
 
     async def _convert_gif_to_jpeg(self, file: FileContent) -> bytes:
@@ -149,7 +577,7 @@ class BaseSearchModel:
             bytes: 转换后的JPEG格式图像数据
         """
         def convert_image():
-            if isinstance(file, bytes):
+            if isinstance(file, (bytes, memoryview)):
                 img_data = file
             else:
                 with open(file, 'rb') as f:
@@ -166,6 +594,14 @@ class BaseSearchModel:
         """
         执行图像反向搜索
 
+        相同引擎、相同图像内容(规范化后)和相同有效参数的并发搜索会合并为一次请求，
+        所有调用方共享同一结果。整次搜索(包括引擎的所有请求步骤)的耗时不超过timeout。
+        相同键的搜索在结果缓存有效期内直接使用缓存的解析结果，不发出任何网络请求；
+        已知无结果的搜索在无结果缓存有效期内直接返回None。
+        内存中没有时再查询持久化结果缓存，命中的结果同时放回内存缓存。
+        仍未命中且启用了近似重复查找时，按图像的感知哈希查找近期搜索过的近似重复图像(重新压缩、缩放后的同一张图)，
+        找到时直接返回其搜索结果
+
         参数:
             api: 搜索引擎API名称
             file: 本地文件内容
@@ -177,6 +613,8 @@ class BaseSearchModel:
 
         异常:
             ValueError: 当API不支持或参数错误时抛出
+            CircuitOpenError: 当引擎因连续失败被熔断时抛出
+            RateLimitExceeded: 当引擎请求过于频繁且排队时间超过限流配置时抛出
         """
         if api not in ENGINE_MAP:
             available = ", ".join(ENGINE_MAP.keys())
@@ -185,29 +623,200 @@ class BaseSearchModel:
             raise ValueError("必须提供 file 或 url 参数")
         if file and url:
             raise ValueError("file 和 url 参数不能同时提供")
-        if file and not url and self._is_gif(file):
+        deadline = Deadline(self.timeout or None)
+        if file:
+            file = await self._normalize_file(file)
+        key = self._flight_key(api, file, url, kwargs)
+        cached = self.result_cache.get(key)
+        if cached is not None:
+            return self._show_result(cached)
+        if self.negative_cache.get(key) is not None:
+            return None
+        if self.persistent_cache is not None:
+            stored = await self.persistent_cache.get(key)
+            if stored is not None:
+                # 放回内存缓存时只保留该条目剩余的有效期，避免每次放回都延长过期时间
+                stored_result, expires_at = stored
+                ttl = expires_at - time.time()
+                self.result_cache.put(key, StoredResult(stored_result), ttl, len(stored_result.encode("utf-8")))
+                return stored_result
+        hashes = None
+        if file and self.near_duplicates is not None:
+            hashes = await asyncio.to_thread(image_hashes, file)
+            if hashes is not None:
+                near = self.near_duplicates.lookup((api, key[2]), hashes)
+                if near is not None:
+                    return near[1]
+        result = await self._flights.do(key, lambda: self._search_once(api, file, url, deadline, key, **kwargs))
+        if hashes is not None and result is not None:
+            self.near_duplicates.add((api, key[2]), hashes, result)
+        return result
+
+    async def _normalize_file(self, file: FileContent) -> ImageBuffer:
+        """
+        将本地文件内容规范化为实际上传的图像数据，GIF会被转换为JPEG
+
+        文件路径在事件循环之外读取，较大的文件以内存映射方式打开，整个搜索过程只保留一份图像数据
+
+        参数:
+            file: 本地文件内容
+
+        返回:
+            ImageBuffer: 规范化后的图像数据
+        """
+        file = await load_image(file)
+        if self._is_gif(file):
             file = await self._convert_gif_to_jpeg(file)
+        return file
+
+    def _flight_key(self, api: str, file: Optional[ImageBuffer], url: Optional[str], kwargs: dict) -> tuple[str, str, str]:
+        """
+        构建请求合并键
+
+        参数:
+            api: 搜索引擎API名称
+            file: 规范化后的图像数据
+            url: 图像URL
+            kwargs: 调用方传入的搜索参数
+
+        返回:
+            tuple[str, str, str]: (引擎, 图像内容摘要或URL, 有效参数)
+        """
+        source = hashlib.sha256(file).hexdigest() if file else f"url:{url}"
+        params = {**self.default_params.get(api, {}), **kwargs}
+        return api, source, json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+    async def _search_once(self, api: str, file: Optional[ImageBuffer] = None,
+                           url: Optional[str] = None, deadline: Optional[Deadline] = None,
+                           cache_key: Optional[tuple[str, str, str]] = None, **kwargs: Any) -> Optional[str]:
+        """
+        执行一次未合并的搜索，包括熔断检查、网络搜索与结果格式化
+
+        参数:
+            api: 搜索引擎API名称
+            file: 规范化后的图像数据
+            url: 图像URL
+            deadline: 整次搜索的截止时间
+            cache_key: 结果缓存键，提供时成功解析的响应写入结果缓存，确认无结果的键写入无结果缓存
+            **kwargs: 其他搜索参数
+
+        返回:
+            Optional[str]: 搜索结果文本，搜索失败或超出时间预算时返回None
+
+        异常:
+            CircuitOpenError: 当引擎因连续失败被熔断时抛出
+            RateLimitExceeded: 当引擎请求过于频繁且排队时间超过限流配置时抛出
+        """
+        breaker = self._breakers.get(api)
+        if breaker and not breaker.allow_request():
+            raise CircuitOpenError(api, breaker.retry_after())
+        status_codes: list[int] = []
+        try:
+            response, engine = await self._search_engine(api, file, url, deadline, status_codes=status_codes, **kwargs)
+        except RateLimitExceeded:
+            if breaker:
+                breaker.release_probe()
+            raise
+        except Exception as e:
+            if breaker:
+                # 只有传输层错误与429/5xx计入熔断，截止时间耗尽、解析器异常等本地错误只释放探测名额
+                if is_engine_failure(e, status_codes):
+                    breaker.record_failure()
+                else:
+                    breaker.release_probe()
+            return None
+        if breaker:
+            if is_engine_failure(None, engine.status_codes):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        try:
+            result = response.show_result()
+        except Exception:
+            return None
+        genuine_miss = (
+            result is None
+            and getattr(response, "confirmed_empty", False)
+            and bool(engine.status_codes)
+            and max(engine.status_codes) < 400
+        )
+        if cache_key is not None and genuine_miss and self.negative_cache_settings.get("enabled", False):
+            # 只有解析器确认引擎搜索成功且没有结果时才缓存，引擎以200返回的错误、限流、验证码页面都不缓存
+            ttl = self.negative_cache_settings.get(api, {}).get("ttl", 300)
+            self.negative_cache.put(cache_key, True, ttl, NEGATIVE_ENTRY_SIZE)
+        if cache_key is not None and result is not None and self.result_cache_settings.get("enabled", False):
+            ttl = self.result_cache_settings.get(api, {}).get("ttl", 3600)
+            # 解析结果的内存占用按解析的响应体字节数与结果文本长度估算
+            self.result_cache.put(cache_key, response, ttl, engine.transfer.body_decoded + len(result.encode("utf-8")))
+            if self.persistent_cache is not None:
+                self.persistent_cache.put(cache_key, api, result, ttl)
+        return result
+
+    @staticmethod
+    def _show_result(response: Any) -> Optional[str]:
+        """
+        将解析后的搜索响应格式化为结果文本
+
+        参数:
+            response: 引擎解析后的搜索响应对象
+
+        返回:
+            Optional[str]: 结果文本，格式化失败时返回None
+        """
         try:
-            engine_class = ENGINE_MAP[api]
-            default_params = self.default_params.get(api, {})
-            search_params = {**default_params, **kwargs}
-            network_kwargs = {}
-            if self.proxies:
-                network_kwargs["proxies"] = self.proxies
-            effective_cookies = None
-            if api == "google":
-                effective_cookies = await self._get_google_cookie()
-            elif api in self.default_cookies:
-                effective_cookies = self.default_cookies.get(api)
-            elif self.cookies:
-                effective_cookies = self.cookies
-            if effective_cookies:
-                network_kwargs["cookies"] = effective_cookies
-            if self.timeout:
-                network_kwargs["timeout"] = self.timeout
-            async with Network(**network_kwargs) as client:
-                engine_params = self._prepare_engine_params(api, search_params)
-                engine_instance = engine_class(client=client, **engine_params)
+            return response.show_result()
+        except Exception:
+            return None
+
+    async def _search_engine(self, api: str, file: FileContent = None,
+                             url: Optional[str] = None, deadline: Optional[Deadline] = None,
+                             status_codes: Optional[list[int]] = None,
+                             **kwargs: Any) -> tuple[Any, BaseSearchReq]:
+        """
+        调用搜索引擎执行一次实际的网络搜索
+
+        参数:
+            api: 搜索引擎API名称
+            file: 本地文件内容
+            url: 图像URL
+            deadline: 整次搜索的截止时间，引擎的每个请求步骤只使用剩余预算
+            status_codes: 提供时追加各请求的HTTP状态码，搜索抛出异常时同样追加，用于熔断判断
+            **kwargs: 其他搜索参数
+
+        返回:
+            tuple[Any, BaseSearchReq]: 引擎解析后的搜索响应对象及发出请求的引擎实例(含流量统计与各请求的状态码)
+
+        异常:
+            Exception: 网络请求或响应解析失败时抛出
+        """
+        engine_class = ENGINE_MAP[api]
+        default_params = self.default_params.get(api, {})
+        search_params = {**default_params, **kwargs}
+        network_kwargs = self._build_network_kwargs(api)
+        effective_cookies = None
+        if api == "google":
+            effective_cookies = await self._get_google_cookie()
+        elif api in self.default_cookies:
+            effective_cookies = self.default_cookies.get(api)
+        elif self.cookies:
+            effective_cookies = self.cookies
+        if effective_cookies:
+            network_kwargs["cookies"] = effective_cookies
+        async with Network(**network_kwargs) as client:
+            engine_params = self._prepare_engine_params(api, search_params)
+            engine_instance = engine_class(
+                client=client,
+                engine=api,
+                retry_policy=self._build_retry_policy(api),
+                hedge_policy=self._build_hedge_policy(api),
+                timeout_policy=self._build_timeout_policy(api),
+                rate_limit=self._build_rate_limit(api),
+                download_limits=self.download_limits,
+                deadline=deadline,
+                **self._build_cache_kwargs(api),
+                **engine_params
+            )
+            try:
                 if api == "animetrace" and search_params.get("base64"):
                     response = await engine_instance.search(
                         base64=search_params.pop("base64"),
@@ -216,9 +825,101 @@ class BaseSearchModel:
                     )
                 else:
                     response = await engine_instance.search(file=file, url=url, **search_params)
-                return response.show_result()
-        except Exception:
-            return None
+            finally:
+                bandwidth_meter.record_search(api, engine_instance.transfer)
+                if status_codes is not None:
+                    status_codes.extend(engine_instance.status_codes)
+            return response, engine_instance
+
+    def get_circuit_states(self) -> dict[str, dict[str, Any]]:
+        """
+        获取各引擎熔断器的当前状态
+
+        返回:
+            dict[str, dict[str, Any]]: 引擎名称 -> 熔断器状态，未启用熔断时为空
+        """
+        return {api: breaker.snapshot() for api, breaker in self._breakers.items()}
+
+    def get_proxy_states(self) -> dict[str, dict[str, Any]]:
+        """
+        获取代理池中各代理的健康状态
+
+        返回:
+            dict[str, dict[str, Any]]: 代理地址 -> 健康状态，未配置代理池时为空
+        """
+        return self.proxy_pool.snapshot() if self.proxy_pool else {}
+
+    def get_bandwidth_stats(self) -> dict[str, Any]:
+        """
+        获取各引擎及各请求步骤的流量统计和最近搜索的流量
+
+        返回:
+            dict[str, Any]: 引擎 -> 步骤 -> 收发字节数，以及最近搜索的流量列表
+        """
+        return bandwidth_meter.snapshot()
+
+    def get_http_cache_stats(self) -> dict[str, Any]:
+        """
+        获取GET响应缓存的命中统计
+
+        返回:
+            dict[str, Any]: 条目数、占用字节数及命中/未命中/重新验证/淘汰次数
+        """
+        return http_cache.snapshot()
+
+    def get_result_cache_stats(self) -> dict[str, Any]:
+        """
+        获取搜索结果缓存的命中统计
+
+        返回:
+            dict[str, Any]: 条目数、占用字节数及命中/未命中/淘汰次数
+        """
+        return self.result_cache.snapshot()
+
+    async def get_persistent_cache_stats(self) -> dict[str, Any]:
+        """
+        获取持久化结果缓存的统计
+
+        返回:
+            dict[str, Any]: 条目数、占用字节数及命中/未命中/写入/淘汰次数，未启用时为空
+        """
+        return await self.persistent_cache.snapshot() if self.persistent_cache else {}
+
+    def get_near_duplicate_stats(self) -> dict[str, Any]:
+        """
+        获取近似重复图像索引的统计
+
+        返回:
+            dict[str, Any]: 条目数、搜索范围数及命中/未命中次数，未启用时为空
+        """
+        return self.near_duplicates.snapshot() if self.near_duplicates else {}
+
+    def get_negative_cache_stats(self) -> dict[str, Any]:
+        """
+        获取无结果缓存的命中统计
+
+        返回:
+            dict[str, Any]: 条目数及命中/未命中/淘汰次数
+        """
+        return self.negative_cache.snapshot()
+
+    def get_render_cache_stats(self) -> dict[str, Any]:
+        """
+        获取结果图像缓存的命中统计
+
+        返回:
+            dict[str, Any]: 内存与磁盘的条目数、占用字节数及命中/未命中/淘汰次数，未启用时为空
+        """
+        return self.render_cache.snapshot() if self.render_cache else {}
+
+    def get_rate_limit_states(self) -> dict[str, dict[str, Any]]:
+        """
+        获取各引擎主机令牌桶的当前状态
+
+        返回:
+            dict[str, dict[str, Any]]: 主机名 -> 令牌桶状态
+        """
+        return rate_limiter.snapshot()
 
     async def search_and_print(self, api: str, file: FileContent = None,
                                url: Optional[str] = None, **kwargs: Any) -> None:
@@ -237,6 +938,8 @@ class BaseSearchModel:
         try:
             result = await self.search(api=api, file=file, url=url, **kwargs)
             print(result)
+        except (CircuitOpenError, RateLimitExceeded) as e:
+            print(f"❌ {e}")
         except Exception:
             print(f"❌ {api} 搜索失败")
 
@@ -262,7 +965,7 @@ class BaseSearchModel:
                 if file is not None:
                     if isinstance(file, (str, Path)):
                         return Image.open(file)
-                    elif isinstance(file, bytes):
+                    elif isinstance(file, (bytes, memoryview)):
                         return Image.open(io.BytesIO(file))
                 return None
             
@@ -270,16 +973,21 @@ class BaseSearchModel:
                 source_image = await asyncio.to_thread(load_image)
             elif url is not None:
                 network_kwargs = {}
-                if self.proxies:
-                    network_kwargs["proxies"] = self.proxies
+                # 下载源图像与该引擎的搜索请求使用同一代理路由
+                proxies = self._resolve_proxy(api)
+                if proxies:
+                    network_kwargs["proxies"] = proxies
                 if self.timeout:
                     network_kwargs["timeout"] = self.timeout
                 async with Network(**network_kwargs) as client:
-                    response = await client.get(url)
-                    img_data = await response.aread()
-                    source_image = await asyncio.to_thread(lambda: Image.open(io.BytesIO(img_data)))
+                    img_buffer, _ = await stream_download(client, url, self.download_limits)
+                    source_image = await asyncio.to_thread(Image.open, img_buffer)
             
             return await asyncio.to_thread(self.draw_results, api, result, source_image)
+        except CircuitOpenError:
+            return await asyncio.to_thread(self.draw_error, api, "引擎暂时不可用")
+        except RateLimitExceeded:
+            return await asyncio.to_thread(self.draw_error, api, "请求过于频繁")
         except Exception:
             return await asyncio.to_thread(self.draw_error, api, "搜索失败")
 
@@ -301,6 +1009,17 @@ class BaseSearchModel:
 错误信息: {friendly_msg}
 {'=' * 50}"""
 
+    async def close(self) -> None:
+        """
+        释放搜索模型持有的资源，写入持久化缓存中排队的结果并关闭共享连接池中的所有连接
+
+        返回:
+            None
+        """
+        if self.persistent_cache is not None:
+            await self.persistent_cache.close()
+        await client_pool.close()
+
     @classmethod
     def get_supported_engines(cls) -> list[str]:
         """
@@ -311,6 +1030,71 @@ class BaseSearchModel:
         """
         return list(ENGINE_MAP.keys())
 
+    async def render_results(self, api: str, result: str, source: Optional[ImageBuffer] = None) -> bytes:
+        """
+        将搜索结果渲染为JPEG编码的结果图像
+
+        相同引擎、相同结果文本、相同源图像与相同渲染设置的结果图像只渲染一次，
+        之后直接从结果图像缓存中取出编码后的图像，不再经过缩放、排版与编码。
+        源图像无法解码或渲染失败时返回错误提示图像，错误提示图像不缓存
+
+        参数:
+            api: 搜索引擎API名称
+            result: 搜索结果文本
+            source: 源图像数据（可选）
+
+        返回:
+            bytes: JPEG编码的结果图像
+        """
+        return await asyncio.to_thread(self._render_results, api, result, source)
+
+    def _render_results(self, api: str, result: str, source: Optional[ImageBuffer]) -> bytes:
+        """
+        在线程中查找结果图像缓存，未命中时渲染、编码并写入缓存
+
+        参数:
+            api: 搜索引擎API名称
+            result: 搜索结果文本
+            source: 源图像数据
+
+        返回:
+            bytes: JPEG编码的结果图像
+        """
+        key = (
+            api,
+            hashlib.sha256(result.encode("utf-8")).hexdigest(),
+            hashlib.sha256(source).hexdigest() if source else "",
+            f"v{RENDER_VERSION}:jpeg:{RESULT_IMAGE_QUALITY}:{RESULT_MAX_SOURCE_WIDTH}",
+        )
+        if self.render_cache is not None:
+            cached = self.render_cache.get(key)
+            if cached is not None:
+                return cached
+        try:
+            source_image = Image.open(io.BytesIO(source)) if source else None
+            result_img = self.draw_results(api, result, source_image)
+        except Exception as e:
+            return self._encode_image(self.draw_error(api, str(e)))
+        data = self._encode_image(result_img)
+        if self.render_cache is not None:
+            self.render_cache.put(key, data)
+        return data
+
+    @staticmethod
+    def _encode_image(img: Image.Image) -> bytes:
+        """
+        将图像编码为JPEG
+
+        参数:
+            img: 需要编码的图像
+
+        返回:
+            bytes: JPEG编码的图像
+        """
+        output = io.BytesIO()
+        img.save(output, format="JPEG", quality=RESULT_IMAGE_QUALITY)
+        return output.getvalue()
+
     def draw_results(self, api: str, result: str, source_image: Optional[Image.Image] = None) -> Image.Image:
         """
         绘制搜索结果图像
@@ -350,7 +1134,7 @@ class BaseSearchModel:
         source_img_height = 0
         source_img_width = 0
         if source_image:
-            max_source_width = 800
+            max_source_width = RESULT_MAX_SOURCE_WIDTH
             orig_width, orig_height = source_image.size
             if orig_width > max_source_width:
                 ratio = max_source_width / orig_width
@@ -1,14 +1,86 @@
+from .adaptive_timeout import AdaptiveTimeout
 from .api_request import AnimeTrace, BaiDu, Bing, Copyseeker, EHentai, GoogleLens, SauceNAO, Tineye
-from .network import Network
+from .bandwidth import BandwidthMeter, TransferStats, bandwidth_meter
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, is_engine_failure
+from .deadline import Deadline, DeadlineExceeded
+from .dns_cache import CachingNetworkBackend, DNSCache, dns_cache
+from .download import DownloadLimits, DownloadStats, DownloadTooLarge, stream_download
+from .fault_injection import FaultInjector, FaultRule
+from .hedge import HedgePolicy
+from .http_cache import HttpCache, http_cache
+from .latency import LatencyTracker, latency_tracker
+from .network import ClientPool, Network, client_pool
+from .perceptual import BKTree, ImageHashes, NearDuplicateIndex, dhash, hamming, image_hashes
+from .persistent_cache import PersistentResultCache, StoredResult
+from .proxy_pool import ProxyPool, ProxySpec
+from .rate_limiter import RateLimit, RateLimiter, RateLimitExceeded, rate_limiter
+from .render_cache import RenderCache
+from .result_cache import ResultCache
+from .retry import RetryPolicy
+from .singleflight import SingleFlight
+from .stream_match import LineMatcher, MarkerMatcher, StreamMatcher
+from .upload import BufferReader, close_buffer, load_image, open_upload, release_view, view_buffer
 
 __all__ = [
+    "AdaptiveTimeout",
     "AnimeTrace",
+    "BKTree",
     "BaiDu",
+    "BandwidthMeter",
     "Bing",
+    "BufferReader",
+    "CachingNetworkBackend",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "ClientPool",
     "Copyseeker",
+    "DNSCache",
+    "Deadline",
+    "DeadlineExceeded",
+    "DownloadLimits",
+    "DownloadStats",
+    "DownloadTooLarge",
     "EHentai",
+    "FaultInjector",
+    "FaultRule",
     "GoogleLens",
+    "HedgePolicy",
+    "HttpCache",
+    "ImageHashes",
+    "LatencyTracker",
+    "LineMatcher",
+    "MarkerMatcher",
+    "NearDuplicateIndex",
     "Network",
+    "PersistentResultCache",
+    "ProxyPool",
+    "ProxySpec",
+    "RateLimit",
+    "RateLimitExceeded",
+    "RateLimiter",
+    "RenderCache",
+    "ResultCache",
+    "RetryPolicy",
     "SauceNAO",
+    "SingleFlight",
+    "StoredResult",
+    "StreamMatcher",
     "Tineye",
+    "TransferStats",
+    "bandwidth_meter",
+    "client_pool",
+    "close_buffer",
+    "dhash",
+    "dns_cache",
+    "hamming",
+    "http_cache",
+    "image_hashes",
+    "is_engine_failure",
+    "latency_tracker",
+    "load_image",
+    "open_upload",
+    "rate_limiter",
+    "release_view",
+    "stream_download",
+    "view_buffer",
 ]
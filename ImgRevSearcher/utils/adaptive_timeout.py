@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from typing import Optional
+from .latency import LatencyTracker
+
+
+@dataclass
+class AdaptiveTimeout:
+    """
+    自适应超时策略数据类
+
+    以该步骤历史耗时的指定分位数乘以系数作为请求超时，并限制在[min_timeout, max_timeout]之间。
+    超时的请求以当时的超时时间计入耗时统计，耗时整体变慢时超时会随之逐步放宽；
+    耗时变快后旧样本滚出统计窗口，超时随之收紧
+    """
+    enabled: bool = False
+    quantile: float = 0.99
+    factor: float = 3.0
+    min_timeout: float = 5.0
+    max_timeout: Optional[float] = None
+    min_samples: int = 20
+
+    def timeout_for(self, tracker: LatencyTracker, engine: str, step: str) -> Optional[float]:
+        """
+        计算请求步骤的超时时间
+
+        参数:
+            tracker: 耗时统计
+            engine: 引擎名称
+            step: 请求步骤名称
+
+        返回:
+            Optional[float]: 超时秒数，未启用或样本不足时返回None(使用客户端的静态超时)
+        """
+        if not self.enabled or tracker.count(engine, step) < self.min_samples:
+            return None
+        observed = tracker.percentile(engine, step, self.quantile)
+        if observed is None:
+            return None
+        timeout = max(self.min_timeout, observed * self.factor)
+        if self.max_timeout is not None:
+            timeout = min(self.max_timeout, timeout)
+        return timeout
@@ -1,9 +1,8 @@
-from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
 from typing_extensions import override
 from ..response_parser import AnimeTraceResponse
-from ..ext_tools import read_file
+from ..upload import open_upload
 from .base_req import BaseSearchReq
 
 
@@ -73,12 +72,16 @@ class AnimeTrace(BaseSearchReq[AnimeTraceResponse]):
             data = {"url": url, **params}
             resp = await self._send_request(
                 method="post",
+                step="search",
+                idempotent=True,
                 json=data,
             )
         elif file:
-            files = {"file": read_file(file)}
+            files = {"file": await open_upload(file)}
             resp = await self._send_request(
                 method="post",
+                step="search",
+                idempotent=True,
                 files=files,
                 data=params or None,
             )
@@ -86,8 +89,10 @@ class AnimeTrace(BaseSearchReq[AnimeTraceResponse]):
             data = {"base64": base64, **params}
             resp = await self._send_request(
                 method="post",
+                step="search",
+                idempotent=True,
                 json=data,
             )
         else:
             raise ValueError("One of 'url', 'file', or 'base64' must be provided")
-        return AnimeTraceResponse(json_loads(resp.text), resp.url)
+        return AnimeTraceResponse(resp.json(), resp.url)
@@ -1,11 +1,10 @@
-from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
-from lxml.html import HTMLParser, fromstring
-from pyquery import PyQuery
 from typing_extensions import override
 from ..response_parser import BaiDuResponse
-from ..ext_tools import deep_get, read_file
+from ..ext_tools import deep_get, json_loads
+from ..upload import as_upload, close_buffer, open_upload, view_buffer
+from ..stream_match import MarkerMatcher
 from .base_req import BaseSearchReq
 
 
@@ -27,23 +26,21 @@ class BaiDu(BaseSearchReq[BaiDuResponse]):
         super().__init__(base_url, **request_kwargs)
 
     @staticmethod
-    def _extract_card_data(data: PyQuery) -> list[dict[str, Any]]:
+    def _extract_card_data(fragment: bytes) -> list[dict[str, Any]]:
         """
-        从页面中提取卡片数据
+        从页面脚本片段中提取卡片数据
         
         参数:
-            data: PyQuery对象，包含页面HTML
+            fragment: 从window.cardData开始到脚本结束之前的页面片段
             
         返回:
             list[dict[str, Any]]: 提取的卡片数据列表
         """
-        for script in data("script").items():
-            script_text = script.text()
-            if script_text and "window.cardData" in script_text:
-                start = script_text.find("[")
-                end = script_text.rfind("]") + 1
-                return json_loads(script_text[start:end])
-        return []
+        start = fragment.find(b"[")
+        end = fragment.rfind(b"]") + 1
+        if start == -1 or end <= start:
+            return []
+        return json_loads(fragment[start:end])
 
     @override
     async def search(
@@ -67,36 +64,51 @@ class BaiDu(BaseSearchReq[BaiDuResponse]):
             ValueError: 当未提供url或file参数时抛出
         """
         data = {"from": "pc"}
+        buffer = None
+        view = None
         if url:
-            files = {"image": await self.download(url)}
+            buffer = await self.download(url)
+            # 以视图上传，避免httpx对SpooledTemporaryFile调用fileno()迫使其转存到磁盘
+            view = view_buffer(buffer)
+            files = {"image": ("upload", as_upload(view))}
         elif file:
-            files = {"image": read_file(file)}
+            files = {"image": await open_upload(file)}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
-        resp = await self._send_request(
-            method="post",
-            endpoint="upload",
-            headers={"Acs-Token": ""},
-            data=data,
-            files=files,
-        )
-        data_url = deep_get(json_loads(resp.text), "data.url")
+        try:
+            resp = await self._send_request(
+                method="post",
+                step="upload",
+                idempotent=True,
+                endpoint="upload",
+                headers={"Acs-Token": ""},
+                data=data,
+                files=files,
+            )
+        finally:
+            # 较大的下载内容存放在临时文件中，上传后立即关闭以释放文件
+            if buffer is not None:
+                close_buffer(buffer, view)
+        data_url = deep_get(resp.json(), "data.url")
         if not data_url:
             return BaiDuResponse({}, resp.url)
-        resp = await self._send_request(method="get", url=data_url)
-        utf8_parser = HTMLParser(encoding="utf-8")
-        data = PyQuery(fromstring(resp.text, parser=utf8_parser))
-        card_data = self._extract_card_data(data)
+        resp = await self._send_request(
+            method="get",
+            url=data_url,
+            step="result_page",
+            matcher=MarkerMatcher(b"window.cardData", b"</script>"),
+        )
+        card_data = self._extract_card_data(resp.content)
         same_data = None
         for card in card_data:
             if card.get("cardName") == "noresult":
-                return BaiDuResponse({}, data_url)
+                return BaiDuResponse({}, data_url, no_result=True)
             if card.get("cardName") == "same":
                 same_data = card["tplData"]
             if card.get("cardName") == "simipic":
                 next_url = card["tplData"]["firstUrl"]
-                resp = await self._send_request(method="get", url=next_url)
-                resp_data = json_loads(resp.text)
+                resp = await self._send_request(method="get", url=next_url, step="simipic")
+                resp_data = resp.json()
                 if same_data:
                     resp_data["same"] = same_data
                 return BaiDuResponse(resp_data, data_url)
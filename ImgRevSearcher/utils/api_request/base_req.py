@@ -1,10 +1,24 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Generic, Optional, TypeVar
+from typing import IO, Any, Awaitable, Generic, Optional, TypeVar
+from httpx import URL, TimeoutException
 from ..response_parser.base_parser import BaseSearchResponse
-from ..network import RESP, HandOver
+from ..adaptive_timeout import AdaptiveTimeout
+from ..bandwidth import TransferStats, bandwidth_meter
+from ..deadline import Deadline
+from ..download import ProgressCallback
+from ..hedge import HedgePolicy, run_hedged
+from ..latency import latency_tracker
+from ..network import HEDGE_EXTENSION, RESP, ROUTE_EXTENSION, HandOver
+from ..stream_match import StreamMatcher
+from ..rate_limiter import RateLimit, rate_limiter
+from ..retry import RETRYABLE_STATUS_CODES, RetryPolicy, classify_error, parse_retry_after
 from ..types import FileContent
 
 ResponseT = TypeVar("ResponseT")
+# 估算步骤耗时所需的最少历史样本数，样本不足时不因预计耗时跳过步骤
+EXPECTED_DURATION_MIN_SAMPLES = 5
 T = TypeVar("T", bound=BaseSearchResponse[Any])
 
 
@@ -17,16 +31,40 @@ class BaseSearchReq(HandOver, ABC, Generic[T]):
     """
     base_url: str
 
-    def __init__(self, base_url: str, **request_kwargs: Any):
+    def __init__(
+        self,
+        base_url: str,
+        engine: Optional[str] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        timeout_policy: Optional[AdaptiveTimeout] = None,
+        rate_limit: Optional[RateLimit] = None,
+        deadline: Optional[Deadline] = None,
+        **request_kwargs: Any,
+    ):
         """
         初始化搜索请求基类
         
         参数:
             base_url: 搜索引擎API的基础URL
+            engine: 引擎名称，用于按引擎统计请求耗时，默认使用类名小写
+            retry_policy: 请求重试策略，默认不重试
+            hedge_policy: 对冲请求策略，默认不启用
+            timeout_policy: 按历史耗时计算各步骤超时的自适应超时策略，默认使用客户端的静态超时
+            rate_limit: 静态限流配置，按请求主机共享令牌桶，默认不限速
+            deadline: 整次搜索的截止时间，所有请求步骤共享，默认不限制
             **request_kwargs: 请求参数，传递给HandOver类
         """
         super().__init__(**request_kwargs)
         self.base_url = base_url
+        self.engine: str = engine or type(self).__name__.lower()
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.hedge_policy: HedgePolicy = hedge_policy or HedgePolicy()
+        self.timeout_policy: AdaptiveTimeout = timeout_policy or AdaptiveTimeout()
+        self.rate_limit: Optional[RateLimit] = rate_limit
+        self.deadline: Deadline = deadline or Deadline()
+        self.transfer: TransferStats = TransferStats()
+        self.status_codes: list[int] = []
 
     @abstractmethod
     async def search(
@@ -51,14 +89,34 @@ class BaseSearchReq(HandOver, ABC, Generic[T]):
         """
         raise NotImplementedError
 
-    async def _send_request(self, method: str, endpoint: str = "", url: str = "", **kwargs: Any) -> RESP:
+    async def _send_request(
+        self,
+        method: str,
+        endpoint: str = "",
+        url: str = "",
+        idempotent: Optional[bool] = None,
+        step: str = "",
+        matcher: Optional[StreamMatcher] = None,
+        **kwargs: Any,
+    ) -> RESP:
         """
         发送HTTP请求
         
+        按重试策略对瞬时错误(连接失败、代理错误、502/503/504、429等)进行带抖动的指数退避重试。
+        请求未发出的错误对任何步骤都会重试，请求可能已被处理的错误只对可安全重复的步骤重试。
+        可安全重复且不上传文件的步骤在启用对冲策略时，超过历史分位耗时仍未返回会发出对冲请求。
+        每次发出请求前从主机的令牌桶获取令牌，收到429时暂停该主机的令牌发放。
+        提供matcher时以流式方式读取响应，所需片段到达后立即关闭连接。
+        每次尝试只能使用整次搜索剩余的时间预算，剩余预算不足以完成该步骤(按历史中位耗时估算)时直接放弃。
+        启用自适应超时时按该步骤的历史耗时设置超时，超时的尝试以超时时间计入耗时统计
+        
         参数:
             method: HTTP方法(get/post)
             endpoint: API端点路径
             url: 完整的请求URL，如果提供则忽略base_url和endpoint
+            idempotent: 该步骤是否可安全重复，默认GET为是、POST为否
+            step: 请求步骤名称，用于耗时统计，默认为HTTP方法名
+            matcher: 流式匹配器，提供时返回只包含匹配片段的StreamResult
             **kwargs: 其他请求参数
             
         返回:
@@ -66,13 +124,165 @@ class BaseSearchReq(HandOver, ABC, Generic[T]):
             
         异常:
             ValueError: 当提供了不支持的HTTP方法时抛出
+            RateLimitExceeded: 令牌不足且排队时间超过限流配置的最长等待时间时抛出
+            DeadlineExceeded: 剩余时间预算不足以完成该步骤时抛出
         """
         request_url = url or (f"{self.base_url}/{endpoint}" if endpoint else self.base_url)
         method = method.lower()
+        if method not in ("get", "post"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
         if method == "get":
             kwargs.pop("files", None)
-            return await self.get(request_url, **kwargs)
-        elif method == "post":
-            return await self.post(request_url, **kwargs)
+        if idempotent is None:
+            idempotent = method == "get"
+        step = step or method
+        hedgeable = idempotent and not kwargs.get("files")
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_after = None
+            self.deadline.check(step, self._expected_duration(step))
+            step_timeout = None if "timeout" in kwargs else self.timeout_policy.timeout_for(
+                latency_tracker, self.engine, step
+            )
+            attempt_kwargs = kwargs if step_timeout is None else {**kwargs, "timeout": step_timeout}
+            try:
+                resp = await self.deadline.run(
+                    step, self._dispatch(method, request_url, step, hedgeable, matcher, **attempt_kwargs)
+                )
+            except Exception as e:
+                if step_timeout is not None and isinstance(e, TimeoutException):
+                    # 以超时时间作为样本，耗时整体变慢时超时会随分位数逐步放宽
+                    latency_tracker.record(self.engine, step, step_timeout)
+                error_kind = classify_error(e)
+                if not policy.should_retry(error_kind, idempotent, attempt):
+                    raise
+                failure: Optional[Exception] = e
+            else:
+                self.status_codes.append(resp.status_code)
+                retry_after = parse_retry_after(resp.headers.get("retry-after"))
+                if resp.status_code == 429:
+                    rate_limiter.penalize(URL(request_url).host, retry_after)
+                if resp.status_code not in RETRYABLE_STATUS_CODES or not policy.should_retry(
+                    "status", idempotent, attempt
+                ):
+                    return resp
+                failure = None
+            delay = policy.compute_delay(attempt, retry_after)
+            if not policy.fits_budget(self.deadline.elapsed(), delay) or not self.deadline.allows(delay):
+                if failure is not None:
+                    raise failure
+                return resp
+            await asyncio.sleep(delay)
+
+    def _expected_duration(self, step: str) -> float:
+        """
+        按历史中位耗时估算步骤耗时
+
+        参数:
+            step: 请求步骤名称
+
+        返回:
+            float: 预计耗时(秒)，样本不足时为0
+        """
+        if latency_tracker.count(self.engine, step) < EXPECTED_DURATION_MIN_SAMPLES:
+            return 0.0
+        return latency_tracker.percentile(self.engine, step, 0.5) or 0.0
+
+    async def download(
+        self,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> IO[bytes]:
+        """
+        在剩余时间预算内以流式方式下载文件
+        
+        参数:
+            url: 下载URL
+            headers: 自定义HTTP头部
+            on_progress: 下载进度回调
+            
+        返回:
+            IO[bytes]: 已定位到开头的内容缓冲区
+            
+        异常:
+            DeadlineExceeded: 剩余时间预算内未能完成下载时抛出
+        """
+        self.deadline.check("download")
+        buffer = await self.deadline.run("download", super().download(url, headers=headers, on_progress=on_progress))
+        if self.last_download is not None:
+            self._record_transfer("download", self.last_download.transfer)
+        return buffer
+
+    def _record_transfer(self, step: str, stats: TransferStats) -> None:
+        """
+        将一次请求的流量计入本次搜索及全局带宽统计
+
+        参数:
+            step: 请求步骤名称
+            stats: 本次请求的流量统计
+        """
+        self.transfer.add(stats)
+        bandwidth_meter.record(self.engine, step, stats)
+
+    async def _dispatch(
+        self,
+        method: str,
+        request_url: str,
+        step: str,
+        hedgeable: bool,
+        matcher: Optional[StreamMatcher] = None,
+        **kwargs: Any,
+    ) -> RESP:
+        """
+        获取限流令牌后发出单次请求（必要时以对冲方式）并记录耗时与流量，
+        对冲副本只在能立即获得令牌时发出；能直接由HTTP缓存响应的GET请求不消耗令牌
+        
+        参数:
+            method: HTTP方法(get/post)
+            request_url: 请求URL
+            step: 请求步骤名称
+            hedgeable: 该请求是否允许对冲
+            matcher: 流式匹配器，每次发出请求时使用其全新副本
+            **kwargs: 其他请求参数
+            
+        返回:
+            RESP: HTTP响应对象
+            
+        异常:
+            RateLimitExceeded: 令牌不足且排队时间超过最长等待时间时抛出
+        """
+        host = URL(request_url).host
+        cached = method == "get" and matcher is None and self.is_cached(
+            request_url, kwargs.get("params"), kwargs.get("headers")
+        )
+        if not cached:
+            await rate_limiter.acquire(host, self.rate_limit)
+        if matcher is not None:
+            def send(send_url: str, **send_kwargs: Any) -> Awaitable[RESP]:
+                return self.stream(method, send_url, matcher.fresh(), **send_kwargs)
         else:
-            raise ValueError(f"Unsupported HTTP method: {method}")
+            send = self.get if method == "get" else self.post
+        delay = None
+        if hedgeable and not cached:
+            delay = self.hedge_policy.hedge_delay(latency_tracker, self.engine, step)
+        start = time.monotonic()
+        if delay is None:
+            resp = await send(request_url, **kwargs)
+        else:
+            # 主请求记录所用代理，副本据此改用其他代理，并通过独立的HTTP/1.1连接发出
+            route: dict[str, Any] = {}
+            extensions = kwargs.pop("extensions", None) or {}
+            resp = await run_hedged(
+                lambda: send(request_url, extensions={**extensions, ROUTE_EXTENSION: route}, **kwargs),
+                delay,
+                can_hedge=lambda: rate_limiter.try_acquire(host, self.rate_limit),
+                send_hedge=lambda: send(request_url, extensions={**extensions, HEDGE_EXTENSION: route}, **kwargs),
+            )
+        if not resp.from_cache:
+            # 缓存命中的耗时不代表网络耗时，不计入对冲与截止时间估算
+            latency_tracker.record(self.engine, step, time.monotonic() - start)
+        self._record_transfer(step, resp.transfer)
+        return resp
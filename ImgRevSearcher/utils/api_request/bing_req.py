@@ -1,13 +1,12 @@
 import re
 from base64 import b64encode
 from json import dumps as json_dumps
-from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
 from urllib.parse import quote_plus
 from typing_extensions import override
 from ..response_parser import BingResponse
-from ..ext_tools import read_file
+from ..upload import load_image
 from .base_req import BaseSearchReq
 
 
@@ -42,12 +41,12 @@ class Bing(BaseSearchReq[BingResponse]):
             ValueError: 当无法从响应中提取BCID时抛出
         """
         endpoint = "images/search?view=detailv2&iss=sbiupload"
-        image_base64 = b64encode(read_file(file)).decode("utf-8")
+        image_base64 = b64encode(await load_image(file)).decode("utf-8")
         files = {
             "cbir": "sbi",
             "imageBin": image_base64,
         }
-        resp = await self._send_request(method="post", endpoint=endpoint, files=files)
+        resp = await self._send_request(method="post", endpoint=endpoint, files=files, idempotent=True, step="upload")
         if match := re.search(r"(bcid_[A-Za-z0-9-.]+)", resp.text):
             return match[1], str(resp.url)
         raise ValueError("BCID not found on page.")
@@ -98,8 +97,16 @@ class Bing(BaseSearchReq[BingResponse]):
                 "application/json",
             )
         }
-        resp = await self._send_request(method="post", endpoint=endpoint, headers=headers, params=params, files=files)
-        return json_loads(resp.text)
+        resp = await self._send_request(
+            method="post",
+            step="insights",
+            endpoint=endpoint,
+            headers=headers,
+            params=params,
+            files=files,
+            idempotent=True,
+        )
+        return resp.json()
 
     @override
     async def search(
@@ -1,9 +1,10 @@
-from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
 from typing_extensions import override
 from ..response_parser import CopyseekerResponse
-from ..ext_tools import read_file
+from ..ext_tools import json_loads
+from ..upload import open_upload
+from ..stream_match import LineMatcher
 from .base_req import BaseSearchReq
 
 COPYSEEKER_CONSTANTS = {
@@ -51,6 +52,8 @@ class Copyseeker(BaseSearchReq[CopyseekerResponse]):
         discovery_id = None
         await self._send_request(
             method="post",
+            step="set_cookie",
+            idempotent=True,
             headers=headers,
             data=data,
         )
@@ -59,27 +62,27 @@ class Copyseeker(BaseSearchReq[CopyseekerResponse]):
             headers = {"next-action": COPYSEEKER_CONSTANTS["URL_SEARCH_TOKEN"]}
             resp = await self._send_request(
                 method="post",
+                step="upload",
+                matcher=LineMatcher(b"1:{"),
                 headers=headers,
                 json=data,
             )
         elif file:
             files = {
-                "1_file": ("image.jpg", read_file(file), "image/jpeg"),
+                "1_file": ("image.jpg", await open_upload(file), "image/jpeg"),
                 "1_discoveryType": (None, "ReverseImageSearch"),
                 "0": (None, '["$K1"]'),
             }
             headers = {"next-action": COPYSEEKER_CONSTANTS["FILE_UPLOAD_TOKEN"]}
             resp = await self._send_request(
                 method="post",
+                step="upload",
+                matcher=LineMatcher(b"1:{"),
                 headers=headers,
                 files=files,
             )
-        if resp:
-            for line in resp.text.splitlines():
-                line = line.strip()
-                if line.startswith("1:{"):
-                    discovery_id = json_loads(line[2:]).get("discoveryId")
-                    break
+        if resp and resp.matched:
+            discovery_id = json_loads(resp.content[2:]).get("discoveryId")
         return discovery_id
 
     @override
@@ -112,14 +115,12 @@ class Copyseeker(BaseSearchReq[CopyseekerResponse]):
         headers = {"next-action": COPYSEEKER_CONSTANTS["GET_RESULTS_TOKEN"]}
         resp = await self._send_request(
             method="post",
+            step="results",
+            idempotent=True,
             endpoint="discovery",
+            matcher=LineMatcher(b"1:{"),
             headers=headers,
             json=data,
         )
-        resp_json = {}
-        for line in resp.text.splitlines():
-            line = line.strip()
-            if line.startswith("1:{"):
-                resp_json = json_loads(line[2:])
-                break
+        resp_json = json_loads(resp.content[2:]) if resp.matched else {}
         return CopyseekerResponse(resp_json, resp.url)
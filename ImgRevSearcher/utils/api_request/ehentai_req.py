@@ -2,7 +2,7 @@ from pathlib import Path
 from typing import Any, Optional, Union
 from typing_extensions import override
 from ..response_parser import EHentaiResponse
-from ..ext_tools import read_file
+from ..upload import as_upload, close_buffer, open_upload, view_buffer
 from .base_req import BaseSearchReq
 
 
@@ -61,10 +61,15 @@ class EHentai(BaseSearchReq[EHentaiResponse]):
         """
         endpoint = "upld/image_lookup.php" if self.is_ex else "image_lookup.php"
         data: dict[str, Any] = {"f_sfile": "File Search"}
+        buffer = None
+        view = None
         if url:
-            files = {"sfile": await self.download(url)}
+            buffer = await self.download(url)
+            # 以视图上传，避免httpx对SpooledTemporaryFile调用fileno()迫使其转存到磁盘
+            view = view_buffer(buffer)
+            files = {"sfile": ("upload", as_upload(view))}
         elif file:
-            files = {"sfile": read_file(file)}
+            files = {"sfile": await open_upload(file)}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
         if self.covers:
@@ -73,10 +78,17 @@ class EHentai(BaseSearchReq[EHentaiResponse]):
             data["fs_similar"] = "on"
         if self.exp:
             data["fs_exp"] = "on"
-        resp = await self._send_request(
-            method="post",
-            endpoint=endpoint,
-            data=data,
-            files=files,
-        )
+        try:
+            resp = await self._send_request(
+                method="post",
+                step="search",
+                idempotent=True,
+                endpoint=endpoint,
+                data=data,
+                files=files,
+            )
+        finally:
+            # 较大的下载内容存放在临时文件中，上传后立即关闭以释放文件
+            if buffer is not None:
+                close_buffer(buffer, view)
         return EHentaiResponse(resp.text, resp.url)
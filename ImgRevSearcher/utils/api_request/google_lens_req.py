@@ -4,7 +4,7 @@ from pyquery import PyQuery
 from typing_extensions import override
 from ..response_parser import GoogleLensExactMatchesResponse, GoogleLensResponse
 from ..network import RESP
-from ..ext_tools import read_file
+from ..upload import open_upload
 from .base_req import BaseSearchReq
 from ..types import FileContent
 
@@ -89,10 +89,12 @@ class GoogleLens(BaseSearchReq[Union[GoogleLensResponse, GoogleLensExactMatchesR
             params["q"] = q
         if file:
             endpoint = "v3/upload"
-            filename = "image.jpg" if isinstance(file, bytes) else Path(file).name
-            files = {"encoded_image": (filename, read_file(file), "image/jpeg")}
+            filename = "image.jpg" if isinstance(file, (bytes, memoryview)) else Path(file).name
+            files = {"encoded_image": (filename, await open_upload(file), "image/jpeg")}
             resp = await self._send_request(
                 method="post",
+                step="upload",
+                idempotent=True,
                 endpoint=endpoint,
                 params=params,
                 files=files,
@@ -102,6 +104,7 @@ class GoogleLens(BaseSearchReq[Union[GoogleLensResponse, GoogleLensExactMatchesR
             params["url"] = url
             resp = await self._send_request(
                 method="post" if file else "get",
+                step="upload",
                 endpoint=endpoint,
                 params=params,
             )
@@ -115,7 +118,7 @@ class GoogleLens(BaseSearchReq[Union[GoogleLensResponse, GoogleLensExactMatchesR
             exact_link = dom(f'a[href*="udm={udm_value}"]').attr("href") or ""
             
         if exact_link:
-            return await self._send_request(method="get", url=f"{self.search_url}{exact_link}")
+            return await self._send_request(method="get", url=f"{self.search_url}{exact_link}", step="udm")
         return resp
 
     @override
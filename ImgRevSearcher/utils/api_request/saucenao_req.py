@@ -1,12 +1,17 @@
-from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
-from httpx import QueryParams
+from httpx import URL, QueryParams
 from typing_extensions import override
 from ..response_parser import SauceNAOResponse
-from ..ext_tools import read_file
+from ..upload import open_upload
+from ..rate_limiter import rate_limiter
 from .base_req import BaseSearchReq
 
+# SauceNAO短期配额周期(秒)
+SHORT_QUOTA_PERIOD = 30
+# 每日配额耗尽后暂停请求的时间(秒)
+LONG_QUOTA_BACKOFF = 3600
+
 
 class SauceNAO(BaseSearchReq[SauceNAOResponse]):
     """
@@ -95,14 +100,36 @@ class SauceNAO(BaseSearchReq[SauceNAOResponse]):
         if url:
             params = params.add("url", url)
         elif file:
-            files = {"file": read_file(file)}
+            files = {"file": await open_upload(file)}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
         resp = await self._send_request(
             method="post",
+            step="search",
             params=params,
             files=files,
         )
-        resp_json = json_loads(resp.text)
+        resp_json = resp.json()
         resp_json.update({"status_code": resp.status_code})
-        return SauceNAOResponse(resp_json, resp.url)
+        response = SauceNAOResponse(resp_json, resp.url)
+        self._observe_quota(response)
+        return response
+
+    def _observe_quota(self, response: SauceNAOResponse) -> None:
+        """
+        根据响应中的配额信息修正SauceNAO的令牌桶
+
+        短期配额用于修正速率和剩余令牌，每日配额耗尽时暂停请求
+
+        参数:
+            response: SauceNAO搜索响应对象
+        """
+        host = URL(self.base_url).host
+        try:
+            short_limit = int(response.short_limit) if response.short_limit else None
+        except ValueError:
+            short_limit = None
+        if response.short_remaining is not None or short_limit:
+            rate_limiter.observe_quota(host, response.short_remaining, short_limit, SHORT_QUOTA_PERIOD)
+        if response.long_remaining is not None and response.long_remaining <= 0:
+            rate_limiter.penalize(host, LONG_QUOTA_BACKOFF)
@@ -1,10 +1,10 @@
-from json import loads as json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
 from typing_extensions import override
 from ..response_parser import TineyeResponse
 from ..types import DomainInfo
-from ..ext_tools import deep_get, read_file
+from ..ext_tools import deep_get
+from ..upload import open_upload
 from .base_req import BaseSearchReq
 
 
@@ -35,8 +35,8 @@ class Tineye(BaseSearchReq[TineyeResponse]):
         返回:
             list[DomainInfo]: 域名信息列表
         """
-        resp = await self._send_request(method="get", endpoint=f"api/v1/search/get_domains/{query_hash}")
-        resp_json = json_loads(resp.text)
+        resp = await self._send_request(method="get", endpoint=f"api/v1/search/get_domains/{query_hash}", step="get_domains")
+        resp_json = resp.json()
         return [DomainInfo.from_raw_data(domain_data) for domain_data in resp_json.get("domains", [])]
 
     async def _navigate_page(self, resp: TineyeResponse, offset: int) -> Optional[TineyeResponse]:
@@ -56,8 +56,8 @@ class Tineye(BaseSearchReq[TineyeResponse]):
         api_url = resp.url.replace("search/", "api/v1/result_json/").replace(
             f"page={resp.page_number}", f"page={next_page_number}"
         )
-        _resp = await self._send_request(method="get", url=api_url)
-        resp_json = json_loads(_resp.text)
+        _resp = await self._send_request(method="get", url=api_url, step="navigate")
+        resp_json = _resp.json()
         resp_json.update({"status_code": _resp.status_code})
         return TineyeResponse(
             resp_json,
@@ -134,16 +134,18 @@ class Tineye(BaseSearchReq[TineyeResponse]):
         if url:
             params["url"] = url
         elif file:
-            files = {"image": read_file(file)}
+            files = {"image": await open_upload(file)}
         else:
             raise ValueError("Either 'url' or 'file' must be provided")
         resp = await self._send_request(
             method="post",
+            step="search",
+            idempotent=True,
             endpoint="api/v1/result_json/",
             data=params,
             files=files,
         )
-        resp_json = json_loads(resp.text)
+        resp_json = resp.json()
         resp_json["status_code"] = resp.status_code
         _url = resp.url
         domains = []
@@ -0,0 +1,162 @@
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+from httpx import Request, Response
+
+
+@dataclass
+class TransferStats:
+    """
+    流量统计数据类
+
+    header_bytes为收发的HTTP头部字节数(按HTTP/1.1格式估算，不含TLS开销与HTTP/2头部压缩)；
+    body_sent为请求体字节数；body_received为响应体的传输字节数(压缩后)；
+    body_decoded为解压后的响应体字节数。流式读取提前结束时只计入实际读取的部分
+    """
+    requests: int = 0
+    header_bytes: int = 0
+    body_sent: int = 0
+    body_received: int = 0
+    body_decoded: int = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        实际经过网络的总字节数
+
+        返回:
+            int: 头部、请求体与响应体传输字节数之和
+        """
+        return self.header_bytes + self.body_sent + self.body_received
+
+    def add(self, other: "TransferStats") -> None:
+        """
+        累加另一份统计
+
+        参数:
+            other: 需要累加的流量统计
+        """
+        self.requests += other.requests
+        self.header_bytes += other.header_bytes
+        self.body_sent += other.body_sent
+        self.body_received += other.body_received
+        self.body_decoded += other.body_decoded
+
+    def to_dict(self) -> dict[str, int]:
+        """
+        转换为字典，附带总字节数
+
+        返回:
+            dict[str, int]: 各项字节数
+        """
+        return {**asdict(self), "total_bytes": self.total_bytes}
+
+
+def _header_size(headers: Any) -> int:
+    """
+    估算HTTP头部的字节数
+
+    参数:
+        headers: httpx的Headers对象
+
+    返回:
+        int: 各头部行("名称: 值\\r\\n")的字节数之和
+    """
+    return sum(len(key) + len(value) + 4 for key, value in headers.raw)
+
+
+def measure_response(response: Response, body_decoded: int) -> TransferStats:
+    """
+    统计一次请求/响应的流量
+
+    参数:
+        response: httpx响应对象，响应体已读取(或已读取需要的部分)
+        body_decoded: 已读取的解压后响应体字节数
+
+    返回:
+        TransferStats: 本次请求的流量统计
+    """
+    request: Request = response.request
+    request_line = len(request.method) + len(request.url.raw_path) + 12
+    try:
+        body_sent = int(request.headers.get("content-length", 0))
+    except ValueError:
+        body_sent = 0
+    return TransferStats(
+        requests=1,
+        header_bytes=request_line + _header_size(request.headers) + 17 + _header_size(response.headers),
+        body_sent=body_sent,
+        body_received=response.num_bytes_downloaded,
+        body_decoded=body_decoded,
+    )
+
+
+class BandwidthMeter:
+    """
+    带宽统计类
+
+    按 (引擎, 请求步骤) 累计请求与响应的字节数，并保留最近若干次搜索各自的流量，
+    用于定位代理流量主要消耗在哪些引擎和步骤
+    """
+
+    def __init__(self, recent: int = 100):
+        """
+        初始化带宽统计
+
+        参数:
+            recent: 保留的最近搜索记录数
+        """
+        self._steps: dict[tuple[str, str], TransferStats] = {}
+        self._recent: deque[dict[str, Any]] = deque(maxlen=recent)
+
+    def record(self, engine: str, step: str, stats: TransferStats) -> None:
+        """
+        累计一个请求步骤的流量
+
+        参数:
+            engine: 引擎名称
+            step: 请求步骤名称
+            stats: 本次请求的流量统计
+        """
+        key = (engine, step)
+        total = self._steps.get(key)
+        if total is None:
+            total = self._steps[key] = TransferStats()
+        total.add(stats)
+
+    def record_search(self, engine: str, stats: TransferStats) -> None:
+        """
+        记录一次完整搜索的流量
+
+        参数:
+            engine: 引擎名称
+            stats: 整次搜索的流量统计
+        """
+        self._recent.append({"engine": engine, "timestamp": time.time(), **stats.to_dict()})
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取各引擎的流量统计
+
+        返回:
+            dict[str, Any]: {"engines": 引擎 -> {"total", "steps": 步骤 -> 统计}, "recent_searches": 最近搜索列表}
+        """
+        engines: dict[str, dict[str, Any]] = {}
+        for (engine, step), stats in self._steps.items():
+            entry = engines.setdefault(engine, {"total": TransferStats(), "steps": {}})
+            entry["total"].add(stats)
+            entry["steps"][step] = stats.to_dict()
+        for entry in engines.values():
+            entry["total"] = entry["total"].to_dict()
+        return {"engines": engines, "recent_searches": list(self._recent)}
+
+    def reset(self) -> None:
+        """
+        清空所有统计
+        """
+        self._steps.clear()
+        self._recent.clear()
+
+
+bandwidth_meter = BandwidthMeter()
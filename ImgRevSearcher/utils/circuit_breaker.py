@@ -0,0 +1,194 @@
+import time
+from collections import deque
+from typing import Any, Optional, Sequence
+from httpx import HTTPStatusError, TransportError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_failure_status(status_code: int) -> bool:
+    """
+    判断HTTP状态码是否表示引擎故障(限流或服务端错误)
+
+    参数:
+        status_code: HTTP状态码
+
+    返回:
+        bool: 是否计入熔断
+    """
+    return status_code == 429 or status_code >= 500
+
+
+def is_engine_failure(error: Optional[BaseException], status_codes: Sequence[int]) -> bool:
+    """
+    判断一次搜索的失败是否来自远程引擎
+
+    只有传输层错误以及最后一个请求返回429/5xx才计入熔断，
+    截止时间耗尽、解析器异常等本地错误不代表引擎故障
+
+    参数:
+        error: 搜索过程中抛出的异常，搜索正常返回时为None
+        status_codes: 该次搜索各请求的HTTP状态码
+
+    返回:
+        bool: 是否计入熔断
+    """
+    if isinstance(error, TransportError):
+        return True
+    if isinstance(error, HTTPStatusError):
+        return is_failure_status(error.response.status_code)
+    return bool(status_codes) and is_failure_status(status_codes[-1])
+
+
+class CircuitOpenError(Exception):
+    """
+    熔断器打开异常
+
+    引擎因连续失败被熔断时抛出，调用方据此快速失败并提示引擎暂时不可用
+    """
+
+    def __init__(self, engine: str, retry_after: float):
+        """
+        初始化熔断异常
+
+        参数:
+            engine: 被熔断的引擎名称
+            retry_after: 距离允许下一次探测请求的秒数
+        """
+        super().__init__(f"引擎 {engine} 暂时不可用，约 {int(retry_after) + 1} 秒后重试")
+        self.engine: str = engine
+        self.retry_after: float = retry_after
+
+
+class CircuitBreaker:
+    """
+    熔断器类
+
+    关闭状态下统计时间窗口内的失败次数，达到阈值后打开并拒绝请求；
+    打开一段时间后进入半开状态，只放行一个探测请求，探测成功则关闭，失败则重新打开
+    """
+
+    def __init__(self, failure_threshold: int = 5, window: float = 60, recovery_timeout: float = 30):
+        """
+        初始化熔断器
+
+        参数:
+            failure_threshold: 时间窗口内触发熔断的失败次数
+            window: 统计失败次数的时间窗口(秒)
+            recovery_timeout: 打开后进入半开状态前的等待时间(秒)，也是探测请求的最长占用时间
+        """
+        self.failure_threshold: int = max(1, failure_threshold)
+        self.window: float = window
+        self.recovery_timeout: float = recovery_timeout
+        self.state: str = CLOSED
+        self._failures: deque[float] = deque()
+        self._opened_at: float = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._total_failures: int = 0
+        self._total_rejections: int = 0
+
+    def _prune(self, now: float) -> None:
+        """
+        移除时间窗口之外的失败记录
+
+        参数:
+            now: 当前时间
+        """
+        while self._failures and now - self._failures[0] > self.window:
+            self._failures.popleft()
+
+    def retry_after(self) -> float:
+        """
+        获取距离允许下一次请求的秒数
+
+        返回:
+            float: 剩余等待秒数，关闭状态下为0
+        """
+        if self.state == OPEN:
+            return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+        if self.state == HALF_OPEN and self._probe_started_at is not None:
+            return max(0.0, self._probe_started_at + self.recovery_timeout - time.monotonic())
+        return 0.0
+
+    def allow_request(self) -> bool:
+        """
+        判断当前是否允许发出请求
+
+        半开状态下只放行一个探测请求；探测请求超过recovery_timeout仍未上报结果时
+        视为丢失，允许新的探测
+
+        返回:
+            bool: 是否允许请求
+        """
+        now = time.monotonic()
+        if self.state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self.state = HALF_OPEN
+            self._probe_started_at = None
+        if self.state == HALF_OPEN:
+            if self._probe_started_at is None or now - self._probe_started_at >= self.recovery_timeout:
+                self._probe_started_at = now
+                return True
+        if self.state == CLOSED:
+            return True
+        self._total_rejections += 1
+        return False
+
+    def record_success(self) -> None:
+        """
+        记录一次成功请求，半开状态下关闭熔断器
+        """
+        if self.state != CLOSED:
+            self.state = CLOSED
+            self._failures.clear()
+            self._probe_started_at = None
+
+    def release_probe(self) -> None:
+        """
+        放弃半开状态下的探测请求而不记录结果(如被限流拒绝或因本地错误结束)，允许立即发出新的探测
+        """
+        if self.state == HALF_OPEN:
+            self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """
+        记录一次失败请求，达到阈值或半开探测失败时打开熔断器
+        """
+        now = time.monotonic()
+        self._total_failures += 1
+        if self.state == HALF_OPEN:
+            self._open(now)
+            return
+        self._failures.append(now)
+        self._prune(now)
+        if self.state == CLOSED and len(self._failures) >= self.failure_threshold:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        """
+        打开熔断器
+
+        参数:
+            now: 当前时间
+        """
+        self.state = OPEN
+        self._opened_at = now
+        self._probe_started_at = None
+        self._failures.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取熔断器当前状态
+
+        返回:
+            dict[str, Any]: 状态、窗口内失败次数、剩余熔断时间及累计失败/拒绝次数
+        """
+        self._prune(time.monotonic())
+        return {
+            "state": self.state,
+            "recent_failures": len(self._failures),
+            "retry_after": round(self.retry_after(), 1),
+            "total_failures": self._total_failures,
+            "total_rejections": self._total_rejections,
+        }
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Awaitable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(Exception):
+    """
+    搜索超出时间预算异常
+
+    剩余预算不足以完成下一个请求步骤，或步骤执行中预算耗尽时抛出
+    """
+
+    def __init__(self, step: str, budget: Optional[float]):
+        """
+        初始化超出预算异常
+
+        参数:
+            step: 未能在预算内完成的请求步骤
+            budget: 整次搜索的时间预算(秒)
+        """
+        super().__init__(f"搜索超出时间预算: 步骤 {step} 未能在 {budget} 秒内完成")
+        self.step: str = step
+        self.budget: Optional[float] = budget
+
+
+class Deadline:
+    """
+    整次搜索的截止时间
+
+    在搜索开始时创建并贯穿引擎的所有请求步骤，每个步骤只能使用剩余的预算，
+    使多步骤引擎的总耗时不超过预算。预算为None时不限制
+    """
+
+    def __init__(self, budget: Optional[float] = None):
+        """
+        初始化截止时间
+
+        参数:
+            budget: 时间预算(秒)，None表示不限制
+        """
+        self.budget: Optional[float] = budget
+        self.started_at: float = time.monotonic()
+
+    def elapsed(self) -> float:
+        """
+        获取已耗费的时间
+
+        返回:
+            float: 自创建以来经过的秒数
+        """
+        return time.monotonic() - self.started_at
+
+    def remaining(self) -> Optional[float]:
+        """
+        获取剩余预算
+
+        返回:
+            Optional[float]: 剩余秒数(不小于0)，不限制时返回None
+        """
+        if self.budget is None:
+            return None
+        return max(0.0, self.budget - self.elapsed())
+
+    def allows(self, duration: float) -> bool:
+        """
+        判断剩余预算是否足以再耗费指定时间
+
+        参数:
+            duration: 预计耗时(秒)
+
+        返回:
+            bool: 剩余预算大于预计耗时时返回True
+        """
+        remaining = self.remaining()
+        return remaining is None or duration < remaining
+
+    def check(self, step: str, expected: float = 0.0) -> None:
+        """
+        检查剩余预算是否足以执行下一个步骤
+
+        参数:
+            step: 请求步骤名称
+            expected: 该步骤的预计耗时(秒)
+
+        异常:
+            DeadlineExceeded: 剩余预算不足时抛出
+        """
+        if not self.allows(expected):
+            raise DeadlineExceeded(step, self.budget)
+
+    async def run(self, step: str, awaitable: Awaitable[T]) -> T:
+        """
+        在剩余预算内执行协程，预算耗尽时取消
+
+        参数:
+            step: 请求步骤名称
+            awaitable: 需要执行的协程
+
+        返回:
+            T: 协程的返回值
+
+        异常:
+            DeadlineExceeded: 协程未能在剩余预算内完成时抛出
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(step, self.budget) from None
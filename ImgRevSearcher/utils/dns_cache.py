@@ -0,0 +1,359 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+from httpcore import AsyncNetworkBackend, AsyncNetworkStream, ConnectError
+
+try:
+    from dns.asyncresolver import Resolver as _DNSResolver
+except ImportError:
+    _DNSResolver = None
+
+
+@dataclass
+class DNSEntry:
+    """
+    DNS缓存条目数据类
+    """
+    addresses: list[str]
+    expires_at: float
+    resolved_at: float
+
+
+class DNSCache:
+    """
+    DNS解析缓存类
+
+    按主机名缓存系统解析器(getaddrinfo，遵循hosts文件)的解析结果。
+    解析只等待getaddrinfo，条目先使用配置的默认TTL；安装了dnspython时在后台查询一次记录自带的TTL，
+    得到后修正该条目并用于该主机之后的解析，缓存时间限制在[min_ttl, max_ttl]之间。
+    即将过期的条目在后台提前刷新；解析失败时在stale_ttl内继续使用过期的结果
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300,
+        min_ttl: float = 30,
+        max_ttl: float = 3600,
+        stale_ttl: float = 3600,
+        refresh_ahead: float = 0.1,
+    ):
+        """
+        初始化DNS缓存
+
+        参数:
+            ttl: 无法获知记录TTL时使用的缓存时间(秒)
+            min_ttl: 缓存时间下限(秒)
+            max_ttl: 缓存时间上限(秒)
+            stale_ttl: 解析失败时过期结果的最长可用时间(秒)
+            refresh_ahead: 剩余缓存时间低于TTL的该比例时在后台提前刷新
+        """
+        self.ttl: float = ttl
+        self.min_ttl: float = min_ttl
+        self.max_ttl: float = max_ttl
+        self.stale_ttl: float = stale_ttl
+        self.refresh_ahead: float = refresh_ahead
+        self._entries: dict[str, DNSEntry] = {}
+        self._pending: dict[str, asyncio.Future[DNSEntry]] = {}
+        self._background: set[asyncio.Task[Any]] = set()
+        # 主机名 -> dnspython查询到的记录TTL
+        self._record_ttls: dict[str, float] = {}
+        self._resolver: Any = None
+        if _DNSResolver is not None:
+            try:
+                self._resolver = _DNSResolver()
+            except Exception:
+                # 没有可用的resolv.conf等系统配置时无法查询TTL
+                self._resolver = None
+        self.hits: int = 0
+        self.misses: int = 0
+        self.stale_hits: int = 0
+
+    def configure(self, ttl: float, min_ttl: float, max_ttl: float, stale_ttl: float) -> None:
+        """
+        更新缓存时间配置
+
+        参数:
+            ttl: 无法获知记录TTL时使用的缓存时间(秒)
+            min_ttl: 缓存时间下限(秒)
+            max_ttl: 缓存时间上限(秒)
+            stale_ttl: 解析失败时过期结果的最长可用时间(秒)
+        """
+        self.ttl = ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max(min_ttl, max_ttl)
+        self.stale_ttl = stale_ttl
+
+    async def resolve(self, host: str) -> list[str]:
+        """
+        解析主机名，优先使用缓存
+
+        参数:
+            host: 主机名
+
+        返回:
+            list[str]: IP地址列表
+
+        异常:
+            OSError: 解析失败且没有可用的过期结果时抛出
+        """
+        now = time.monotonic()
+        entry = self._entries.get(host)
+        if entry is not None and entry.expires_at > now:
+            self.hits += 1
+            ttl = entry.expires_at - entry.resolved_at
+            if entry.expires_at - now < ttl * self.refresh_ahead:
+                self._refresh_in_background(host)
+            return entry.addresses
+        self.misses += 1
+        try:
+            return (await self._lookup(host)).addresses
+        except OSError:
+            if entry is not None and now - entry.expires_at < self.stale_ttl:
+                self.stale_hits += 1
+                return entry.addresses
+            raise
+
+    def invalidate(self, host: str) -> None:
+        """
+        移除主机的缓存结果
+
+        参数:
+            host: 主机名
+        """
+        self._entries.pop(host, None)
+
+    def mark_stale(self, host: str) -> None:
+        """
+        将主机的缓存结果标记为过期，例如缓存的地址全部无法连接时。
+        下次解析会重新查询，查询失败时仍可在stale_ttl内使用该结果
+
+        参数:
+            host: 主机名
+        """
+        entry = self._entries.get(host)
+        if entry is not None:
+            entry.expires_at = min(entry.expires_at, time.monotonic())
+
+    async def prefetch(self, hosts: Iterable[str]) -> None:
+        """
+        并发预解析主机名，解析失败的主机忽略
+
+        参数:
+            hosts: 主机名列表
+        """
+        await asyncio.gather(*(self._lookup(host) for host in set(hosts)), return_exceptions=True)
+
+    def _refresh_in_background(self, host: str) -> None:
+        """
+        在后台刷新即将过期的条目
+
+        参数:
+            host: 主机名
+        """
+        if host in self._pending:
+            return
+        self._spawn(self._lookup(host))
+
+    def _spawn(self, coro: Any) -> None:
+        """
+        启动后台任务，任务异常被取回而不向外传播
+
+        参数:
+            coro: 需要执行的协程
+        """
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _learn_ttl(self, host: str, entry: DNSEntry) -> None:
+        """
+        在后台通过dnspython查询主机A记录的TTL，并修正仍在使用的缓存条目
+
+        参数:
+            host: 主机名
+            entry: 查询前写入的缓存条目
+        """
+        try:
+            answer = await self._resolver.resolve(host, "A")
+        except Exception:
+            return
+        ttl = float(answer.rrset.ttl)
+        self._record_ttls[host] = ttl
+        if self._entries.get(host) is entry:
+            entry.expires_at = entry.resolved_at + min(self.max_ttl, max(self.min_ttl, ttl))
+
+    async def _lookup(self, host: str) -> DNSEntry:
+        """
+        实际执行解析并写入缓存，同一主机的并发解析合并为一次
+
+        参数:
+            host: 主机名
+
+        返回:
+            DNSEntry: 新的缓存条目
+
+        异常:
+            OSError: 解析失败时抛出
+        """
+        pending = self._pending.get(host)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future: asyncio.Future[DNSEntry] = asyncio.get_running_loop().create_future()
+        self._pending[host] = future
+        try:
+            addresses = await self._query(host)
+            if not addresses:
+                raise OSError(f"DNS解析 {host} 未返回地址")
+            now = time.monotonic()
+            ttl = min(self.max_ttl, max(self.min_ttl, self._record_ttls.get(host, self.ttl)))
+            entry = DNSEntry(addresses, now + ttl, now)
+            self._entries[host] = entry
+            if self._resolver is not None and host not in self._record_ttls:
+                self._spawn(self._learn_ttl(host, entry))
+            future.set_result(entry)
+            return entry
+        except BaseException as e:
+            future.set_exception(e if isinstance(e, Exception) else OSError(f"DNS解析 {host} 被取消"))
+            future.exception()
+            raise
+        finally:
+            del self._pending[host]
+
+    async def _query(self, host: str) -> list[str]:
+        """
+        通过系统解析器查询主机的IP地址
+
+        参数:
+            host: 主机名
+
+        返回:
+            list[str]: IP地址列表
+
+        异常:
+            OSError: 解析失败时抛出
+        """
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取缓存统计与各主机的缓存状态
+
+        返回:
+            dict[str, Any]: 命中/未命中/过期命中次数及主机 -> {addresses, expires_in}
+        """
+        now = time.monotonic()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hosts": {
+                host: {"addresses": entry.addresses, "expires_in": round(entry.expires_at - now, 1)}
+                for host, entry in self._entries.items()
+            },
+        }
+
+
+class CachingNetworkBackend(AsyncNetworkBackend):
+    """
+    带DNS缓存的网络后端
+
+    包装httpcore默认网络后端，建立TCP连接前通过DNSCache解析主机名，
+    依次尝试缓存的地址。TLS握手的SNI仍使用原始主机名
+    """
+
+    def __init__(self, cache: DNSCache, backend: AsyncNetworkBackend):
+        """
+        初始化网络后端
+
+        参数:
+            cache: DNS缓存
+            backend: 实际建立连接的网络后端
+        """
+        self._cache: DNSCache = cache
+        self._backend: AsyncNetworkBackend = backend
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> AsyncNetworkStream:
+        """
+        解析主机名后建立TCP连接
+
+        参数:
+            host: 主机名或IP地址
+            port: 端口
+            timeout: 连接超时时间(秒)
+            local_address: 本地绑定地址
+            socket_options: 套接字选项
+
+        返回:
+            AsyncNetworkStream: 网络流
+
+        异常:
+            ConnectError: 解析失败或所有地址都无法连接时抛出
+        """
+        try:
+            ipaddress.ip_address(host)
+            addresses = [host]
+        except ValueError:
+            try:
+                addresses = await self._cache.resolve(host)
+            except OSError as e:
+                raise ConnectError(str(e)) from e
+        socket_options = list(socket_options) if socket_options is not None else None
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except Exception as e:
+                last_error = e
+        if addresses != [host]:
+            # 只标记为过期而不删除，重新解析失败时仍可使用原来的地址
+            self._cache.mark_stale(host)
+        raise last_error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> AsyncNetworkStream:
+        """
+        建立Unix套接字连接
+
+        参数:
+            path: 套接字路径
+            timeout: 连接超时时间(秒)
+            socket_options: 套接字选项
+
+        返回:
+            AsyncNetworkStream: 网络流
+        """
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        异步等待
+
+        参数:
+            seconds: 等待秒数
+        """
+        await self._backend.sleep(seconds)
+
+
+dns_cache = DNSCache()
@@ -0,0 +1,138 @@
+import time
+from dataclasses import dataclass, field
+from tempfile import SpooledTemporaryFile
+from typing import IO, Callable, Optional, Union
+from httpx import AsyncClient, Timeout
+from .bandwidth import TransferStats, measure_response
+
+# 下载进度回调：(已接收字节数, Content-Length或None)
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class DownloadTooLarge(Exception):
+    """
+    下载内容超过大小上限异常
+
+    Content-Length超过上限时在读取响应体前抛出，未声明长度时在实际接收字节数超限时抛出
+    """
+
+    def __init__(self, url: str, size: int, limit: int):
+        """
+        初始化下载超限异常
+
+        参数:
+            url: 下载URL
+            size: 声明的或已接收的字节数
+            limit: 允许的最大字节数
+        """
+        super().__init__(f"下载内容过大: {url} ({size} 字节，上限 {limit} 字节)")
+        self.url: str = url
+        self.size: int = size
+        self.limit: int = limit
+
+
+@dataclass
+class DownloadLimits:
+    """
+    流式下载限制数据类
+
+    max_bytes为允许下载的最大字节数；spool_threshold为内存缓冲的上限，
+    超过后内容转存到临时文件
+    """
+    max_bytes: int = 20 * 1024 * 1024
+    spool_threshold: int = 2 * 1024 * 1024
+    chunk_size: int = 64 * 1024
+
+
+@dataclass
+class DownloadStats:
+    """
+    单次下载统计数据类
+    """
+    url: str
+    status_code: int
+    bytes_received: int
+    content_length: Optional[int]
+    elapsed: float
+    spilled: bool
+    transfer: TransferStats = field(default_factory=TransferStats)
+
+
+def _content_length(value: Optional[str]) -> Optional[int]:
+    """
+    解析Content-Length响应头
+
+    参数:
+        value: Content-Length头的值
+
+    返回:
+        Optional[int]: 声明的字节数，缺失或无法解析时返回None
+    """
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+async def stream_download(
+    client: AsyncClient,
+    url: str,
+    limits: Optional[DownloadLimits] = None,
+    headers: Optional[dict[str, str]] = None,
+    timeout: Union[float, Timeout, None] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> tuple[IO[bytes], DownloadStats]:
+    """
+    以流式方式下载内容
+
+    先检查Content-Length，超过上限则不读取响应体；读取过程中累计字节数超限时中止下载。
+    内容写入SpooledTemporaryFile，超过spool_threshold后转存到临时文件
+
+    参数:
+        client: HTTP客户端
+        url: 下载URL
+        limits: 下载限制，默认使用DownloadLimits()
+        headers: 自定义HTTP头部
+        timeout: 请求超时时间，默认使用客户端设置
+        on_progress: 每接收一个数据块后调用的进度回调
+
+    返回:
+        tuple[IO[bytes], DownloadStats]: 已定位到开头的内容缓冲区及下载统计
+
+    异常:
+        DownloadTooLarge: 内容超过max_bytes时抛出
+    """
+    limits = limits or DownloadLimits()
+    start = time.monotonic()
+    request_kwargs = {"headers": headers}
+    if timeout is not None:
+        request_kwargs["timeout"] = timeout
+    async with client.stream("GET", url, **request_kwargs) as resp:
+        content_length = _content_length(resp.headers.get("content-length"))
+        if content_length is not None and content_length > limits.max_bytes:
+            raise DownloadTooLarge(url, content_length, limits.max_bytes)
+        buffer = SpooledTemporaryFile(max_size=limits.spool_threshold)
+        received = 0
+        try:
+            async for chunk in resp.aiter_bytes(limits.chunk_size):
+                received += len(chunk)
+                if received > limits.max_bytes:
+                    raise DownloadTooLarge(url, received, limits.max_bytes)
+                buffer.write(chunk)
+                if on_progress is not None:
+                    on_progress(received, content_length)
+        except BaseException:
+            buffer.close()
+            raise
+        transfer = measure_response(resp, received)
+    buffer.seek(0)
+    stats = DownloadStats(
+        url=url,
+        status_code=resp.status_code,
+        bytes_received=received,
+        content_length=content_length,
+        elapsed=time.monotonic() - start,
+        spilled=received > limits.spool_threshold,
+        transfer=transfer,
+    )
+    return buffer, stats
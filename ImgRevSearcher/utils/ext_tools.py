@@ -1,9 +1,15 @@
 import re
+from json import loads as _std_json_loads
 from pathlib import Path
 from typing import Any, Optional, Union
 from lxml.html import HTMLParser, fromstring
 from pyquery import PyQuery
 
+try:
+    from orjson import loads as _fast_json_loads
+except ImportError:
+    _fast_json_loads = None
+
 
 def deep_get(dictionary: dict[str, Any], keys: str) -> Optional[Any]:
     """
@@ -32,6 +38,26 @@ def deep_get(dictionary: dict[str, Any], keys: str) -> Optional[Any]:
     return dictionary
 
 
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    解析JSON数据
+    
+    安装了orjson时直接从字节解析，否则使用标准库json
+    
+    参数:
+        data: JSON文本或字节数据
+        
+    返回:
+        Any: 解析后的对象
+        
+    异常:
+        ValueError: 当数据不是合法JSON时抛出
+    """
+    if _fast_json_loads is not None:
+        return _fast_json_loads(data)
+    return _std_json_loads(data)
+
+
 def read_file(file: Union[str, bytes, Path]) -> bytes:
     """
     读取文件内容为字节数据
@@ -0,0 +1,227 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+from httpx import AsyncBaseTransport, AsyncByteStream, ConnectError, ReadError, ReadTimeout, Request, Response
+
+LATENCY_DISTRIBUTIONS = ("uniform", "normal", "exponential")
+# 响应未声明Content-Length时，断开或截断位置的随机上限(字节)
+UNKNOWN_LENGTH_CUTOFF = 16 * 1024
+
+
+@dataclass
+class FaultRule:
+    """
+    故障注入规则数据类
+
+    latency为附加延迟的均值(秒)，jitter为其波动幅度：uniform分布在latency±jitter内均匀取值，
+    normal分布以jitter为标准差，exponential分布以latency为均值(忽略jitter)。
+    各rate为每个请求触发对应故障的概率：connect_error_rate在发出请求前抛出连接错误，
+    error_rate直接返回error_statuses中的某个状态码，drop_rate在读取响应体中途断开连接，
+    truncate_rate使响应体在中途正常结束
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    distribution: str = "uniform"
+    connect_error_rate: float = 0.0
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (429, 500, 502, 503)
+    retry_after: Optional[float] = None
+    drop_rate: float = 0.0
+    truncate_rate: float = 0.0
+
+    def is_active(self) -> bool:
+        """
+        判断规则是否会注入任何故障
+
+        返回:
+            bool: 存在延迟或任一故障概率大于0时返回True
+        """
+        return any((
+            self.latency > 0,
+            self.jitter > 0,
+            self.connect_error_rate > 0,
+            self.error_rate > 0,
+            self.drop_rate > 0,
+            self.truncate_rate > 0,
+        ))
+
+
+class _FaultyStream(AsyncByteStream):
+    """
+    故障响应体包装类
+
+    转发原始响应体，在读取到指定字节数时断开连接(抛出ReadError)或提前正常结束
+    """
+
+    def __init__(self, stream: AsyncByteStream, cutoff: int, drop: bool):
+        """
+        初始化故障响应体
+
+        参数:
+            stream: 原始响应体
+            cutoff: 触发故障前允许读取的字节数
+            drop: True时抛出ReadError，False时截断后正常结束
+        """
+        self._stream: AsyncByteStream = stream
+        self._cutoff: int = cutoff
+        self._drop: bool = drop
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """
+        逐块读取响应体，到达截断位置时注入故障
+
+        返回:
+            AsyncIterator[bytes]: 响应体数据块
+
+        异常:
+            ReadError: drop为True且到达截断位置时抛出
+        """
+        received = 0
+        async for chunk in self._stream:
+            remaining = self._cutoff - received
+            if len(chunk) >= remaining:
+                if remaining > 0:
+                    yield chunk[:remaining]
+                if self._drop:
+                    raise ReadError("故障注入：读取响应体时连接被断开")
+                return
+            received += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        """
+        关闭原始响应体
+        """
+        await self._stream.aclose()
+
+
+class FaultInjector:
+    """
+    故障注入器
+
+    按目标主机匹配故障规则，在请求到达真实传输层前后注入延迟、连接错误、
+    错误状态码、中途断开和截断响应，用于在本地复现缓慢或不稳定的引擎。
+    规则键为主机名，同时匹配其子域名；键为"*"的规则作用于其余所有主机
+    """
+
+    def __init__(self, rules: Optional[dict[str, FaultRule]] = None, seed: Optional[int] = None):
+        """
+        初始化故障注入器
+
+        参数:
+            rules: 主机名 -> 故障规则
+            seed: 随机数种子，指定后故障序列可复现
+        """
+        self.rules: dict[str, FaultRule] = {host.lower(): rule for host, rule in (rules or {}).items()}
+        self._random: random.Random = random.Random(seed)
+        self.injected: dict[str, int] = {}
+
+    def rule_for(self, host: str) -> Optional[FaultRule]:
+        """
+        查找主机对应的故障规则
+
+        参数:
+            host: 目标主机名
+
+        返回:
+            Optional[FaultRule]: 最具体的匹配规则，没有匹配时返回None
+        """
+        host = host.lower()
+        while host:
+            rule = self.rules.get(host)
+            if rule is not None:
+                return rule
+            _, _, host = host.partition(".")
+        return self.rules.get("*")
+
+    def _delay(self, rule: FaultRule) -> float:
+        """
+        按规则的延迟分布抽取附加延迟
+
+        参数:
+            rule: 故障规则
+
+        返回:
+            float: 附加延迟(秒)，不小于0
+        """
+        if rule.distribution == "exponential":
+            delay = self._random.expovariate(1 / rule.latency) if rule.latency > 0 else 0.0
+        elif rule.distribution == "normal":
+            delay = self._random.gauss(rule.latency, rule.jitter)
+        else:
+            delay = self._random.uniform(rule.latency - rule.jitter, rule.latency + rule.jitter)
+        return max(0.0, delay)
+
+    def _count(self, fault: str) -> None:
+        """
+        累计注入的故障次数
+
+        参数:
+            fault: 故障类型
+        """
+        self.injected[fault] = self.injected.get(fault, 0) + 1
+
+    async def handle(self, request: Request, transport: AsyncBaseTransport) -> Response:
+        """
+        按规则注入故障后通过真实传输层发送请求
+
+        参数:
+            request: HTTP请求对象
+            transport: 实际发送请求的传输层
+
+        返回:
+            Response: HTTP响应对象，可能是注入的错误响应或带故障的响应体
+
+        异常:
+            ConnectError: 注入连接错误时抛出
+            ReadTimeout: 注入的延迟超过请求的读取超时时抛出
+        """
+        rule = self.rule_for(request.url.host)
+        if rule is None or not rule.is_active():
+            return await transport.handle_async_request(request)
+        delay = self._delay(rule)
+        if delay > 0:
+            self._count("latency")
+            read_timeout = request.extensions.get("timeout", {}).get("read")
+            if read_timeout is not None and delay > read_timeout:
+                # 注入的延迟模拟服务器响应缓慢，同样受请求的读取超时约束
+                await asyncio.sleep(read_timeout)
+                self._count("timeout")
+                raise ReadTimeout("故障注入：等待响应超时", request=request)
+            await asyncio.sleep(delay)
+        if self._random.random() < rule.connect_error_rate:
+            self._count("connect_error")
+            raise ConnectError("故障注入：连接失败", request=request)
+        if rule.error_statuses and self._random.random() < rule.error_rate:
+            status = self._random.choice(rule.error_statuses)
+            self._count(f"status_{status}")
+            headers = {}
+            if status == 429 and rule.retry_after is not None:
+                headers["Retry-After"] = f"{rule.retry_after:g}"
+            return Response(status, headers=headers, request=request, extensions={"http_version": b"HTTP/1.1"})
+        response = await transport.handle_async_request(request)
+        drop = self._random.random() < rule.drop_rate
+        if not drop and self._random.random() >= rule.truncate_rate:
+            return response
+        self._count("drop" if drop else "truncate")
+        length = response.headers.get("content-length", "")
+        limit = int(length) - 1 if length.isdigit() and int(length) > 0 else UNKNOWN_LENGTH_CUTOFF
+        cutoff = self._random.randint(0, limit)
+        headers = [(key, value) for key, value in response.headers.raw if key.lower() != b"content-length"]
+        return Response(
+            response.status_code,
+            headers=headers,
+            stream=_FaultyStream(response.stream, cutoff, drop),
+            request=request,
+            extensions=response.extensions,
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取已注入的故障统计
+
+        返回:
+            dict[str, Any]: 故障类型 -> 注入次数
+        """
+        return dict(self.injected)
@@ -0,0 +1,90 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from .latency import LatencyTracker
+
+T = TypeVar("T")
+
+
+@dataclass
+class HedgePolicy:
+    """
+    对冲请求策略数据类
+
+    当请求耗时超过该步骤历史耗时的指定分位数仍未返回时，再发出一个相同的请求，
+    先返回者胜出，另一个被取消。仅用于可安全重复且不上传文件的步骤
+    """
+    enabled: bool = False
+    quantile: float = 0.95
+    min_samples: int = 20
+    min_delay: float = 0.5
+
+    def hedge_delay(self, tracker: LatencyTracker, engine: str, step: str) -> Optional[float]:
+        """
+        计算发出对冲请求前的等待时间
+
+        参数:
+            tracker: 耗时统计
+            engine: 引擎名称
+            step: 请求步骤名称
+
+        返回:
+            Optional[float]: 等待秒数，未启用或样本不足时返回None
+        """
+        if not self.enabled or tracker.count(engine, step) < self.min_samples:
+            return None
+        observed = tracker.percentile(engine, step, self.quantile)
+        if observed is None:
+            return None
+        return max(self.min_delay, observed)
+
+
+async def run_hedged(
+    send: Callable[[], Awaitable[T]],
+    delay: float,
+    can_hedge: Optional[Callable[[], bool]] = None,
+    send_hedge: Optional[Callable[[], Awaitable[T]]] = None,
+) -> T:
+    """
+    以对冲方式执行请求
+
+    先发出主请求，若delay秒内未完成则再发出一个副本，返回最先成功的结果并取消其余请求，
+    等待被取消的请求结束以释放其连接。
+    所有请求都失败时抛出最先发生的异常
+
+    参数:
+        send: 发出一次请求的协程工厂
+        delay: 发出副本前的等待时间(秒)
+        can_hedge: 发出副本前的检查(如获取限流令牌)，返回False时不发出副本
+        send_hedge: 发出副本请求的协程工厂(如改用独立连接或其他代理)，为None时使用send
+
+    返回:
+        T: 最先成功的请求结果
+    """
+    pending: set[asyncio.Task[Any]] = {asyncio.create_task(send())}
+    first_error: Optional[BaseException] = None
+    hedged = False
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=None if hedged else delay,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                first_error = first_error or task.exception()
+            if not hedged and (not done or pending):
+                # 超过对冲等待时间仍未返回，发出副本请求
+                hedged = True
+                if can_hedge is None or can_hedge():
+                    pending.add(asyncio.create_task((send_hedge or send)()))
+            elif not hedged:
+                break
+        raise first_error
+    finally:
+        for task in pending:
+            task.cancel()
+        # 等待被取消的请求结束，关闭其流与连接，并取走异常避免未处理异常警告
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,336 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+from httpx import Headers
+
+# 缓存的响应状态码
+CACHEABLE_STATUS_CODES = {200, 203}
+
+
+@dataclass
+class CacheEntry:
+    """
+    HTTP缓存条目数据类
+    """
+    content: bytes
+    url: str
+    status_code: int
+    headers: Headers
+    encoding: str
+    expires_at: float
+
+    @property
+    def size(self) -> int:
+        """
+        条目占用的字节数(按响应体估算)
+
+        返回:
+            int: 响应体字节数
+        """
+        return len(self.content)
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """
+        重新验证缓存时使用的条件请求头
+
+        返回:
+            dict[str, str]: If-None-Match/If-Modified-Since，没有验证器时为空
+        """
+        result = {}
+        if etag := self.headers.get("etag"):
+            result["If-None-Match"] = etag
+        if last_modified := self.headers.get("last-modified"):
+            result["If-Modified-Since"] = last_modified
+        return result
+
+
+def _parse_cache_control(value: str) -> dict[str, Optional[str]]:
+    """
+    解析Cache-Control头
+
+    参数:
+        value: Cache-Control头的值
+
+    返回:
+        dict[str, Optional[str]]: 小写指令名 -> 指令值(无值时为None)
+    """
+    directives: dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, sep, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if sep else None
+    return directives
+
+
+def freshness_lifetime(headers: Headers) -> tuple[bool, Optional[float]]:
+    """
+    根据响应头计算缓存有效期
+
+    参数:
+        headers: 响应头
+
+    返回:
+        tuple[bool, Optional[float]]: (是否允许存储, 有效期秒数)，
+        响应头未给出有效期时为None，由调用方使用启发式有效期
+    """
+    directives = _parse_cache_control(headers.get("cache-control", ""))
+    if "no-store" in directives or "private" in directives:
+        # 缓存在所有请求之间共享，只针对单个用户的private响应不存储
+        return False, None
+    if "no-cache" in directives:
+        return True, 0.0
+    try:
+        age = float(headers.get("age", 0))
+    except ValueError:
+        age = 0.0
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        try:
+            return True, max(0.0, float(max_age) - age)
+        except ValueError:
+            return True, 0.0
+    expires = headers.get("expires")
+    if expires:
+        try:
+            date = headers.get("date")
+            now = parsedate_to_datetime(date).timestamp() if date else time.time()
+            return True, max(0.0, parsedate_to_datetime(expires).timestamp() - now)
+        except (TypeError, ValueError):
+            # 无法解析的Expires(如"0")视为已过期
+            return True, 0.0
+    return True, None
+
+
+class HttpCache:
+    """
+    HTTP响应缓存类
+
+    按请求URL(含查询参数)、自定义请求头与Cookie缓存GET响应，遵循Cache-Control/Expires给出的有效期，
+    响应头未给出有效期时使用调用方提供的启发式有效期。过期条目带有ETag/Last-Modified时
+    以条件请求重新验证，收到304则继续使用缓存内容。
+    存储以响应体字节数为上限，超出时按最近最少使用的顺序淘汰
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entry_bytes: int = 4 * 1024 * 1024):
+        """
+        初始化HTTP缓存
+
+        参数:
+            max_bytes: 缓存的响应体总字节数上限
+            max_entry_bytes: 单个响应体的字节数上限，更大的响应不缓存
+        """
+        self.max_bytes: int = max_bytes
+        self.max_entry_bytes: int = max_entry_bytes
+        self._entries: OrderedDict[tuple[Any, ...], CacheEntry] = OrderedDict()
+        self._bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.revalidated: int = 0
+        self.evictions: int = 0
+
+    def configure(self, max_bytes: int, max_entry_bytes: int) -> None:
+        """
+        更新容量配置，超出新上限的条目立即淘汰
+
+        参数:
+            max_bytes: 缓存的响应体总字节数上限
+            max_entry_bytes: 单个响应体的字节数上限
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._evict()
+
+    @staticmethod
+    def make_key(
+        url: str,
+        params: Optional[dict[str, Any]],
+        headers: Optional[dict[str, str]],
+        cookies: Optional[str] = None,
+    ) -> tuple[Any, ...]:
+        """
+        构建缓存键
+
+        参数:
+            url: 请求URL
+            params: URL查询参数
+            headers: 自定义请求头
+            cookies: 客户端携带的Cookie，不同Cookie的响应分别缓存
+
+        返回:
+            tuple[Any, ...]: 缓存键
+        """
+        return (
+            url,
+            tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())),
+            tuple(sorted((k.lower(), str(v)) for k, v in (headers or {}).items())),
+            cookies or "",
+        )
+
+    @staticmethod
+    def is_cacheable_request(headers: Optional[dict[str, str]]) -> bool:
+        """
+        判断请求能否使用共享缓存，带Authorization头的请求不缓存
+
+        参数:
+            headers: 自定义请求头
+
+        返回:
+            bool: 是否可以使用缓存
+        """
+        return not any(k.lower() == "authorization" for k in (headers or {}))
+
+    def lookup(self, key: tuple[Any, ...]) -> tuple[Optional[CacheEntry], bool]:
+        """
+        查找缓存条目
+
+        参数:
+            key: 缓存键
+
+        返回:
+            tuple[Optional[CacheEntry], bool]: (缓存条目, 是否仍在有效期内)，没有缓存时条目为None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None, False
+        self._entries.move_to_end(key)
+        fresh = entry.expires_at > time.monotonic()
+        if fresh:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry, fresh
+
+    def peek(self, key: tuple[Any, ...]) -> Optional[CacheEntry]:
+        """
+        查看仍在有效期内的缓存条目，不更新命中统计与淘汰顺序
+
+        参数:
+            key: 缓存键
+
+        返回:
+            Optional[CacheEntry]: 有效期内的缓存条目，不存在或已过期时返回None
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        return entry
+
+    def store(
+        self,
+        key: tuple[Any, ...],
+        content: bytes,
+        url: str,
+        status_code: int,
+        headers: Headers,
+        encoding: str,
+        heuristic_ttl: float = 0,
+    ) -> Optional[CacheEntry]:
+        """
+        按响应头判断是否可缓存并存储响应
+
+        带Set-Cookie、Vary为*或Cookie、no-store或private的响应不缓存；没有有效期也没有验证器的响应不缓存
+
+        参数:
+            key: 缓存键
+            content: 响应体
+            url: 最终URL
+            status_code: 状态码
+            headers: 响应头
+            encoding: 响应编码
+            heuristic_ttl: 响应头未给出有效期时使用的有效期(秒)
+
+        返回:
+            Optional[CacheEntry]: 存储的条目，不可缓存时返回None
+        """
+        if status_code not in CACHEABLE_STATUS_CODES or len(content) > self.max_entry_bytes:
+            return None
+        if "set-cookie" in headers:
+            return None
+        vary = {v.strip().lower() for v in headers.get("vary", "").split(",")}
+        if "*" in vary or "cookie" in vary:
+            return None
+        storable, ttl = freshness_lifetime(headers)
+        if not storable:
+            return None
+        if ttl is None:
+            ttl = heuristic_ttl
+        entry = CacheEntry(content, url, status_code, headers, encoding, time.monotonic() + ttl)
+        if ttl <= 0 and not entry.validators:
+            return None
+        self._put(key, entry)
+        return entry
+
+    def refresh(self, key: tuple[Any, ...], entry: CacheEntry, headers: Headers, heuristic_ttl: float = 0) -> None:
+        """
+        收到304后用新的响应头刷新条目的有效期
+
+        参数:
+            key: 缓存键
+            entry: 被重新验证的条目
+            headers: 304响应的响应头
+            heuristic_ttl: 响应头未给出有效期时使用的有效期(秒)
+        """
+        merged = Headers(entry.headers)
+        for name, value in headers.items():
+            if name.lower() not in ("content-length", "content-encoding", "transfer-encoding"):
+                merged[name] = value
+        _, ttl = freshness_lifetime(merged)
+        entry.headers = merged
+        entry.expires_at = time.monotonic() + (heuristic_ttl if ttl is None else ttl)
+        self.revalidated += 1
+        if key in self._entries:
+            self._entries.move_to_end(key)
+
+    def _put(self, key: tuple[Any, ...], entry: CacheEntry) -> None:
+        """
+        写入条目并淘汰超出容量的旧条目
+
+        参数:
+            key: 缓存键
+            entry: 缓存条目
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = entry
+        self._bytes += entry.size
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        按最近最少使用的顺序淘汰条目，直到总字节数不超过上限
+        """
+        while self._entries and self._bytes > self.max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取缓存统计
+
+        返回:
+            dict[str, Any]: 条目数、占用字节数及命中/未命中/重新验证/淘汰次数
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+        }
+
+
+http_cache = HttpCache()
@@ -0,0 +1,88 @@
+from collections import deque
+from typing import Optional
+
+
+class LatencyTracker:
+    """
+    请求耗时统计类
+
+    按 (引擎, 请求步骤) 维护最近若干次成功请求的耗时滑动窗口，
+    用于计算分位数耗时。窗口滚动更新，耗时水平变化后统计会自动跟随
+    """
+
+    def __init__(self, window: int = 200):
+        """
+        初始化耗时统计
+
+        参数:
+            window: 每个 (引擎, 步骤) 保留的最近样本数
+        """
+        self.window: int = window
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+
+    def record(self, engine: str, step: str, elapsed: float) -> None:
+        """
+        记录一次请求耗时
+
+        参数:
+            engine: 引擎名称
+            step: 请求步骤名称
+            elapsed: 耗时(秒)
+        """
+        key = (engine, step)
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(elapsed)
+
+    def count(self, engine: str, step: str) -> int:
+        """
+        获取样本数量
+
+        参数:
+            engine: 引擎名称
+            step: 请求步骤名称
+
+        返回:
+            int: 当前窗口内的样本数
+        """
+        return len(self._samples.get((engine, step), ()))
+
+    def percentile(self, engine: str, step: str, quantile: float) -> Optional[float]:
+        """
+        计算耗时分位数
+
+        参数:
+            engine: 引擎名称
+            step: 请求步骤名称
+            quantile: 分位点，取值0~1，如0.95
+
+        返回:
+            Optional[float]: 分位数耗时(秒)，没有样本时返回None
+        """
+        samples = self._samples.get((engine, step))
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(quantile * (len(ordered) - 1)))))
+        return ordered[index]
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        """
+        获取所有引擎各步骤的耗时概况
+
+        返回:
+            dict[str, dict[str, dict[str, float]]]: 引擎 -> 步骤 -> {count, p50, p95, p99}
+        """
+        result: dict[str, dict[str, dict[str, float]]] = {}
+        for engine, step in self._samples:
+            result.setdefault(engine, {})[step] = {
+                "count": self.count(engine, step),
+                "p50": self.percentile(engine, step, 0.5),
+                "p95": self.percentile(engine, step, 0.95),
+                "p99": self.percentile(engine, step, 0.99),
+            }
+        return result
+
+
+latency_tracker = LatencyTracker()
@@ -1,7 +1,32 @@
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
+from functools import cached_property
+from importlib.util import find_spec
 from types import TracebackType
-from typing import Any, Optional, Union
-from httpx import AsyncClient, QueryParams, create_ssl_context
+from typing import IO, Any, Optional, Union
+from urllib.request import getproxies_environment, proxy_bypass_environment
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    AsyncHTTPTransport,
+    Headers,
+    Limits,
+    ProtocolError,
+    QueryParams,
+    Request,
+    Response,
+    Timeout,
+    TransportError,
+    create_ssl_context,
+)
+from .ext_tools import json_loads
+from .bandwidth import TransferStats, measure_response
+from .dns_cache import CachingNetworkBackend, DNSCache, dns_cache
+from .fault_injection import FaultInjector
+from .http_cache import HttpCache
+from .proxy_pool import ProxyPool, ProxySpec
+from .stream_match import StreamMatcher
+from .download import DownloadLimits, DownloadStats, ProgressCallback, stream_download
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -11,36 +36,442 @@ DEFAULT_HEADERS = {
     )
 }
 
+# 请求扩展字段：主请求在ROUTE_EXTENSION的字典中记录所用代理，对冲副本以HEDGE_EXTENSION携带同一字典
+ROUTE_EXTENSION = "img_rev_route"
+HEDGE_EXTENSION = "img_rev_hedge"
+
+HTTP2_MODES = ("auto", "on", "off")
+# 已确认支持HTTP/2的主机连续出现协议错误达到该次数后才降级为HTTP/1.1
+HTTP2_FAILURE_THRESHOLD = 3
+# 主机降级为HTTP/1.1的持续时间(秒)，到期后auto模式重新尝试协商HTTP/2
+HTTP1_ONLY_TTL = 600.0
+# 可安全重发的HTTP方法，协商失败后仅这些请求以HTTP/1.1立即重发
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+HTTP2_AVAILABLE = find_spec("h2") is not None
+DEFAULT_LIMITS = Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0)
+
+
+class _SharedTransport(AsyncBaseTransport):
+    """
+    共享传输层包装类
+
+    将请求转发给连接池中长期存活的传输层，自身关闭时不释放底层连接，
+    底层连接统一由ClientPool管理。每个请求按目标主机和HTTP/2模式选择底层传输层，
+    配置为代理池时每个请求选择评分最好的健康代理，并将结果反馈给代理池。
+    未配置代理时与httpx的trust_env行为一致，按环境变量(HTTP(S)_PROXY/ALL_PROXY/NO_PROXY)选择代理。
+    对冲副本请求不与主请求共用连接：配置为代理池时选择主请求以外的代理，
+    并始终通过独立的HTTP/1.1连接池发出，避免成为同一条(可能已经停滞的)HTTP/2连接上的另一个流
+    """
+
+    def __init__(
+        self,
+        pool: "ClientPool",
+        proxies: ProxySpec,
+        verify_ssl: bool,
+        http2_mode: str,
+        limits: Limits,
+        env_proxies: Optional[dict[str, str]] = None,
+    ):
+        """
+        初始化共享传输层包装
+
+        参数:
+            pool: 连接池注册表
+            proxies: 代理服务器地址、代理池或None(直连)
+            verify_ssl: 是否验证SSL证书
+            http2_mode: HTTP/2模式(auto/on/off)
+            limits: 连接数与keep-alive限制
+            env_proxies: 环境变量中的代理配置(协议 -> 代理地址，no为不走代理的主机)，仅在未配置代理时使用
+        """
+        self._pool: ClientPool = pool
+        self._proxies: ProxySpec = proxies
+        self._verify_ssl: bool = verify_ssl
+        self._http2_mode: str = http2_mode
+        self._limits: Limits = limits
+        self._env_proxies: dict[str, str] = env_proxies or {}
+
+    def _environment_proxy(self, request: Request) -> Optional[str]:
+        """
+        按环境变量确定请求使用的代理
+
+        参数:
+            request: HTTP请求对象
+
+        返回:
+            Optional[str]: 代理地址，没有对应的环境代理或主机在NO_PROXY中时返回None
+        """
+        proxy = self._env_proxies.get(request.url.scheme) or self._env_proxies.get("all")
+        if not proxy or proxy_bypass_environment(request.url.host, self._env_proxies):
+            return None
+        return proxy if "://" in proxy else f"http://{proxy}"
+
+    async def handle_async_request(self, request: Request) -> Response:
+        """
+        转发请求到底层传输层
+
+        配置为代理池时先选择代理，请求成功后上报响应头耗时，传输层错误时上报失败
+
+        参数:
+            request: HTTP请求对象
+
+        返回:
+            Response: HTTP响应对象
+        """
+        route: Optional[dict[str, Any]] = request.extensions.get(ROUTE_EXTENSION)
+        hedge_of: Optional[dict[str, Any]] = request.extensions.get(HEDGE_EXTENSION)
+        if not isinstance(self._proxies, ProxyPool):
+            proxy = self._proxies or self._environment_proxy(request)
+            return await self._send(request, proxy, hedge_of is not None)
+        proxy_pool = self._proxies
+        proxy = proxy_pool.select(exclude=hedge_of.get("proxy") if hedge_of is not None else None)
+        if route is not None:
+            route["proxy"] = proxy
+        start = time.monotonic()
+        try:
+            response = await self._send(request, proxy, hedge_of is not None)
+        except TransportError:
+            proxy_pool.record_failure(proxy)
+            raise
+        except BaseException:
+            proxy_pool.release(proxy)
+            raise
+        proxy_pool.record_success(proxy, time.monotonic() - start)
+        return response
+
+    async def _send(self, request: Request, proxy: Optional[str], hedge: bool = False) -> Response:
+        """
+        通过指定代理发送请求
+
+        auto模式下首次连接通过ALPN协商协议。尚未成功使用过HTTP/2的主机出现协议错误时视为协商失败，
+        该主机在一段时间内改用HTTP/1.1，可安全重发的请求(GET/HEAD/OPTIONS)立即以HTTP/1.1重发，
+        其余请求的错误交由重试层按幂等性处理；已确认支持HTTP/2的主机连续多次出现协议错误才降级。
+        对冲副本请求使用独立的HTTP/1.1连接池。
+        连接池配置了故障注入器时，请求经由故障注入器发往底层传输层
+
+        参数:
+            request: HTTP请求对象
+            proxy: 代理地址，None表示直连
+            hedge: 是否为对冲副本请求
+
+        返回:
+            Response: HTTP响应对象
+        """
+        host = request.url.host
+        use_http2 = not hedge and self._pool.resolve_http2(host, self._http2_mode)
+        transport = self._pool._get_raw_transport(proxy, self._verify_ssl, use_http2, self._limits, isolated=hedge)
+        start = time.monotonic()
+        try:
+            response = await self._handle(request, transport)
+        except ProtocolError:
+            if not (use_http2 and self._http2_mode == "auto"):
+                raise
+            negotiation_failed = self._pool.record_http2_failure(host)
+            if not negotiation_failed or request.method not in SAFE_METHODS:
+                raise
+            transport = self._pool._get_raw_transport(proxy, self._verify_ssl, False, self._limits)
+            start = time.monotonic()
+            response = await self._handle(request, transport)
+        http_version = response.extensions.get("http_version", b"HTTP/1.1")
+        if isinstance(http_version, bytes):
+            http_version = http_version.decode("ascii", "ignore")
+        self._pool.record_protocol(host, http_version, time.monotonic() - start)
+        return response
+
+    async def _handle(self, request: Request, transport: AsyncHTTPTransport) -> Response:
+        """
+        通过底层传输层发送请求，配置了故障注入器时由其注入故障
+
+        参数:
+            request: HTTP请求对象
+            transport: 底层传输层
+
+        返回:
+            Response: HTTP响应对象
+        """
+        fault_injector = self._pool.fault_injector
+        if fault_injector is None:
+            return await transport.handle_async_request(request)
+        return await fault_injector.handle(request, transport)
+
+    async def aclose(self) -> None:
+        """
+        关闭包装层，底层连接保持存活以供复用
+        """
+        pass
+
+
+class ClientPool:
+    """
+    HTTP连接池注册表
+
+    按 (代理, 是否验证SSL, 是否启用HTTP/2, 连接限制) 复用底层传输层及其keep-alive连接，
+    避免每次搜索都重新建立TCP连接和TLS握手。连接池在插件生命周期内长期存活，
+    由插件关闭时统一释放。同时记录各主机协商到的HTTP版本及响应耗时；
+    新建的传输层通过DNS缓存解析主机名，
+    配置故障注入器后所有请求经由其注入延迟与错误，用于离线压测
+    """
+
+    def __init__(self):
+        """
+        初始化连接池注册表
+        """
+        self._transports: dict[tuple[Any, ...], AsyncHTTPTransport] = {}
+        # 主机 -> HTTP/1.1降级的到期时间(time.monotonic)
+        self._http1_only_until: dict[str, float] = {}
+        self._http2_failures: dict[str, int] = {}
+        self._http2_confirmed: set[str] = set()
+        self._protocol_stats: dict[str, dict[str, Any]] = {}
+        self.dns_cache: Optional[DNSCache] = dns_cache
+        self.fault_injector: Optional[FaultInjector] = None
+
+    @staticmethod
+    def normalize_http2_mode(http2: Union[bool, str, None]) -> str:
+        """
+        将HTTP/2配置规范化为auto/on/off之一
+
+        参数:
+            http2: 布尔值或模式字符串
+
+        返回:
+            str: 规范化后的模式，未安装h2库时始终为off
+        """
+        if isinstance(http2, bool):
+            mode = "on" if http2 else "off"
+        else:
+            mode = str(http2 or "off").strip().lower()
+            if mode not in HTTP2_MODES:
+                mode = "off"
+        return mode if HTTP2_AVAILABLE else "off"
+
+    def resolve_http2(self, host: str, http2_mode: str) -> bool:
+        """
+        判断对指定主机的请求是否使用支持HTTP/2的传输层
+
+        参数:
+            host: 目标主机名
+            http2_mode: HTTP/2模式(auto/on/off)
+
+        返回:
+            bool: 是否使用HTTP/2
+        """
+        if http2_mode == "on":
+            return True
+        if http2_mode == "auto":
+            return not self.is_http1_only(host)
+        return False
+
+    def is_http1_only(self, host: str) -> bool:
+        """
+        判断主机当前是否处于HTTP/1.1降级期，降级到期后清除标记
+
+        参数:
+            host: 目标主机名
+
+        返回:
+            bool: 是否仅使用HTTP/1.1
+        """
+        until = self._http1_only_until.get(host)
+        if until is None:
+            return False
+        if until <= time.monotonic():
+            del self._http1_only_until[host]
+            return False
+        return True
+
+    def mark_http1_only(self, host: str, ttl: float = HTTP1_ONLY_TTL) -> None:
+        """
+        记住主机不支持HTTP/2，之后ttl秒内auto模式下直接使用HTTP/1.1
+
+        参数:
+            host: 目标主机名
+            ttl: 降级持续时间(秒)
+        """
+        self._http1_only_until[host] = time.monotonic() + ttl
+        self._http2_failures.pop(host, None)
+
+    def record_http2_failure(self, host: str) -> bool:
+        """
+        记录主机的一次HTTP/2协议错误
+
+        尚未成功使用过HTTP/2的主机视为协商失败并立即降级；
+        已确认支持HTTP/2的主机(如偶发的GOAWAY或流重置)连续达到阈值次数才降级
+
+        参数:
+            host: 目标主机名
+
+        返回:
+            bool: 是否为协商失败
+        """
+        if host not in self._http2_confirmed:
+            self.mark_http1_only(host)
+            return True
+        failures = self._http2_failures.get(host, 0) + 1
+        if failures >= HTTP2_FAILURE_THRESHOLD:
+            self.mark_http1_only(host)
+        else:
+            self._http2_failures[host] = failures
+        return False
+
+    def record_protocol(self, host: str, http_version: str, elapsed: float) -> None:
+        """
+        记录主机协商到的HTTP版本与响应头耗时
+
+        参数:
+            host: 目标主机名
+            http_version: 协商到的HTTP版本
+            elapsed: 从发出请求到收到响应头的耗时(秒)
+        """
+        if http_version == "HTTP/2":
+            self._http2_confirmed.add(host)
+            self._http2_failures.pop(host, None)
+        stats = self._protocol_stats.setdefault(host, {})
+        version_stats = stats.setdefault(http_version, {"requests": 0, "total_elapsed": 0.0})
+        version_stats["requests"] += 1
+        version_stats["total_elapsed"] += elapsed
+
+    def protocol_stats(self) -> dict[str, dict[str, Any]]:
+        """
+        获取各主机的HTTP版本使用统计，便于比较HTTP/2与HTTP/1.1的实际收益
+
+        返回:
+            dict[str, dict[str, Any]]: 主机 -> {HTTP版本: {requests, avg_elapsed}} 以及http1_only标记
+        """
+        result: dict[str, dict[str, Any]] = {}
+        for host, stats in self._protocol_stats.items():
+            result[host] = {
+                version: {
+                    "requests": item["requests"],
+                    "avg_elapsed": item["total_elapsed"] / item["requests"],
+                }
+                for version, item in stats.items()
+            }
+            result[host]["http1_only"] = self.is_http1_only(host)
+        return result
+
+    def _get_raw_transport(
+        self,
+        proxies: Optional[str],
+        verify_ssl: bool,
+        http2: bool,
+        limits: Limits = DEFAULT_LIMITS,
+        isolated: bool = False,
+    ) -> AsyncHTTPTransport:
+        """
+        获取指定配置对应的底层传输层，不存在时创建
+
+        参数:
+            proxies: 代理服务器地址，None表示直连
+            verify_ssl: 是否验证SSL证书
+            http2: 是否启用HTTP/2
+            limits: 连接数与keep-alive限制
+            isolated: 是否使用与普通请求分开的连接池(用于对冲副本请求)
+
+        返回:
+            AsyncHTTPTransport: 底层传输层
+        """
+        key = (
+            proxies or None,
+            verify_ssl,
+            http2,
+            limits.max_connections,
+            limits.max_keepalive_connections,
+            limits.keepalive_expiry,
+            isolated,
+        )
+        transport = self._transports.get(key)
+        if transport is None:
+            ssl_context = create_ssl_context(verify=verify_ssl)
+            ssl_context.set_ciphers("DEFAULT")
+            transport = AsyncHTTPTransport(
+                verify=ssl_context,
+                http2=http2,
+                limits=limits,
+                proxy=proxies or None,
+            )
+            if self.dns_cache is not None:
+                # httpx未公开network_backend参数，替换底层连接池的网络后端以接入DNS缓存
+                backend = transport._pool._network_backend
+                transport._pool._network_backend = CachingNetworkBackend(self.dns_cache, backend)
+            self._transports[key] = transport
+        return transport
+
+    def get_transport(
+        self,
+        proxies: ProxySpec = None,
+        verify_ssl: bool = True,
+        http2: Union[bool, str] = False,
+        limits: Optional[Limits] = None,
+        trust_env: bool = True,
+    ) -> AsyncBaseTransport:
+        """
+        获取指定配置对应的共享传输层
+
+        参数:
+            proxies: 代理服务器地址或代理池，None表示不使用配置的代理
+            verify_ssl: 是否验证SSL证书
+            http2: 是否启用HTTP/2，可为布尔值或auto/on/off
+            limits: 连接数与keep-alive限制，默认使用httpx默认值
+            trust_env: 未配置代理时是否使用环境变量中的代理，与httpx客户端的trust_env一致
+
+        返回:
+            AsyncBaseTransport: 不会关闭底层连接的共享传输层
+        """
+        return _SharedTransport(
+            self,
+            proxies or None,
+            verify_ssl,
+            self.normalize_http2_mode(http2),
+            limits or DEFAULT_LIMITS,
+            getproxies_environment() if trust_env and not proxies else None,
+        )
+
+    async def close(self) -> None:
+        """
+        关闭所有底层传输层及其连接
+        """
+        transports = list(self._transports.values())
+        self._transports.clear()
+        for transport in transports:
+            await transport.aclose()
+
+
+client_pool = ClientPool()
+
 
 class Network:
     """
     网络请求客户端类
     
     封装httpx.AsyncClient，提供异步HTTP请求功能，
-    支持代理、自定义头部、Cookie等设置
+    支持代理、自定义头部、Cookie等设置。底层连接来自共享连接池，
+    Cookie仅在当前实例内有效，不会在不同请求之间串用
     """
     
     def __init__(
         self,
         internal: bool = False,
-        proxies: Optional[str] = None,
+        proxies: ProxySpec = None,
         headers: Optional[dict[str, str]] = None,
         cookies: Optional[str] = None,
-        timeout: float = 30,
+        timeout: Union[float, Timeout] = 30,
         verify_ssl: bool = True,
-        http2: bool = False,
+        http2: Union[bool, str] = False,
+        pool: Optional[ClientPool] = None,
+        limits: Optional[Limits] = None,
     ):
         """
         初始化网络客户端
         
         参数:
             internal: 是否为内部客户端
-            proxies: 代理服务器地址
+            proxies: 代理服务器地址或代理池
             headers: 自定义HTTP头部
             cookies: Cookie字符串
-            timeout: 请求超时时间(秒)
+            timeout: 请求超时时间(秒)，或分别指定connect/read/write/pool的Timeout对象
             verify_ssl: 是否验证SSL证书
-            http2: 是否启用HTTP/2
+            http2: 是否启用HTTP/2，可为布尔值或auto/on/off
+            pool: 连接池注册表，默认使用进程级共享连接池
+            limits: 连接数与keep-alive限制
         """
         self.internal: bool = internal
         headers = {**DEFAULT_HEADERS, **(headers or {})}
@@ -48,14 +479,11 @@ class Network:
         if cookies:
             self.cookies = {k.strip(): v for k, v in (c.strip().split("=", 1) 
                            for c in cookies.split(";") if "=" in c)}
-        ssl_context = create_ssl_context(verify=verify_ssl)
-        ssl_context.set_ciphers("DEFAULT")
+        pool = pool or client_pool
         self.client: AsyncClient = AsyncClient(
             headers=headers,
             cookies=self.cookies,
-            verify=ssl_context,
-            http2=http2,
-            proxy=proxies,
+            transport=pool.get_transport(proxies, verify_ssl, http2, limits),
             timeout=timeout,
             follow_redirects=True,
         )
@@ -111,24 +539,26 @@ class ClientManager:
     def __init__(
         self,
         client: Optional[AsyncClient] = None,
-        proxies: Optional[str] = None,
+        proxies: ProxySpec = None,
         headers: Optional[dict[str, str]] = None,
         cookies: Optional[str] = None,
-        timeout: float = 30,
+        timeout: Union[float, Timeout] = 30,
         verify_ssl: bool = True,
-        http2: bool = False,
+        http2: Union[bool, str] = False,
+        limits: Optional[Limits] = None,
     ):
         """
         初始化客户端管理器
         
         参数:
             client: 现有的HTTP客户端实例
-            proxies: 代理服务器地址
+            proxies: 代理服务器地址或代理池
             headers: 自定义HTTP头部
             cookies: Cookie字符串
-            timeout: 请求超时时间(秒)
+            timeout: 请求超时时间(秒)，或分别指定connect/read/write/pool的Timeout对象
             verify_ssl: 是否验证SSL证书
-            http2: 是否启用HTTP/2
+            http2: 是否启用HTTP/2，可为布尔值或auto/on/off
+            limits: 连接数与keep-alive限制
         """
         self.client: Union[Network, AsyncClient] = client or Network(
             internal=True,
@@ -138,6 +568,7 @@ class ClientManager:
             timeout=timeout,
             verify_ssl=verify_ssl,
             http2=http2,
+            limits=limits,
         )
 
     async def __aenter__(self) -> AsyncClient:
@@ -172,11 +603,64 @@ class RESP:
     """
     HTTP响应数据类
     
-    简化的HTTP响应表示，包含文本内容、URL和状态码
+    简化的HTTP响应表示，保存原始字节内容、URL、状态码和响应头，
+    文本与JSON在首次访问时才解码。transfer记录该请求收发的字节数，
+    from_cache表示响应直接来自HTTP缓存而未经过网络
     """
-    text: str
+    content: bytes
     url: str
     status_code: int
+    headers: Headers = field(default_factory=Headers)
+    encoding: str = "utf-8"
+    transfer: TransferStats = field(default_factory=TransferStats)
+    from_cache: bool = False
+
+    @property
+    def content_type(self) -> str:
+        """
+        获取不含参数的小写Content-Type
+
+        返回:
+            str: 如"application/json"，缺失时为空字符串
+        """
+        return self.headers.get("content-type", "").split(";")[0].strip().lower()
+
+    @cached_property
+    def text(self) -> str:
+        """
+        按响应编码解码后的文本内容，首次访问时解码并缓存
+
+        返回:
+            str: 文本内容
+        """
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        """
+        将响应内容解析为JSON，直接从字节解析而不经过文本解码
+
+        返回:
+            Any: 解析后的对象
+
+        异常:
+            ValueError: 当内容不是合法JSON时抛出
+        """
+        return json_loads(self.content)
+
+
+@dataclass
+class StreamResult(RESP):
+    """
+    流式请求结果数据类
+
+    content只包含匹配器截取的片段(未匹配时为空)，matched表示是否匹配成功，
+    bytes_read为实际接收的响应体字节数
+    """
+    matched: bool = False
+    bytes_read: int = 0
 
 
 class HandOver:
@@ -189,32 +673,45 @@ class HandOver:
     def __init__(
         self,
         client: Optional[AsyncClient] = None,
-        proxies: Optional[str] = None,
+        proxies: ProxySpec = None,
         headers: Optional[dict[str, str]] = None,
         cookies: Optional[str] = None,
-        timeout: float = 30,
+        timeout: Union[float, Timeout] = 30,
         verify_ssl: bool = True,
-        http2: bool = False,
+        http2: Union[bool, str] = False,
+        limits: Optional[Limits] = None,
+        download_limits: Optional[DownloadLimits] = None,
+        http_cache: Optional[HttpCache] = None,
+        cache_ttl: float = 0,
     ):
         """
         初始化HTTP请求转发器
         
         参数:
             client: 现有的HTTP客户端实例
-            proxies: 代理服务器地址
+            proxies: 代理服务器地址或代理池
             headers: 自定义HTTP头部
             cookies: Cookie字符串
-            timeout: 请求超时时间(秒)
+            timeout: 请求超时时间(秒)，或分别指定connect/read/write/pool的Timeout对象
             verify_ssl: 是否验证SSL证书
-            http2: 是否启用HTTP/2
+            http2: 是否启用HTTP/2，可为布尔值或auto/on/off
+            limits: 连接数与keep-alive限制
+            download_limits: 流式下载的大小上限与内存缓冲阈值
+            http_cache: GET响应缓存，默认不缓存
+            cache_ttl: 响应头未给出有效期时使用的启发式缓存有效期(秒)
         """
         self.client: Optional[AsyncClient] = client
-        self.proxies: Optional[str] = proxies
+        self.proxies: ProxySpec = proxies
         self.headers: Optional[dict[str, str]] = headers
         self.cookies: Optional[str] = cookies
-        self.timeout: float = timeout
+        self.timeout: Union[float, Timeout] = timeout
         self.verify_ssl: bool = verify_ssl
-        self.http2: bool = http2
+        self.http2: Union[bool, str] = http2
+        self.limits: Optional[Limits] = limits
+        self.download_limits: DownloadLimits = download_limits or DownloadLimits()
+        self.last_download: Optional[DownloadStats] = None
+        self.http_cache: Optional[HttpCache] = http_cache
+        self.cache_ttl: float = cache_ttl
         # 创建一个单一的ClientManager实例
         self.client_manager = ClientManager(
             self.client,
@@ -224,6 +721,7 @@ class HandOver:
             self.timeout,
             self.verify_ssl,
             self.http2,
+            self.limits,
         )
         self._client_initialized = False
         self._managed_client = None
@@ -270,6 +768,55 @@ class HandOver:
         """
         await self.close()
 
+    def is_cached(
+        self,
+        url: str,
+        params: Optional[dict[str, str]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> bool:
+        """
+        判断GET请求能否直接由HTTP缓存响应而不发出网络请求，不计入缓存命中统计
+
+        参数:
+            url: 请求URL
+            params: URL查询参数
+            headers: 自定义HTTP头部
+
+        返回:
+            bool: 缓存中是否有该请求仍在有效期内的响应
+        """
+        if self.http_cache is None or not self.http_cache.is_cacheable_request(headers):
+            return False
+        return self.http_cache.peek(self._cache_key(url, params, headers)) is not None
+
+    def _cache_key(
+        self,
+        url: str,
+        params: Optional[dict[str, str]],
+        headers: Optional[dict[str, str]],
+    ) -> tuple[Any, ...]:
+        """
+        构建HTTP缓存键，包含客户端Cookie容器对该URL实际发送的Cookie
+
+        传入现有客户端时Cookie由客户端(如Network)管理，响应刷新的Cookie同样计入缓存键
+
+        参数:
+            url: 请求URL
+            params: URL查询参数
+            headers: 自定义HTTP头部
+
+        返回:
+            tuple[Any, ...]: 缓存键
+        """
+        client = self._managed_client or self.client
+        if client is None:
+            cookies = self.cookies or ""
+        else:
+            request = Request("GET", url)
+            client.cookies.set_cookie_header(request)
+            cookies = request.headers.get("cookie", "")
+        return self.http_cache.make_key(url, params, headers, cookies)
+
     async def get(
         self,
         url: str,
@@ -280,6 +827,9 @@ class HandOver:
         """
         执行GET请求
         
+        配置了HTTP缓存时，有效期内的响应直接从缓存返回；过期但带有验证器的响应以条件请求重新验证。
+        带Authorization头的请求不使用缓存
+        
         参数:
             url: 请求URL
             params: URL查询参数
@@ -290,8 +840,36 @@ class HandOver:
             RESP: 简化的HTTP响应对象
         """
         client = await self._get_client()
-        resp = await client.get(url, params=params, headers=headers, **kwargs)
-        return RESP(resp.text, str(resp.url), resp.status_code)
+        if self.http_cache is None or not self.http_cache.is_cacheable_request(headers):
+            resp = await client.get(url, params=params, headers=headers, **kwargs)
+            return RESP(
+                resp.content,
+                str(resp.url),
+                resp.status_code,
+                resp.headers,
+                resp.encoding or "utf-8",
+                measure_response(resp, len(resp.content)),
+            )
+        key = self._cache_key(url, params, headers)
+        entry, fresh = self.http_cache.lookup(key)
+        if entry is not None and fresh:
+            return RESP(entry.content, entry.url, entry.status_code, entry.headers, entry.encoding, from_cache=True)
+        request_headers = {**(headers or {}), **(entry.validators if entry is not None else {})}
+        resp = await client.get(url, params=params, headers=request_headers or None, **kwargs)
+        transfer = measure_response(resp, len(resp.content))
+        if entry is not None and resp.status_code == 304:
+            self.http_cache.refresh(key, entry, resp.headers, self.cache_ttl)
+            return RESP(entry.content, entry.url, entry.status_code, entry.headers, entry.encoding, transfer)
+        self.http_cache.store(
+            key,
+            resp.content,
+            str(resp.url),
+            resp.status_code,
+            resp.headers,
+            resp.encoding or "utf-8",
+            self.cache_ttl,
+        )
+        return RESP(resp.content, str(resp.url), resp.status_code, resp.headers, resp.encoding or "utf-8", transfer)
 
     async def post(
         self,
@@ -328,19 +906,79 @@ class HandOver:
             json=json,
             **kwargs,
         )
-        return RESP(resp.text, str(resp.url), resp.status_code)
+        return RESP(
+            resp.content,
+            str(resp.url),
+            resp.status_code,
+            resp.headers,
+            resp.encoding or "utf-8",
+            measure_response(resp, len(resp.content)),
+        )
 
-    async def download(self, url: str, headers: Optional[dict[str, str]] = None) -> bytes:
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        matcher: StreamMatcher,
+        **kwargs: Any,
+    ) -> StreamResult:
         """
-        下载文件
+        以流式方式执行请求，匹配器找到所需片段后立即关闭连接
+        
+        参数:
+            method: HTTP方法(get/post)
+            url: 请求URL
+            matcher: 增量匹配器，每个请求应使用独立的实例
+            **kwargs: 其他请求参数(params/headers/data/files/json等)
+            
+        返回:
+            StreamResult: 包含匹配片段的响应对象
+        """
+        client = await self._get_client()
+        matched: Optional[bytes] = None
+        bytes_read = 0
+        async with client.stream(method.upper(), url, **kwargs) as resp:
+            async for chunk in resp.aiter_bytes():
+                bytes_read += len(chunk)
+                matched = matcher.feed(chunk)
+                if matched is not None:
+                    break
+            else:
+                matched = matcher.finish()
+            transfer = measure_response(resp, bytes_read)
+        return StreamResult(
+            matched or b"",
+            str(resp.url),
+            resp.status_code,
+            resp.headers,
+            resp.encoding or "utf-8",
+            transfer,
+            matched=matched is not None,
+            bytes_read=bytes_read,
+        )
+
+    async def download(
+        self,
+        url: str,
+        headers: Optional[dict[str, str]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> IO[bytes]:
+        """
+        以流式方式下载文件，超过大小上限时中止
         
         参数:
             url: 下载URL
             headers: 自定义HTTP头部
+            on_progress: 下载进度回调
             
         返回:
-            bytes: 下载的文件内容
+            IO[bytes]: 已定位到开头的内容缓冲区，较大的内容存放在临时文件中
+            
+        异常:
+            DownloadTooLarge: 内容超过download_limits.max_bytes时抛出
         """
         client = await self._get_client()
-        resp = await client.get(url, headers=headers)
-        return resp.read()
+        buffer, self.last_download = await stream_download(
+            client, url, self.download_limits, headers=headers, on_progress=on_progress
+        )
+        return buffer
@@ -0,0 +1,360 @@
+import io
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Union
+from PIL import Image
+
+ImageData = Union[bytes, memoryview]
+
+# pHash计算DCT时的缩略图边长
+PHASH_IMAGE_SIZE = 32
+# 灰度缩略图像素标准差低于该值的图像(纯色、近似纯色)视为信息量不足，不参与近似重复查找
+MIN_PIXEL_STDDEV = 3.0
+# 64位dHash中为1(或为0)的位数少于该值时视为信息量不足
+MIN_HASH_BITS = 8
+
+
+@dataclass(frozen=True)
+class ImageHashes:
+    """
+    图像感知哈希数据类
+
+    dhash用于在BK树中查找候选，phash用于确认候选确实是同一张图
+    """
+    dhash: int
+    phash: int
+
+
+def _grayscale(img: Image.Image, width: int, height: int) -> list[int]:
+    """
+    将图像转为灰度并缩放，返回逐行排列的像素值
+
+    参数:
+        img: 图像
+        width: 缩放后的宽度
+        height: 缩放后的高度
+
+    返回:
+        list[int]: 像素值列表
+    """
+    return list(img.convert("L").resize((width, height), Image.LANCZOS).tobytes())
+
+
+def _dhash_bits(pixels: list[int], hash_size: int) -> int:
+    """
+    由(hash_size+1)×hash_size的灰度像素计算差异哈希
+
+    参数:
+        pixels: 灰度像素值
+        hash_size: 哈希边长
+
+    返回:
+        int: 打包为整数的哈希
+    """
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def _phash_bits(pixels: list[int], size: int, hash_size: int) -> int:
+    """
+    由size×size的灰度像素计算感知哈希
+
+    对图像做二维DCT，取左上角hash_size×hash_size的低频系数，与其中位数(不含直流分量)比较得到各位
+
+    参数:
+        pixels: 灰度像素值
+        size: 缩略图边长
+        hash_size: 哈希边长
+
+    返回:
+        int: 打包为整数的哈希
+    """
+    cosines = [
+        [math.cos(math.pi * (2 * x + 1) * u / (2 * size)) for x in range(size)]
+        for u in range(hash_size)
+    ]
+    # 先对每行做一维DCT，只保留需要的低频系数，再对这些系数按列做一维DCT
+    rows = [
+        [sum(c * p for c, p in zip(cosines[u], pixels[y * size:(y + 1) * size])) for u in range(hash_size)]
+        for y in range(size)
+    ]
+    coefficients = [
+        sum(cosines[v][y] * rows[y][u] for y in range(size))
+        for v in range(hash_size)
+        for u in range(hash_size)
+    ]
+    median = statistics.median(coefficients[1:])
+    value = 0
+    for coefficient in coefficients:
+        value = (value << 1) | (coefficient > median)
+    return value
+
+
+def _is_informative(value_hash: int, bits: int) -> bool:
+    """
+    判断哈希的信息量是否足够，几乎全为0或全为1的哈希来自平坦或单向渐变的图像，容易互相碰撞
+
+    参数:
+        value_hash: 哈希
+        bits: 哈希位数
+
+    返回:
+        bool: 信息量是否足够
+    """
+    ones = bin(value_hash).count("1")
+    return MIN_HASH_BITS <= ones <= bits - MIN_HASH_BITS
+
+
+def dhash(data: ImageData, hash_size: int = 8) -> Optional[int]:
+    """
+    计算图像的差异哈希(dHash)
+
+    将图像转为灰度并缩放到(hash_size+1)×hash_size，逐行比较相邻像素的明暗得到hash_size²位哈希。
+    重新压缩、缩放后的图像哈希基本不变；该函数涉及图像解码，应在线程中调用
+
+    参数:
+        data: 图像数据
+        hash_size: 哈希边长，默认8得到64位哈希
+
+    返回:
+        Optional[int]: 打包为整数的哈希，无法解码图像时返回None
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("L", (hash_size * 4, hash_size * 4))
+            pixels = _grayscale(img, hash_size + 1, hash_size)
+    except Exception:
+        return None
+    return _dhash_bits(pixels, hash_size)
+
+
+def image_hashes(data: ImageData) -> Optional[ImageHashes]:
+    """
+    解码一次图像，同时计算64位dHash与64位pHash
+
+    纯色或近似纯色(灰度缩略图标准差过低)的图像，以及哈希几乎全为0或全为1的图像信息量不足，
+    不同图像之间容易碰撞，此时返回None；该函数涉及图像解码，应在线程中调用
+
+    参数:
+        data: 图像数据
+
+    返回:
+        Optional[ImageHashes]: 图像的感知哈希，无法解码图像或信息量不足时返回None
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("L", (PHASH_IMAGE_SIZE * 2, PHASH_IMAGE_SIZE * 2))
+            gray = img.convert("L")
+            phash_pixels = _grayscale(gray, PHASH_IMAGE_SIZE, PHASH_IMAGE_SIZE)
+            dhash_pixels = _grayscale(gray, 9, 8)
+    except Exception:
+        return None
+    if statistics.pstdev(phash_pixels) < MIN_PIXEL_STDDEV:
+        return None
+    value_dhash = _dhash_bits(dhash_pixels, 8)
+    if not _is_informative(value_dhash, 64):
+        return None
+    return ImageHashes(value_dhash, _phash_bits(phash_pixels, PHASH_IMAGE_SIZE, 8))
+
+
+def hamming(a: int, b: int) -> int:
+    """
+    计算两个哈希的汉明距离
+
+    参数:
+        a: 哈希
+        b: 哈希
+
+    返回:
+        int: 不同的位数
+    """
+    return bin(a ^ b).count("1")
+
+
+class BKTree:
+    """
+    BK树
+
+    以汉明距离为度量组织哈希，查询时利用三角不等式只访问距离区间内的子树，
+    查询半径较小时只需比较少量节点
+    """
+
+    def __init__(self):
+        """
+        初始化空的BK树
+        """
+        # 节点: [哈希, 值, {距离: 子节点}]
+        self._root: Optional[list[Any]] = None
+        self.size: int = 0
+
+    def add(self, value_hash: int, value: Any) -> None:
+        """
+        插入哈希及其关联值，哈希已存在时替换关联值
+
+        参数:
+            value_hash: 哈希
+            value: 关联值
+        """
+        if self._root is None:
+            self._root = [value_hash, value, {}]
+            self.size = 1
+            return
+        node = self._root
+        while True:
+            distance = hamming(value_hash, node[0])
+            if distance == 0:
+                node[1] = value
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value_hash, value, {}]
+                self.size += 1
+                return
+            node = child
+
+    def search(self, value_hash: int, max_distance: int) -> list[tuple[int, int, Any]]:
+        """
+        查找距离不超过max_distance的所有哈希
+
+        参数:
+            value_hash: 查询哈希
+            max_distance: 最大汉明距离
+
+        返回:
+            list[tuple[int, int, Any]]: (距离, 哈希, 关联值)列表，按距离升序
+        """
+        results = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value_hash, node[0])
+            if distance <= max_distance:
+                results.append((distance, node[0], node[1]))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in node[2].items() if low <= d <= high)
+        results.sort(key=lambda item: item[0])
+        return results
+
+    def items(self) -> list[tuple[int, Any]]:
+        """
+        获取所有哈希及关联值
+
+        返回:
+            list[tuple[int, Any]]: (哈希, 关联值)列表
+        """
+        result = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            result.append((node[0], node[1]))
+            stack.extend(node[2].values())
+        return result
+
+
+class NearDuplicateIndex:
+    """
+    近似重复图像索引
+
+    按搜索范围(引擎与有效参数)为每张搜索过的图像记录dHash、pHash及其搜索结果，
+    查询时以dHash在BK树中查找距离不超过max_distance的候选，再要求pHash距离不超过max_phash_distance，
+    返回有效期内dHash距离最小的结果。
+    BK树不支持删除，过期或超出容量的条目在重建索引时清除
+    """
+
+    def __init__(self, max_distance: int = 6, ttl: float = 3600, max_entries: int = 10000,
+                 max_phash_distance: int = 8):
+        """
+        初始化近似重复图像索引
+
+        参数:
+            max_distance: 视为近似重复的最大dHash汉明距离(64位哈希)
+            ttl: 结果有效期(秒)
+            max_entries: 索引条目数上限，超出时重建并只保留最新的条目
+            max_phash_distance: 确认近似重复的最大pHash汉明距离(64位哈希)
+        """
+        self.max_distance: int = max_distance
+        self.max_phash_distance: int = max_phash_distance
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self._trees: dict[Hashable, BKTree] = {}
+        self._entries: int = 0
+        self._expired: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def lookup(self, scope: Hashable, hashes: ImageHashes) -> Optional[tuple[int, str]]:
+        """
+        查找近似重复图像的搜索结果
+
+        参数:
+            scope: 搜索范围，如(引擎, 有效参数)
+            hashes: 图像的感知哈希
+
+        返回:
+            Optional[tuple[int, str]]: (dHash汉明距离, 结果文本)，没有未过期的近似重复时返回None
+        """
+        tree = self._trees.get(scope)
+        now = time.monotonic()
+        for distance, _, (expires_at, phash, result) in tree.search(hashes.dhash, self.max_distance) if tree else ():
+            if expires_at <= now:
+                self._expired += 1
+            elif hamming(phash, hashes.phash) <= self.max_phash_distance:
+                self.hits += 1
+                return distance, result
+        self.misses += 1
+        if self._expired > self._entries // 2:
+            self._rebuild()
+        return None
+
+    def add(self, scope: Hashable, hashes: ImageHashes, result: str) -> None:
+        """
+        记录图像的搜索结果
+
+        参数:
+            scope: 搜索范围，如(引擎, 有效参数)
+            hashes: 图像的感知哈希
+            result: 结果文本
+        """
+        if self.ttl <= 0:
+            return
+        tree = self._trees.setdefault(scope, BKTree())
+        before = tree.size
+        tree.add(hashes.dhash, (time.monotonic() + self.ttl, hashes.phash, result))
+        self._entries += tree.size - before
+        if self._entries > self.max_entries:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """
+        重建索引，清除过期条目，并在超出容量时只保留最新的条目
+        """
+        now = time.monotonic()
+        live = [
+            (value[0], scope, value_hash, value)
+            for scope, tree in self._trees.items()
+            for value_hash, value in tree.items()
+            if value[0] > now
+        ]
+        live.sort(key=lambda item: item[0])
+        # 重建后保留约3/4容量的余量，避免频繁重建
+        live = live[-(self.max_entries * 3 // 4):] if len(live) > self.max_entries else live
+        self._trees = {}
+        for _, scope, value_hash, value in live:
+            self._trees.setdefault(scope, BKTree()).add(value_hash, value)
+        self._entries = len(live)
+        self._expired = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取索引统计
+
+        返回:
+            dict[str, Any]: 条目数、搜索范围数及命中/未命中次数
+        """
+        return {"entries": self._entries, "scopes": len(self._trees), "hits": self.hits, "misses": self.misses}
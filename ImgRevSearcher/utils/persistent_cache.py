@@ -0,0 +1,356 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# 数据库不可用(数据目录不可写、文件损坏等)时的异常，缓存读写失败只视为未命中或丢弃写入
+STORAGE_ERRORS = (sqlite3.Error, OSError)
+# 条目内容损坏时解压或反序列化的异常
+PAYLOAD_ERRORS = (zlib.error, ValueError, KeyError, TypeError)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    engine TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at);
+CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at);
+"""
+
+
+class StoredResult:
+    """
+    持久化缓存中恢复的搜索结果
+
+    持久化缓存只保存格式化后的结果文本，该类为其提供与解析后的搜索响应相同的show_result接口
+    """
+
+    def __init__(self, text: str):
+        """
+        初始化恢复的搜索结果
+
+        参数:
+            text: 结果文本
+        """
+        self.text: str = text
+
+    def show_result(self) -> str:
+        """
+        返回:
+            str: 结果文本
+        """
+        return self.text
+
+
+class PersistentResultCache:
+    """
+    基于SQLite的持久化结果缓存类
+
+    将搜索结果压缩序列化后存放在插件数据目录的SQLite数据库中，插件重启后仍然有效。
+    所有数据库操作都在单独的工作线程中执行，写入先在内存中排队，按flush_interval批量提交；
+    后台任务定期删除过期条目，并在数据库超过容量上限时按最久未访问的顺序淘汰。
+    数据库或条目出错时只记录日志并视为未命中或丢弃写入，不会影响搜索本身
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 256 * 1024 * 1024,
+        flush_interval: float = 2.0,
+        sweep_interval: float = 600,
+    ):
+        """
+        初始化持久化结果缓存，数据库在首次使用时才打开
+
+        参数:
+            path: 数据库文件路径
+            max_bytes: 缓存条目压缩后大小之和的上限
+            flush_interval: 排队写入的最长等待时间(秒)
+            sweep_interval: 清理过期条目的间隔(秒)
+        """
+        self.path: Path = Path(path)
+        self.max_bytes: int = max_bytes
+        self.flush_interval: float = flush_interval
+        self.sweep_interval: float = sweep_interval
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="result-cache")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pending: dict[str, tuple[Any, ...]] = {}
+        self._touched: set[str] = set()
+        self._flush_task: Optional[asyncio.Task[None]] = None
+        self._sweep_task: Optional[asyncio.Task[None]] = None
+        self._closed: bool = False
+        self.hits: int = 0
+        self.misses: int = 0
+        self.writes: int = 0
+        self.evictions: int = 0
+
+    @staticmethod
+    def make_key(key: tuple[str, ...]) -> str:
+        """
+        将内存缓存键转换为数据库主键
+
+        参数:
+            key: (引擎, 图像内容摘要或URL, 有效参数)
+
+        返回:
+            str: 固定长度的十六进制摘要
+        """
+        return hashlib.sha256("\x1f".join(key).encode("utf-8")).hexdigest()
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        在数据库工作线程中执行函数
+
+        参数:
+            func: 需要执行的函数
+            *args: 函数参数
+
+        返回:
+            T: 函数返回值
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        在工作线程中打开数据库并创建表结构
+
+        返回:
+            sqlite3.Connection: 数据库连接
+        """
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(SCHEMA)
+            except BaseException:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def _ensure_background(self) -> None:
+        """
+        首次使用时启动后台清理任务
+        """
+        if self._sweep_task is None and not self._closed:
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def get(self, key: tuple[str, ...]) -> Optional[tuple[str, float]]:
+        """
+        获取未过期的结果文本及其过期时间
+
+        参数:
+            key: (引擎, 图像内容摘要或URL, 有效参数)
+
+        返回:
+            Optional[tuple[str, float]]: (结果文本, 过期时间戳)，不存在、已过期或读取失败时返回None
+        """
+        if self._closed:
+            return None
+        self._ensure_background()
+        db_key = self.make_key(key)
+        pending = self._pending.get(db_key)
+        try:
+            row = pending[1:4] if pending is not None else await self._run(self._select, db_key)
+        except STORAGE_ERRORS as e:
+            logger.warning("读取持久化结果缓存失败: %s", e)
+            row = None
+        if row is None or row[2] <= time.time():
+            self.misses += 1
+            return None
+        try:
+            result = json.loads(zlib.decompress(row[1]))["result"]
+        except PAYLOAD_ERRORS as e:
+            logger.warning("持久化结果缓存条目已损坏: %s", e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched.add(db_key)
+        self._schedule_flush()
+        return result, row[2]
+
+    def _select(self, db_key: str) -> Optional[tuple[Any, ...]]:
+        """
+        在工作线程中查询条目
+
+        参数:
+            db_key: 数据库主键
+
+        返回:
+            Optional[tuple[Any, ...]]: (engine, payload, expires_at)，不存在时返回None
+        """
+        return self._connect().execute(
+            "SELECT engine, payload, expires_at FROM results WHERE key = ?", (db_key,)
+        ).fetchone()
+
+    def put(self, key: tuple[str, ...], engine: str, result: str, ttl: float) -> None:
+        """
+        将结果文本加入写入队列，稍后批量写入数据库
+
+        参数:
+            key: (引擎, 图像内容摘要或URL, 有效参数)
+            engine: 引擎名称
+            result: 结果文本
+            ttl: 有效期(秒)，不大于0时不缓存
+        """
+        if self._closed or ttl <= 0:
+            return
+        self._ensure_background()
+        payload = zlib.compress(json.dumps({"result": result}, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        db_key = self.make_key(key)
+        self._pending[db_key] = (db_key, engine, payload, now + ttl, len(payload), now)
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """
+        安排一次延迟的批量写入
+        """
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        """
+        等待flush_interval后批量写入，期间加入队列的写入合并为一个事务
+        """
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("写入持久化结果缓存失败")
+
+    async def flush(self) -> None:
+        """
+        立即写入所有排队的条目与访问时间
+        """
+        if not self._pending and not self._touched:
+            return
+        rows = list(self._pending.values())
+        touched = [(time.time(), key) for key in self._touched if key not in self._pending]
+        self._pending.clear()
+        self._touched.clear()
+        try:
+            await self._run(self._write, rows, touched)
+        except STORAGE_ERRORS as e:
+            logger.warning("写入持久化结果缓存失败，丢弃%d个条目: %s", len(rows), e)
+            return
+        self.writes += len(rows)
+
+    def _write(self, rows: list[tuple[Any, ...]], touched: list[tuple[float, str]]) -> None:
+        """
+        在工作线程中以单个事务写入条目，并在超过容量时淘汰
+
+        参数:
+            rows: (key, engine, payload, expires_at, size, created_at)列表
+            touched: (accessed_at, key)列表
+        """
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (key, engine, payload, expires_at, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(*row, row[5]) for row in rows],
+            )
+            conn.executemany("UPDATE results SET accessed_at = ? WHERE key = ?", touched)
+            self._enforce_limit(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _enforce_limit(self, conn: sqlite3.Connection) -> None:
+        """
+        在工作线程中按最久未访问的顺序删除条目，直到总大小不超过上限
+
+        参数:
+            conn: 数据库连接
+        """
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        removed = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            removed.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM results WHERE key = ?", removed)
+        self.evictions += len(removed)
+
+    async def _sweep_loop(self) -> None:
+        """
+        定期删除过期条目
+        """
+        while True:
+            try:
+                await self._run(self._sweep)
+            except STORAGE_ERRORS as e:
+                logger.warning("清理持久化结果缓存失败: %s", e)
+            await asyncio.sleep(self.sweep_interval)
+
+    def _sweep(self) -> None:
+        """
+        在工作线程中删除过期条目
+        """
+        self._connect().execute("DELETE FROM results WHERE expires_at <= ?", (time.time(),))
+
+    async def snapshot(self) -> dict[str, Any]:
+        """
+        获取缓存统计
+
+        返回:
+            dict[str, Any]: 条目数、占用字节数及命中/未命中/写入/淘汰次数
+        """
+        try:
+            entries, size = await self._run(
+                lambda: self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            )
+        except STORAGE_ERRORS:
+            entries, size = None, None
+        return {
+            "entries": entries,
+            "bytes": size,
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    async def close(self) -> None:
+        """
+        停止后台任务，写入排队的条目并关闭数据库
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for task in (self._flush_task, self._sweep_task):
+            if task is not None:
+                task.cancel()
+        await self.flush()
+
+        def close_connection() -> None:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+        await self._run(close_connection)
+        self._executor.shutdown(wait=False)
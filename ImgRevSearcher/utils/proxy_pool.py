@@ -0,0 +1,193 @@
+import time
+from collections import deque
+from typing import Any, Optional, Union
+
+# 请求失败时计入的惩罚耗时(秒)，使出错的代理在评分上明显落后
+FAILURE_LATENCY = 10.0
+
+
+class ProxyHealth:
+    """
+    单个代理的健康状态
+
+    以指数移动平均记录响应耗时，并在滑动窗口内统计错误率；
+    连续失败达到阈值后暂时剔除
+    """
+
+    def __init__(self, url: str, window: int = 20):
+        """
+        初始化代理健康状态
+
+        参数:
+            url: 代理地址
+            window: 统计错误率的最近请求数
+        """
+        self.url: str = url
+        self.latency: Optional[float] = None
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.consecutive_failures: int = 0
+        self.ejected_until: float = 0.0
+        self.in_flight: int = 0
+
+    @property
+    def error_rate(self) -> float:
+        """
+        最近请求的错误率
+
+        返回:
+            float: 0~1之间的错误率，没有样本时为0
+        """
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def score(self) -> float:
+        """
+        计算代理评分，越小越好
+
+        未测量过耗时的代理评分为0，保证每个代理都会被尝试
+
+        返回:
+            float: 评分
+        """
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1 + 4 * self.error_rate) * (1 + self.in_flight)
+
+
+class ProxyPool:
+    """
+    健康评分代理池
+
+    按最近耗时和错误率为每个代理评分，请求总是发往评分最好的健康代理；
+    连续失败的代理会被暂时剔除，剔除时间结束后重新参与选择。
+    所有代理都被剔除时选择最早恢复的一个，避免请求完全无法发出
+    """
+
+    def __init__(
+        self,
+        name: str,
+        proxies: list[str],
+        failure_threshold: int = 3,
+        eject_seconds: float = 60,
+        smoothing: float = 0.3,
+    ):
+        """
+        初始化代理池
+
+        参数:
+            name: 代理池名称
+            proxies: 代理地址列表
+            failure_threshold: 触发剔除的连续失败次数
+            eject_seconds: 剔除时间(秒)
+            smoothing: 耗时指数移动平均的平滑系数
+        """
+        if not proxies:
+            raise ValueError(f"代理池 {name} 至少需要一个代理地址")
+        self.name: str = name
+        self.failure_threshold: int = max(1, failure_threshold)
+        self.eject_seconds: float = eject_seconds
+        self.smoothing: float = smoothing
+        self._proxies: dict[str, ProxyHealth] = {url: ProxyHealth(url) for url in dict.fromkeys(proxies)}
+
+    def select(self, exclude: Optional[str] = None) -> str:
+        """
+        选择评分最好的健康代理
+
+        参数:
+            exclude: 尽量避开的代理地址(如对冲副本避开主请求所用的代理)，没有其他健康代理时仍可选择
+
+        返回:
+            str: 代理地址
+        """
+        now = time.monotonic()
+        healthy = [health for health in self._proxies.values() if health.ejected_until <= now]
+        if exclude is not None and len(healthy) > 1:
+            healthy = [health for health in healthy if health.url != exclude] or healthy
+        if healthy:
+            best = min(healthy, key=lambda health: health.score())
+        else:
+            best = min(self._proxies.values(), key=lambda health: health.ejected_until)
+        best.in_flight += 1
+        return best.url
+
+    def record_success(self, url: str, elapsed: float) -> None:
+        """
+        记录一次成功请求
+
+        参数:
+            url: 代理地址
+            elapsed: 从发出请求到收到响应头的耗时(秒)
+        """
+        health = self._proxies.get(url)
+        if health is None:
+            return
+        health.in_flight = max(0, health.in_flight - 1)
+        health.outcomes.append(True)
+        health.consecutive_failures = 0
+        health.ejected_until = 0.0
+        self._update_latency(health, elapsed)
+
+    def record_failure(self, url: str) -> None:
+        """
+        记录一次失败请求，连续失败达到阈值时剔除该代理
+
+        参数:
+            url: 代理地址
+        """
+        health = self._proxies.get(url)
+        if health is None:
+            return
+        health.in_flight = max(0, health.in_flight - 1)
+        health.outcomes.append(False)
+        health.consecutive_failures += 1
+        self._update_latency(health, FAILURE_LATENCY)
+        if health.consecutive_failures >= self.failure_threshold:
+            health.ejected_until = time.monotonic() + self.eject_seconds
+            health.consecutive_failures = 0
+
+    def release(self, url: str) -> None:
+        """
+        释放被取消、未产生结果的请求占用
+
+        参数:
+            url: 代理地址
+        """
+        health = self._proxies.get(url)
+        if health is not None:
+            health.in_flight = max(0, health.in_flight - 1)
+
+    def _update_latency(self, health: ProxyHealth, elapsed: float) -> None:
+        """
+        更新耗时的指数移动平均
+
+        参数:
+            health: 代理健康状态
+            elapsed: 本次耗时(秒)
+        """
+        if health.latency is None:
+            health.latency = elapsed
+        else:
+            health.latency += self.smoothing * (elapsed - health.latency)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        获取各代理的健康状态
+
+        返回:
+            dict[str, dict[str, Any]]: 代理地址 -> {latency, error_rate, ejected_for, in_flight}
+        """
+        now = time.monotonic()
+        return {
+            url: {
+                "latency": None if health.latency is None else round(health.latency, 3),
+                "error_rate": round(health.error_rate, 2),
+                "ejected_for": round(max(0.0, health.ejected_until - now), 1),
+                "in_flight": health.in_flight,
+            }
+            for url, health in self._proxies.items()
+        }
+
+
+# 代理配置：None表示直连，字符串为固定代理地址，ProxyPool为代理池
+ProxySpec = Union[str, ProxyPool, None]
@@ -0,0 +1,303 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# 收到429但既没有Retry-After也没有配置速率时的暂停时间(秒)
+DEFAULT_PENALTY = 30.0
+# 没有静态配置的主机(令牌桶来自远端配额或429)令牌不足时的最长排队时间(秒)
+DEFAULT_MAX_WAIT = DEFAULT_PENALTY
+
+
+class RateLimitExceeded(Exception):
+    """
+    限流等待超时异常
+
+    令牌不足且预计等待时间超过允许的最长排队时间时抛出，请求不会被发往远端
+    """
+
+    def __init__(self, host: str, wait: float):
+        """
+        初始化限流异常
+
+        参数:
+            host: 被限流的主机名
+            wait: 预计需要等待的秒数
+        """
+        super().__init__(f"{host} 请求过于频繁，需等待约 {int(wait) + 1} 秒")
+        self.host: str = host
+        self.wait: float = wait
+
+
+@dataclass
+class RateLimit:
+    """
+    静态限流配置数据类
+
+    requests_per_minute为0表示不限速；max_wait为令牌不足时最长排队等待时间
+    """
+    requests_per_minute: float = 0
+    burst: int = 1
+    max_wait: float = 10.0
+
+
+class TokenBucket:
+    """
+    令牌桶类
+
+    以预约方式发放令牌：令牌数可以为负，表示已排队的请求，
+    新请求按预计等待时间排队，超过最长等待时间则立即拒绝。
+    支持根据远端配额信息及429响应实时修正
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        初始化令牌桶
+
+        参数:
+            rate: 每秒补充的令牌数，0表示不限速
+            capacity: 令牌桶容量(突发请求数)
+        """
+        self.rate: float = rate
+        self.capacity: float = max(1.0, capacity)
+        self.tokens: float = self.capacity
+        self.blocked_until: float = 0.0
+        self.learned: bool = False
+        self._updated_at: float = time.monotonic()
+
+    def configure(self, rate: float, capacity: float) -> None:
+        """
+        更新静态速率配置
+
+        参数:
+            rate: 每秒补充的令牌数
+            capacity: 令牌桶容量
+        """
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self.tokens = min(self.tokens, self.capacity)
+
+    def _refill(self, now: float) -> None:
+        """
+        按经过的时间补充令牌
+
+        参数:
+            now: 当前时间
+        """
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        else:
+            self.tokens = self.capacity
+        self._updated_at = now
+
+    def _reserve(self, now: float) -> float:
+        """
+        预约一个令牌
+
+        参数:
+            now: 当前时间
+
+        返回:
+            float: 获得令牌前需要等待的秒数
+        """
+        self._refill(now)
+        self.tokens -= 1
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < 0 and self.rate > 0:
+            wait = max(wait, -self.tokens / self.rate)
+        return wait
+
+    def try_acquire(self) -> bool:
+        """
+        不等待地尝试获取令牌
+
+        返回:
+            bool: 是否立即获得令牌
+        """
+        now = time.monotonic()
+        if self._reserve(now) > 0:
+            self.tokens += 1
+            return False
+        return True
+
+    async def acquire(self, host: str, max_wait: float) -> None:
+        """
+        获取令牌，令牌不足时排队等待
+
+        参数:
+            host: 主机名，用于异常信息
+            max_wait: 最长等待时间(秒)
+
+        异常:
+            RateLimitExceeded: 预计等待时间超过max_wait时抛出
+        """
+        wait = self._reserve(time.monotonic())
+        if wait <= 0:
+            return
+        if wait > max_wait:
+            self.tokens += 1
+            raise RateLimitExceeded(host, wait)
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self.tokens += 1
+            raise
+
+    def observe_quota(self, remaining: Optional[int], limit: Optional[int], period: float) -> None:
+        """
+        根据远端返回的配额信息修正令牌桶
+
+        参数:
+            remaining: 当前周期内剩余请求数
+            limit: 每个周期允许的请求数
+            period: 配额周期(秒)
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if limit and limit > 0:
+            self.rate = limit / period
+            self.capacity = float(limit)
+            self.learned = True
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0:
+                self.blocked_until = max(self.blocked_until, now + period)
+
+    def penalize(self, delay: float) -> None:
+        """
+        收到429等限流响应后暂停发放令牌
+
+        参数:
+            delay: 暂停时间(秒)
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.blocked_until = max(self.blocked_until, now + delay)
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取令牌桶当前状态
+
+        返回:
+            dict[str, Any]: 速率、容量、剩余令牌及剩余暂停时间
+        """
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "capacity": self.capacity,
+            "tokens": round(self.tokens, 2),
+            "blocked_for": round(max(0.0, self.blocked_until - now), 1),
+        }
+
+
+class RateLimiter:
+    """
+    按主机划分的限流器注册表
+
+    每个引擎主机对应一个令牌桶，初始速率来自静态配置，
+    运行中根据远端配额信息和429响应自动修正
+    """
+
+    def __init__(self):
+        """
+        初始化限流器注册表
+        """
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def get_bucket(self, host: str, rate_limit: Optional[RateLimit] = None) -> Optional[TokenBucket]:
+        """
+        获取主机对应的令牌桶，提供配置时按配置创建或更新
+
+        已根据远端配额修正过速率的令牌桶不再被静态配置覆盖
+
+        参数:
+            host: 主机名
+            rate_limit: 静态限流配置
+
+        返回:
+            Optional[TokenBucket]: 令牌桶，主机既无配置也无修正记录时返回None
+        """
+        bucket = self._buckets.get(host)
+        if rate_limit is not None and rate_limit.requests_per_minute > 0:
+            rate = rate_limit.requests_per_minute / 60
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(rate, rate_limit.burst)
+            elif (bucket.rate, bucket.capacity) != (rate, max(1.0, rate_limit.burst)) and not bucket.learned:
+                bucket.configure(rate, rate_limit.burst)
+        return bucket
+
+    async def acquire(self, host: str, rate_limit: Optional[RateLimit] = None) -> None:
+        """
+        为发往主机的请求获取令牌
+
+        参数:
+            host: 主机名
+            rate_limit: 静态限流配置，未提供时最长排队时间为DEFAULT_MAX_WAIT
+
+        异常:
+            RateLimitExceeded: 预计等待时间超过最长排队时间时抛出
+        """
+        bucket = self.get_bucket(host, rate_limit)
+        if bucket is not None:
+            await bucket.acquire(host, rate_limit.max_wait if rate_limit else DEFAULT_MAX_WAIT)
+
+    def try_acquire(self, host: str, rate_limit: Optional[RateLimit] = None) -> bool:
+        """
+        不等待地为发往主机的请求获取令牌
+
+        参数:
+            host: 主机名
+            rate_limit: 静态限流配置
+
+        返回:
+            bool: 是否立即获得令牌
+        """
+        bucket = self.get_bucket(host, rate_limit)
+        return bucket is None or bucket.try_acquire()
+
+    def observe_quota(self, host: str, remaining: Optional[int], limit: Optional[int], period: float) -> None:
+        """
+        根据远端配额信息修正主机的令牌桶
+
+        参数:
+            host: 主机名
+            remaining: 当前周期内剩余请求数
+            limit: 每个周期允许的请求数
+            period: 配额周期(秒)
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            if not limit:
+                return
+            bucket = self._buckets[host] = TokenBucket(limit / period, limit)
+        bucket.observe_quota(remaining, limit, period)
+
+    def penalize(self, host: str, delay: Optional[float] = None) -> None:
+        """
+        收到429响应后暂停向主机发送请求
+
+        参数:
+            host: 主机名
+            delay: 暂停时间(秒)，默认为令牌桶从空到满所需时间，未限速的主机为DEFAULT_PENALTY
+        """
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(0, 1)
+        if delay is None:
+            delay = bucket.capacity / bucket.rate if bucket.rate > 0 else DEFAULT_PENALTY
+        bucket.penalize(delay)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        获取所有主机的限流状态
+
+        返回:
+            dict[str, dict[str, Any]]: 主机名 -> 令牌桶状态
+        """
+        return {host: bucket.snapshot() for host, bucket in self._buckets.items()}
+
+
+rate_limiter = RateLimiter()
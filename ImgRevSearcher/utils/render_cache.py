@@ -0,0 +1,221 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Optional, Union
+
+
+class RenderCache:
+    """
+    结果图像缓存类
+
+    缓存最终编码后的结果图像字节，键由调用方以(引擎, 结果摘要, 源图像摘要, 渲染设置)构建。
+    内存部分按字节数限制容量，超出上限时按最近最少使用的顺序淘汰；
+    配置了溢出目录时，被淘汰的图像写入磁盘，命中磁盘的图像重新放回内存，
+    磁盘部分同样按字节数限制并按最久未访问的顺序删除。
+    所有方法都是线程安全的，磁盘读写会阻塞调用线程，应在渲染线程中调用
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        spill_dir: Optional[Union[str, Path]] = None,
+        max_spill_bytes: int = 256 * 1024 * 1024,
+    ):
+        """
+        初始化结果图像缓存
+
+        参数:
+            max_bytes: 内存中缓存的图像字节数上限
+            spill_dir: 磁盘溢出目录，为None时只使用内存
+            max_spill_bytes: 磁盘溢出目录中图像字节数上限
+        """
+        self.max_bytes: int = max_bytes
+        self.spill_dir: Optional[Path] = Path(spill_dir) if spill_dir else None
+        self.max_spill_bytes: int = max_spill_bytes
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._bytes: int = 0
+        self._lock: threading.Lock = threading.Lock()
+        # 磁盘文件名 -> 字节数，按访问顺序排列，首次访问磁盘时从目录恢复
+        self._spilled: Optional[OrderedDict[str, int]] = None
+        self._spilled_bytes: int = 0
+        self.hits: int = 0
+        self.disk_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    @staticmethod
+    def _file_name(key: Hashable) -> str:
+        """
+        将缓存键转换为磁盘文件名
+
+        参数:
+            key: 缓存键
+
+        返回:
+            str: 固定长度的文件名
+        """
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest() + ".jpg"
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        获取缓存的图像，内存中没有时查找磁盘溢出目录
+
+        参数:
+            key: 缓存键
+
+        返回:
+            Optional[bytes]: 编码后的图像，不存在或读取失败时返回None
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            data = self._read_spilled(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, data)
+            return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        """
+        写入图像，超过内存容量时淘汰最久未使用的图像(配置了溢出目录时写入磁盘)
+
+        参数:
+            key: 缓存键
+            data: 编码后的图像，超过内存总容量的图像不缓存
+        """
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._store(key, data)
+
+    def _store(self, key: Hashable, data: bytes) -> None:
+        """
+        在持有锁时写入内存并淘汰超出容量的图像
+
+        参数:
+            key: 缓存键
+            data: 编码后的图像
+        """
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            oldest, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+            self._spill(oldest, evicted)
+
+    def _load_spilled(self) -> OrderedDict[str, int]:
+        """
+        在持有锁时从溢出目录恢复磁盘条目索引，按文件修改时间排列
+
+        返回:
+            OrderedDict[str, int]: 文件名 -> 字节数
+        """
+        if self._spilled is None:
+            self._spilled = OrderedDict()
+            self._spilled_bytes = 0
+            try:
+                files = sorted(
+                    (entry.stat().st_mtime, entry.name, entry.stat().st_size)
+                    for entry in os.scandir(self.spill_dir)
+                    if entry.is_file() and entry.name.endswith(".jpg")
+                )
+            except OSError:
+                files = []
+            for _, name, size in files:
+                self._spilled[name] = size
+                self._spilled_bytes += size
+        return self._spilled
+
+    def _read_spilled(self, key: Hashable) -> Optional[bytes]:
+        """
+        在持有锁时从溢出目录读取图像并更新其访问时间
+
+        参数:
+            key: 缓存键
+
+        返回:
+            Optional[bytes]: 编码后的图像，不存在或读取失败时返回None
+        """
+        if self.spill_dir is None:
+            return None
+        spilled = self._load_spilled()
+        name = self._file_name(key)
+        if name not in spilled:
+            return None
+        path = self.spill_dir / name
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            self._spilled_bytes -= spilled.pop(name)
+            return None
+        spilled.move_to_end(name)
+        return data
+
+    def _spill(self, key: Hashable, data: bytes) -> None:
+        """
+        在持有锁时将被淘汰的图像写入溢出目录，并删除超出磁盘容量的旧文件
+
+        参数:
+            key: 缓存键
+            data: 编码后的图像
+        """
+        if self.spill_dir is None or len(data) > self.max_spill_bytes:
+            return
+        spilled = self._load_spilled()
+        name = self._file_name(key)
+        path = self.spill_dir / name
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            return
+        self._spilled_bytes += len(data) - spilled.pop(name, 0)
+        spilled[name] = len(data)
+        while self._spilled_bytes > self.max_spill_bytes:
+            oldest, size = spilled.popitem(last=False)
+            self._spilled_bytes -= size
+            try:
+                (self.spill_dir / oldest).unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """
+        清空内存中的图像，磁盘溢出目录中的文件保留
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取缓存统计
+
+        返回:
+            dict[str, Any]: 内存与磁盘的条目数、占用字节数及命中/未命中/淘汰次数
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "spilled_entries": len(self._spilled) if self._spilled is not None else None,
+                "spilled_bytes": self._spilled_bytes if self._spilled is not None else None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -80,6 +80,7 @@ class AnimeTraceResponse(BaseSearchResponse[AnimeTraceItem]):
         self.trace_id: str = resp_data["trace_id"]
         results = resp_data["data"]
         self.raw: list[AnimeTraceItem] = [AnimeTraceItem(item) for item in results]
+        self.confirmed_empty = self.code == 0 and not any(item.characters for item in self.raw)
         
     def show_result(self) -> Optional[str]:
         """
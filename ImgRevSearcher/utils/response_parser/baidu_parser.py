@@ -69,6 +69,8 @@ class BaiDuResponse(BaseSearchResponse[BaiDuItem]):
                 self.exact_matches.extend(BaiDuItem(i) for i in same_data["list"] if "url" in i and "image_src" in i)
         if data_list := deep_get(resp_data, "data.list"):
             self.raw.extend([BaiDuItem(i) for i in data_list])
+        # 只有结果页明确给出无结果卡片时才确认为无结果
+        self.confirmed_empty = kwargs.get("no_result", False) and not self.raw and not self.exact_matches
             
     def show_result(self) -> Optional[str]:
         """
@@ -60,6 +60,8 @@ class BaseSearchResponse(ABC, Generic[T]):
         self.origin: Any = resp_data
         self.url: str = resp_url
         self.raw: list[T] = []
+        # 引擎明确表示搜索成功且没有结果时由子类置为True，被拦截、报错或无法确认的响应保持False
+        self.confirmed_empty: bool = False
         self._parse_response(resp_data, resp_url=resp_url, **kwargs)
 
     @abstractmethod
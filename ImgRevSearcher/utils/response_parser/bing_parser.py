@@ -220,6 +220,12 @@ class BingResponse(BaseSearchResponse[BingItem]):
             for tag in tags:
                 for action in tag.get("actions", []):
                     self._parse_action(action)
+        self.confirmed_empty = (
+            isinstance(resp_data.get("tags"), list)
+            and not self.pages_including
+            and not self.visual_search
+            and not self.best_guess
+        )
 
     def _parse_action(self, action: dict[str, Any]) -> None:
         """
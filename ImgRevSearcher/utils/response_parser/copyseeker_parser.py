@@ -71,6 +71,7 @@ class CopyseekerResponse(BaseSearchResponse[CopyseekerItem]):
         self.exif: dict[str, Any] = resp_data.get("exif", {})
         self.raw: list[CopyseekerItem] = [CopyseekerItem(page) for page in resp_data.get("pages", [])]
         self.similar_image_urls: list[str] = resp_data.get("visuallySimilarImages", [])
+        self.confirmed_empty = self.total == 0 and not self.raw and not self.similar_image_urls
         
     def show_result(self) -> Optional[str]:
         """
@@ -101,8 +101,9 @@ class EHentaiResponse(BaseSearchResponse[EHentaiItem]):
         """
         data = parse_html(resp_data)
         self.origin: PyQuery = data
-        if "No unfiltered results" in resp_data:
+        if "No unfiltered results" in resp_data or "No hits found" in resp_data:
             self.raw: list[EHentaiItem] = []
+            self.confirmed_empty = True
         elif tr_items := data.find(".itg").children("tr").items():
             self.raw = [EHentaiItem(i) for i in tr_items if i.children("td")]
         else:
@@ -198,6 +198,9 @@ class SauceNAOResponse(BaseSearchResponse[SauceNAOItem]):
         self.search_depth: Optional[int] = header.get("search_depth")
         self.minimum_similarity: Optional[float] = header.get("minimum_similarity")
         self.results_returned: Optional[int] = header.get("results_returned")
+        self.confirmed_empty = self.status == 0 and not any(
+            item.title or item.url or item.author for item in self.raw
+        )
         self.url: str = f"https://saucenao.com/search.php?url=https://saucenao.com{header.get('query_image_display')}"
 
     def show_result(self) -> Optional[str]:
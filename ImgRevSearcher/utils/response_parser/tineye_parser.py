@@ -84,6 +84,7 @@ class TineyeResponse(BaseSearchResponse[TineyeItem]):
         self.total_pages: int = resp_data["total_pages"]
         matches = resp_data["matches"]
         self.raw: list[TineyeItem] = [TineyeItem(i) for i in matches] if matches else []
+        self.confirmed_empty = self.status_code == 200 and matches == []
         
     def show_result(self) -> Optional[str]:
         """
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+
+@dataclass
+class CachedResult:
+    """
+    结果缓存条目数据类
+    """
+    value: Any
+    size: int
+    expires_at: float
+
+
+class ResultCache:
+    """
+    搜索结果内存缓存类
+
+    以内容寻址的键(图像摘要、引擎、有效参数)缓存解析后的搜索响应，每个条目有独立的有效期。
+    容量按条目估算的字节数计算而不是条目数，超出上限时按最近最少使用的顺序淘汰
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        初始化结果缓存
+
+        参数:
+            max_bytes: 缓存条目估算字节数之和的上限
+        """
+        self.max_bytes: int = max_bytes
+        self._entries: OrderedDict[Hashable, CachedResult] = OrderedDict()
+        self._bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        """
+        返回:
+            int: 当前缓存的条目数(包括尚未清理的过期条目)
+        """
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        获取未过期的缓存结果
+
+        参数:
+            key: 缓存键
+
+        返回:
+            Optional[Any]: 缓存的结果，不存在或已过期时返回None
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: Hashable, value: Any, ttl: float, size: int) -> None:
+        """
+        写入缓存结果，超过容量时淘汰最久未使用的条目
+
+        参数:
+            key: 缓存键
+            value: 需要缓存的结果
+            ttl: 有效期(秒)，不大于0时不缓存
+            size: 条目的估算字节数，超过总容量的条目不缓存
+        """
+        if ttl <= 0 or size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = CachedResult(value, size, time.monotonic() + ttl)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """
+        移除条目并更新占用字节数
+
+        参数:
+            key: 缓存键
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def invalidate(self, key: Hashable) -> None:
+        """
+        移除指定条目
+
+        参数:
+            key: 缓存键
+        """
+        self._remove(key)
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        self._entries.clear()
+        self._bytes = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        获取缓存统计
+
+        返回:
+            dict[str, Any]: 条目数、占用字节数及命中/未命中/淘汰次数
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
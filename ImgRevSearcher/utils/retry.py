@@ -0,0 +1,122 @@
+import random
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from time import time
+from typing import Optional
+from httpx import (
+    ConnectError,
+    ConnectTimeout,
+    PoolTimeout,
+    ProxyError,
+    ReadError,
+    ReadTimeout,
+    RemoteProtocolError,
+    WriteError,
+    WriteTimeout,
+)
+
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+
+# 请求尚未到达服务器的错误，任何步骤重试都是安全的
+PRE_SEND_ERRORS = (ConnectError, ConnectTimeout, PoolTimeout, ProxyError)
+# 请求可能已被服务器处理的错误，仅允许可安全重复的步骤重试
+IN_FLIGHT_ERRORS = (ReadError, ReadTimeout, RemoteProtocolError, WriteError, WriteTimeout)
+
+
+def classify_error(exc: BaseException) -> Optional[str]:
+    """
+    将请求异常归类为可重试的瞬时错误类型
+
+    参数:
+        exc: 请求过程中抛出的异常
+
+    返回:
+        Optional[str]: "pre_send"表示请求未发出，"in_flight"表示请求可能已被处理，
+        None表示不可重试的错误
+    """
+    if isinstance(exc, PRE_SEND_ERRORS):
+        return "pre_send"
+    if isinstance(exc, IN_FLIGHT_ERRORS):
+        return "in_flight"
+    return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析Retry-After响应头
+
+    参数:
+        value: Retry-After头的值，可为秒数或HTTP日期
+
+    返回:
+        Optional[float]: 需要等待的秒数，无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """
+    请求重试策略数据类
+
+    采用带抖动的指数退避，仅对归类为瞬时错误的失败进行重试，
+    并保证所有重试等待都落在整体搜索超时预算之内
+    """
+    max_attempts: int = 1
+    base_delay: float = 0.5
+    max_delay: float = 5.0
+    budget: Optional[float] = None
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        计算第attempt次失败后的等待时间
+
+        参数:
+            attempt: 已完成的尝试次数(从1开始)
+            retry_after: 服务器通过Retry-After要求的等待秒数
+
+        返回:
+            float: 等待秒数(全抖动指数退避，Retry-After优先)
+        """
+        if retry_after is not None:
+            return retry_after
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def should_retry(self, error_kind: Optional[str], idempotent: bool, attempt: int) -> bool:
+        """
+        判断一次失败是否应当重试
+
+        参数:
+            error_kind: classify_error的归类结果，状态码失败时为"status"
+            idempotent: 当前步骤是否可安全重复
+            attempt: 已完成的尝试次数
+
+        返回:
+            bool: 是否重试
+        """
+        if error_kind is None or attempt >= self.max_attempts:
+            return False
+        return error_kind == "pre_send" or idempotent
+
+    def fits_budget(self, elapsed: float, delay: float) -> bool:
+        """
+        判断等待后再次尝试是否仍在超时预算之内
+
+        参数:
+            elapsed: 本次搜索已耗费的时间(秒)
+            delay: 即将等待的时间(秒)
+
+        返回:
+            bool: 是否仍有预算进行下一次尝试
+        """
+        return self.budget is None or elapsed + delay < self.budget
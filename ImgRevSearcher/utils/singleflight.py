@@ -0,0 +1,105 @@
+import asyncio
+from collections.abc import Hashable
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Flight(Generic[T]):
+    """
+    进行中的一次共享调用
+    """
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        """
+        初始化共享调用
+
+        参数:
+            task: 执行实际调用的任务
+        """
+        self.task: asyncio.Task[T] = task
+        self.waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """
+    相同请求合并类
+
+    同一键的并发调用只执行一次，所有等待者共享同一个结果或异常。
+    单个等待者被取消(如超时)不会影响其他等待者；所有等待者都离开后，实际调用才会被取消
+    """
+
+    def __init__(self):
+        """
+        初始化请求合并器
+        """
+        self._flights: dict[Hashable, _Flight[T]] = {}
+        self.calls: int = 0
+        self.coalesced: int = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        执行或加入一次共享调用
+
+        参数:
+            key: 合并键，相同键的并发调用共享结果
+            func: 键不存在进行中的调用时执行的协程工厂
+
+        返回:
+            T: 调用结果
+
+        异常:
+            Exception: 实际调用抛出的异常会传递给所有等待者
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls += 1
+            flight = _Flight(asyncio.create_task(func()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, task))
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # 立即移除记录，任务真正结束前到达的调用会发起新的调用，而不是加入即将被取消的调用
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[T]") -> None:
+        """
+        调用结束后移除记录，并取回异常避免未处理异常警告
+
+        参数:
+            key: 合并键
+            task: 已结束的任务
+        """
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()
+
+    def in_flight(self) -> int:
+        """
+        获取进行中的共享调用数量
+
+        返回:
+            int: 进行中的调用数
+        """
+        return len(self._flights)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        获取请求合并统计
+
+        返回:
+            dict[str, Any]: 实际调用次数、被合并的调用次数及进行中的调用数
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": self.in_flight()}
@@ -0,0 +1,176 @@
+import copy
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class StreamMatcher(ABC):
+    """
+    流式响应匹配器基类
+
+    逐块接收响应体，一旦所需片段完整到达即返回该片段，调用方随即关闭连接。
+    匹配器只保留尚未扫描完的数据，内存占用与已接收的总字节数无关
+    """
+
+    def __init__(self):
+        """
+        初始化匹配器
+        """
+        self._buffer: bytearray = bytearray()
+
+    def fresh(self) -> "StreamMatcher":
+        """
+        创建配置相同、状态清空的匹配器，用于重试或对冲请求
+
+        返回:
+            StreamMatcher: 新的匹配器
+        """
+        clone = copy.copy(self)
+        clone._buffer = bytearray()
+        return clone
+
+    def feed(self, chunk: bytes) -> Optional[bytes]:
+        """
+        接收一个数据块
+
+        参数:
+            chunk: 响应体数据块
+
+        返回:
+            Optional[bytes]: 匹配到的片段，尚未匹配时返回None
+        """
+        self._buffer += chunk
+        return self._scan()
+
+    def finish(self) -> Optional[bytes]:
+        """
+        响应体读取完毕时检查剩余数据
+
+        返回:
+            Optional[bytes]: 匹配到的片段，未匹配时返回None
+        """
+        return None
+
+    @abstractmethod
+    def _scan(self) -> Optional[bytes]:
+        """
+        扫描缓冲区中的新数据
+
+        返回:
+            Optional[bytes]: 匹配到的片段，尚未匹配时返回None
+        """
+        raise NotImplementedError
+
+
+class LineMatcher(StreamMatcher):
+    """
+    行匹配器
+
+    返回第一行去除首尾空白后以指定前缀开头的行，适用于逐行输出的流(如React Server Components)
+    """
+
+    def __init__(self, prefix: bytes):
+        """
+        初始化行匹配器
+
+        参数:
+            prefix: 目标行的前缀
+        """
+        super().__init__()
+        self.prefix: bytes = prefix
+
+    def _match_line(self, line: bytes) -> Optional[bytes]:
+        """
+        检查单行是否匹配
+
+        参数:
+            line: 一行数据
+
+        返回:
+            Optional[bytes]: 匹配时返回去除空白后的行
+        """
+        line = line.strip()
+        return line if line.startswith(self.prefix) else None
+
+    def _scan(self) -> Optional[bytes]:
+        """
+        逐行扫描已完整到达的行，丢弃已扫描的数据
+
+        返回:
+            Optional[bytes]: 匹配到的行，尚未匹配时返回None
+        """
+        start = 0
+        try:
+            while (end := self._buffer.find(b"\n", start)) != -1:
+                matched = self._match_line(bytes(self._buffer[start:end]))
+                if matched is not None:
+                    return matched
+                start = end + 1
+            return None
+        finally:
+            del self._buffer[:start]
+
+    def finish(self) -> Optional[bytes]:
+        """
+        检查响应体末尾没有换行符的最后一行
+
+        返回:
+            Optional[bytes]: 匹配到的行，未匹配时返回None
+        """
+        return self._match_line(bytes(self._buffer)) if self._buffer else None
+
+
+class MarkerMatcher(StreamMatcher):
+    """
+    标记匹配器
+
+    找到起始标记后，继续接收直到其后出现结束标记，返回从起始标记到结束标记之前的片段，
+    适用于从HTML页面中截取某个脚本块
+    """
+
+    def __init__(self, marker: bytes, terminator: bytes):
+        """
+        初始化标记匹配器
+
+        参数:
+            marker: 起始标记
+            terminator: 结束标记
+        """
+        super().__init__()
+        self.marker: bytes = marker
+        self.terminator: bytes = terminator
+        self._found: bool = False
+        self._scanned: int = 0
+
+    def fresh(self) -> "MarkerMatcher":
+        """
+        创建配置相同、状态清空的匹配器
+
+        返回:
+            MarkerMatcher: 新的匹配器
+        """
+        clone = super().fresh()
+        clone._found = False
+        clone._scanned = 0
+        return clone
+
+    def _scan(self) -> Optional[bytes]:
+        """
+        查找起始标记及其后的结束标记
+
+        返回:
+            Optional[bytes]: 起始标记到结束标记之前的片段，尚未完整到达时返回None
+        """
+        if not self._found:
+            index = self._buffer.find(self.marker)
+            if index == -1:
+                # 只保留可能与下一块拼成起始标记的尾部数据
+                del self._buffer[:max(0, len(self._buffer) - len(self.marker) + 1)]
+                return None
+            del self._buffer[:index]
+            self._found = True
+            self._scanned = len(self.marker)
+        end = self._buffer.find(self.terminator, self._scanned)
+        if end == -1:
+            self._scanned = max(self._scanned, len(self._buffer) - len(self.terminator) + 1)
+            return None
+        return bytes(self._buffer[:end])
@@ -28,7 +28,7 @@ class SearchType(str, Enum):
 
 # 类型别名定义
 FilePath = Union[str, Path]
-FileContent = Union[str, bytes, FilePath, None]
+FileContent = Union[str, bytes, memoryview, FilePath, None]
 
 
 @dataclass
@@ -0,0 +1,241 @@
+import asyncio
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import IO, Any, Optional, Union
+
+# 超过此大小的本地文件以内存映射方式读取(字节)
+MMAP_THRESHOLD = 1024 * 1024
+
+ImageBuffer = Union[bytes, memoryview]
+
+
+class BufferReader(io.RawIOBase):
+    """
+    只读缓冲区读取器
+
+    将memoryview(包括内存映射文件)包装为可定位的只读文件对象，
+    供httpx分块读取multipart数据，不复制整个缓冲区
+    """
+
+    def __init__(self, buffer: memoryview, name: str = "upload"):
+        """
+        初始化缓冲区读取器
+
+        参数:
+            buffer: 图像数据视图
+            name: multipart中使用的文件名
+        """
+        super().__init__()
+        self._view: memoryview = buffer.cast("B") if buffer.format != "B" or buffer.ndim != 1 else buffer
+        self._pos: int = 0
+        self.name: str = name
+
+    def readable(self) -> bool:
+        """
+        返回:
+            bool: 始终可读
+        """
+        return True
+
+    def seekable(self) -> bool:
+        """
+        返回:
+            bool: 始终可定位
+        """
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        读取数据
+
+        参数:
+            size: 读取的字节数，-1表示读取剩余全部
+
+        返回:
+            bytes: 读取到的数据块
+        """
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), self._pos + size)
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return chunk
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        将数据读取到给定缓冲区
+
+        参数:
+            buffer: 可写缓冲区
+
+        返回:
+            int: 读取的字节数
+        """
+        target = memoryview(buffer).cast("B")
+        size = min(len(target), len(self._view) - self._pos)
+        target[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """
+        移动读取位置
+
+        参数:
+            offset: 偏移量
+            whence: 偏移基准(SEEK_SET/SEEK_CUR/SEEK_END)
+
+        返回:
+            int: 新的读取位置
+        """
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, min(offset, len(self._view)))
+        return self._pos
+
+    def tell(self) -> int:
+        """
+        获取当前读取位置
+
+        返回:
+            int: 当前读取位置
+        """
+        return self._pos
+
+
+def _map_file(path: Union[str, Path]) -> ImageBuffer:
+    """
+    读取本地文件，较大的文件以内存映射方式打开
+
+    参数:
+        path: 文件路径
+
+    返回:
+        ImageBuffer: 小文件返回bytes，大文件返回内存映射的memoryview
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            return f.read()
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+async def load_image(file: Union[str, Path, bytes, memoryview]) -> ImageBuffer:
+    """
+    在事件循环之外读取图像数据
+
+    bytes与memoryview原样返回；文件路径在线程中读取，超过MMAP_THRESHOLD的文件以内存映射方式打开
+
+    参数:
+        file: 文件路径、字节数据或内存视图
+
+    返回:
+        ImageBuffer: 图像数据
+
+    异常:
+        FileNotFoundError: 当文件不存在时抛出
+        OSError: 当文件读取出错时抛出
+    """
+    if isinstance(file, (bytes, memoryview)):
+        return file
+    try:
+        return await asyncio.to_thread(_map_file, file)
+    except (FileNotFoundError, OSError) as e:
+        error_type = "FileNotFoundError" if isinstance(e, FileNotFoundError) else "OSError"
+        raise type(e)(f"{error_type}：读取文件 {file} 时出错: {e}") from e
+
+
+def as_upload(data: ImageBuffer, name: str = "upload") -> Union[bytes, BufferReader]:
+    """
+    将图像数据转换为httpx可直接分块发送的multipart文件内容
+
+    bytes原样交给httpx(不复制)，memoryview包装为BufferReader按块读取
+
+    参数:
+        data: 图像数据
+        name: multipart中使用的文件名
+
+    返回:
+        Union[bytes, BufferReader]: multipart文件内容
+    """
+    if isinstance(data, memoryview):
+        return BufferReader(data, name)
+    return data
+
+
+async def open_upload(file: Union[str, Path, bytes, memoryview], name: str = "upload") -> Union[bytes, BufferReader]:
+    """
+    读取图像并转换为multipart文件内容
+
+    参数:
+        file: 文件路径、字节数据或内存视图
+        name: multipart中使用的文件名
+
+    返回:
+        Union[bytes, BufferReader]: multipart文件内容
+    """
+    return as_upload(await load_image(file), name)
+
+
+def view_buffer(fileobj: IO[bytes]) -> ImageBuffer:
+    """
+    获取文件对象内容的只读视图而不复制
+
+    内存缓冲(BytesIO或未转存的SpooledTemporaryFile)返回其内部缓冲区视图，
+    已转存到磁盘的临时文件以内存映射方式打开
+
+    参数:
+        fileobj: 图像数据流
+
+    返回:
+        ImageBuffer: 图像数据
+    """
+    inner: Any = getattr(fileobj, "_file", fileobj)
+    if hasattr(inner, "getbuffer"):
+        return inner.getbuffer().toreadonly()
+    inner.flush()
+    if os.fstat(inner.fileno()).st_size == 0:
+        return b""
+    return memoryview(mmap.mmap(inner.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def release_view(data: ImageBuffer) -> None:
+    """
+    释放view_buffer返回的视图，使底层缓冲区可以关闭，内存映射随之关闭
+
+    视图仍被其他切片引用时无法立即释放，此时交给垃圾回收处理
+
+    参数:
+        data: view_buffer返回的图像数据
+    """
+    if not isinstance(data, memoryview):
+        return
+    owner = data.obj
+    try:
+        data.release()
+    except BufferError:
+        return
+    if isinstance(owner, mmap.mmap):
+        try:
+            owner.close()
+        except BufferError:
+            pass
+
+
+def close_buffer(fileobj: IO[bytes], view: Optional[ImageBuffer] = None) -> None:
+    """
+    释放缓冲区视图并关闭图像数据流(下载得到的SpooledTemporaryFile可能已转存到磁盘)
+
+    参数:
+        fileobj: 图像数据流
+        view: 通过view_buffer获取的视图
+    """
+    if view is not None:
+        release_view(view)
+    try:
+        fileobj.close()
+    except BufferError:
+        # 内存缓冲仍被视图引用时无法关闭，交给垃圾回收释放
+        pass
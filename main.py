@@ -4,14 +4,22 @@ import os
 import re
 import tempfile
 import time
-from typing import List
+from collections import deque
+from typing import IO, List
 from pathlib import Path
 import httpx
 from PIL import Image, ImageDraw, ImageFont
 from astrbot.api.event import AstrMessageEvent, filter
 from astrbot.api.message_components import Image as AstrImage, Nodes, Node, Plain
 from astrbot.api.star import Context, Star, register
+try:
+    from astrbot.api.star import StarTools
+except ImportError:
+    StarTools = None
 from .ImgRevSearcher.model import BaseSearchModel
+from .ImgRevSearcher.utils import CircuitOpenError, RateLimitExceeded, close_buffer, stream_download, view_buffer
+
+PLUGIN_NAME = "astrbot_plugin_img_rev_searcher"
 
 ALL_ENGINES = [
     "animetrace", "baidu", "bing", "copyseeker", "ehentai", "google", "saucenao", "tineye"
@@ -153,7 +161,22 @@ def get_message_text(message) -> str:
     return ''
 
 
-@register("astrbot_plugin_img_rev_searcher", "drdon1234", "以图搜图，找出处", "3.4")
+def get_plugin_data_dir() -> Path:
+    """
+    获取插件数据目录，插件更新或重启后其中的数据仍然保留
+
+    返回:
+        Path: 插件数据目录
+    """
+    if StarTools is not None:
+        try:
+            return Path(StarTools.get_data_dir(PLUGIN_NAME))
+        except Exception:
+            pass
+    return Path("data") / "plugin_data" / PLUGIN_NAME
+
+
+@register(PLUGIN_NAME, "drdon1234", "以图搜图，找出处", "3.4")
 class ImgRevSearcherPlugin(Star):
     """
     以图搜图插件主类
@@ -178,6 +201,8 @@ class ImgRevSearcherPlugin(Star):
             text_confirm_timeout: 等待文本格式确认的超时时间（秒）
             search_model: 搜索执行模型
             state_handlers: 状态处理器方法字典
+            prewarm_tasks: 正在进行的连接预热及DNS预解析协程集合
+            recent_downloads: 最近若干次图片下载的大小与耗时统计
 
         返回:
             无
@@ -194,6 +219,7 @@ class ImgRevSearcherPlugin(Star):
         timeout_settings = config.get("timeout_settings", {})
         self.search_params_timeout = timeout_settings.get("search_params_timeout", 30)
         self.text_confirm_timeout = timeout_settings.get("text_confirm_timeout", 30)
+        request_timeout = timeout_settings.get("request_timeout", 60)
         keyword_config = config.get("keyword", {})
         trigger_keywords = keyword_config.get("trigger_keywords", ["以图搜图"])
         # 确保触发关键词是列表格式，如果为空或无效则使用默认值
@@ -210,17 +236,73 @@ class ImgRevSearcherPlugin(Star):
                 self.engine_keywords[keyword.strip().lower()] = engine
         self.search_model = BaseSearchModel(
             proxies=config.get("proxies", ""),
-            timeout=60,
+            timeout=request_timeout,
             default_params=config.get("default_params", {}),
             default_cookies=config.get("default_cookies", {}),
-            auto_google_config=config.get("auto_google_cookie", {})
+            auto_google_config=config.get("auto_google_cookie", {}),
+            http2_modes=config.get("http2_mode", {}),
+            connection_settings=config.get("connection_settings", {}),
+            retry_settings=config.get("retry_settings", {}),
+            hedge_settings=config.get("hedge_settings", {}),
+            circuit_breaker=config.get("circuit_breaker", {}),
+            rate_limit=config.get("rate_limit", {}),
+            download_settings=config.get("download_settings", {}),
+            proxy_routing=config.get("proxy_routing", {}),
+            proxy_servers=config.get("proxy_servers", []),
+            proxy_pool=config.get("proxy_pool", {}),
+            dns_settings=config.get("dns_cache", {}),
+            fault_injection=config.get("fault_injection", {}),
+            http_cache_settings=config.get("http_cache", {}),
+            adaptive_timeout=config.get("adaptive_timeout", {}),
+            result_cache=config.get("result_cache", {}),
+            persistent_cache=config.get("persistent_cache", {}),
+            data_dir=str(get_plugin_data_dir()),
+            near_duplicate=config.get("near_duplicate", {}),
+            negative_cache=config.get("negative_cache", {}),
+            render_cache=config.get("render_cache", {})
         )
+        self.recent_downloads = deque(maxlen=50)
         self.state_handlers = {
             "waiting_text_confirm": self._handle_waiting_text_confirm,
             "waiting_engine": self._handle_waiting_engine,
             "waiting_both": self._handle_waiting_both,
             "waiting_image": self._handle_waiting_image,
         }
+        prewarm_config = config.get("prewarm", {})
+        self.prewarm_enabled = prewarm_config.get("enabled", False)
+        self.prewarm_on_trigger = prewarm_config.get("on_trigger", True)
+        self.prewarm_interval = prewarm_config.get("min_interval", 30)
+        self.prewarm_tasks = set()
+        if self.prewarm_enabled:
+            self._schedule_prewarm(self.available_engines, force=True)
+        elif config.get("dns_cache", {}).get("prefetch", True):
+            task = asyncio.create_task(self.search_model.prefetch_dns(self.available_engines))
+            self.prewarm_tasks.add(task)
+            task.add_done_callback(self.prewarm_tasks.discard)
+
+    def _schedule_prewarm(self, engines: List[str], force: bool = False):
+        """
+        在后台预热指定引擎的主机连接，不阻塞当前消息处理
+
+        参数:
+            engines: 需要预热的引擎列表
+            force: 是否为插件启动时的强制预热（忽略on_trigger开关与最小间隔）
+
+        返回:
+            无
+
+        异常:
+            无
+        """
+        if not self.prewarm_enabled or not engines:
+            return
+        if not force and not self.prewarm_on_trigger:
+            return
+        task = asyncio.create_task(
+            self.search_model.prewarm(engines, min_interval=0 if force else self.prewarm_interval)
+        )
+        self.prewarm_tasks.add(task)
+        task.add_done_callback(self.prewarm_tasks.discard)
 
     async def cleanup_loop(self):
         """
@@ -237,41 +319,50 @@ class ImgRevSearcherPlugin(Star):
                 if now - state['timestamp'] > self.search_params_timeout
             ]
             for user_id in to_delete:
-                del self.user_states[user_id]
+                self._discard_user_state(user_id)
 
     async def terminate(self):
         """
-        插件关闭时收尾操作：关闭http连接与定时清理任务
+        插件关闭时收尾操作：关闭http连接、共享连接池与定时清理任务
 
         异常:
             无
         """
+        for task in list(getattr(self, 'prewarm_tasks', ())):
+            task.cancel()
+        for user_id in list(self.user_states):
+            self._discard_user_state(user_id)
         await self.client.aclose()
+        await self.search_model.close()
         if hasattr(self, 'cleanup_task'):
             self.cleanup_task.cancel()
 
     async def _download_img(self, url: str):
         """
-        异步下载图片数据，转为BytesIO对象
+        以流式方式下载图片数据，超过大小上限时放弃，较大的图片缓存在临时文件中
 
         参数:
             url (str): 图片URL
 
         返回:
-            io.BytesIO or None: 成功则为图片数据流，否则None
+            IO[bytes] or None: 成功则为图片数据流，否则None
 
         异常:
-            网络异常会吞掉，返回None
+            网络异常及超限会吞掉，返回None
         """
         try:
-            r = await self.client.get(url, timeout=15)
-            if r.status_code == 200:
-                return io.BytesIO(r.content)
+            buffer, stats = await stream_download(
+                self.client, url, self.search_model.download_limits, timeout=15
+            )
         except Exception:
-            pass
+            return None
+        self.recent_downloads.append(stats)
+        if stats.status_code == 200:
+            return buffer
+        buffer.close()
         return None
 
-    async def get_imgs(self, img_urls: List[str]) -> List[io.BytesIO]:
+    async def get_imgs(self, img_urls: List[str]) -> List[IO[bytes]]:
         """
         批量并发下载多张图片
 
@@ -279,7 +370,7 @@ class ImgRevSearcherPlugin(Star):
             img_urls (List[str]): 目标URL列表
 
         返回:
-            List[io.BytesIO]: 所有获取成功的图片流集合
+            List[IO[bytes]]: 所有获取成功的图片流集合
 
         异常:
             无
@@ -422,14 +513,14 @@ class ImgRevSearcherPlugin(Star):
         async for result in self._send_image(event, img_bytes):
                 yield result
 
-    async def _perform_search(self, event: AstrMessageEvent, engine: str, img_buffer: io.BytesIO):
+    async def _perform_search(self, event: AstrMessageEvent, engine: str, img_buffer: IO[bytes]):
         """
-        调用模型执行图片反向搜索（含异常提示图渲染）
+        调用模型执行图片反向搜索（含异常提示图渲染），结束后释放并关闭图片数据流
 
         参数:
             event: 消息事件对象
             engine: 引擎名称
-            img_buffer: 图片二进制流
+            img_buffer: 图片二进制流，由本方法负责关闭
 
         返回:
             yield图片/提示
@@ -437,25 +528,44 @@ class ImgRevSearcherPlugin(Star):
         异常:
             出错时生成错误提示图片
         """
-        file_bytes = img_buffer.getvalue()
-        result_text = await self.search_model.search(api=engine, file=file_bytes)
+        file_data = view_buffer(img_buffer)
+        try:
+            async for result in self._search_and_reply(event, engine, file_data):
+                yield result
+        finally:
+            close_buffer(img_buffer, file_data)
+
+    async def _search_and_reply(self, event: AstrMessageEvent, engine: str, file_data):
+        """
+        执行搜索并发送结果图片及文本
+
+        参数:
+            event: 消息事件对象
+            engine: 引擎名称
+            file_data: 图片数据视图
+
+        返回:
+            yield图片/提示
+
+        异常:
+            无
+        """
+        try:
+            result_text = await self.search_model.search(api=engine, file=file_data)
+        except CircuitOpenError as e:
+            yield event.plain_result(
+                f"引擎 {engine} 近期连续请求失败，暂时不可用，请约{int(e.retry_after) + 1}秒后重试或换用其他引擎"
+            )
+            return
+        except RateLimitExceeded as e:
+            yield event.plain_result(
+                f"引擎 {engine} 请求过于频繁，请约{int(e.wait) + 1}秒后重试或换用其他引擎"
+            )
+            return
         if result_text is None:
             yield event.plain_result("未找到相关结果")
             return
-        img_buffer.seek(0)
-        
-        def process_image():
-            try:
-                source_image = Image.open(img_buffer)
-                result_img = self.search_model.draw_results(engine, result_text, source_image)
-            except Exception as e:
-                result_img = self.search_model.draw_error(engine, str(e))
-            output = io.BytesIO()
-            result_img.save(output, format="JPEG", quality=85)
-            output.seek(0)
-            return output.getvalue()
-        
-        img_bytes = await asyncio.to_thread(process_image)
+        img_bytes = await self.search_model.render_results(engine, result_text, file_data)
         async for result in self._send_image(event, img_bytes):
                 yield result
         if self.auto_send_text_results:
@@ -529,8 +639,7 @@ class ImgRevSearcherPlugin(Star):
             无
         """
         yield event.plain_result("等待超时，操作取消")
-        if user_id in self.user_states:
-            del self.user_states[user_id]
+        self._discard_user_state(user_id)
         event.stop_event()
 
     def _get_engine_by_name(self, engine_name: str) -> str:
@@ -561,8 +670,24 @@ class ImgRevSearcherPlugin(Star):
         异常:
             无
         """
-        if user_id in self.user_states:
-            del self.user_states[user_id]
+        self._discard_user_state(user_id)
+
+    def _discard_user_state(self, user_id: str):
+        """
+        移除用户状态，并关闭其中尚未用于搜索的预载图片
+
+        参数:
+            user_id: 用户ID
+
+        返回:
+            无
+
+        异常:
+            无
+        """
+        state = self.user_states.pop(user_id, None)
+        if state and state.get("preloaded_img"):
+            close_buffer(state.pop("preloaded_img"))
 
     async def _handle_waiting_text_confirm(self, event: AstrMessageEvent, state: dict, user_id: str):
         """
@@ -581,7 +706,7 @@ class ImgRevSearcherPlugin(Star):
         """
         message_text = get_message_text(event.message_obj)
         if time.time() - state["timestamp"] > self.text_confirm_timeout:
-            del self.user_states[user_id]
+            self._discard_user_state(user_id)
             event.stop_event()
             return
         elif message_text.strip().lower() == "是":
@@ -603,7 +728,7 @@ class ImgRevSearcherPlugin(Star):
                     await event.send(event.chain_result([nodes]))
                 except Exception as e:
                     yield event.plain_result(f"发送搜索结果失败: {str(e)}")
-            del self.user_states[user_id]
+            self._discard_user_state(user_id)
             event.stop_event()
 
     async def _handle_waiting_engine(self, event: AstrMessageEvent, state: dict, user_id: str):
@@ -632,15 +757,17 @@ class ImgRevSearcherPlugin(Star):
         if actual_engine in self.available_engines:
             state["engine"] = actual_engine
             if state.get("preloaded_img"):
+                img_buffer = state.pop("preloaded_img")
                 self._clear_waiting_states_before_search(user_id)
                 try:
-                    async for result in self._perform_search(event, state["engine"], state["preloaded_img"]):
+                    async for result in self._perform_search(event, state["engine"], img_buffer):
                         yield result
                 except Exception:
                     yield event.plain_result("搜索失败，请重试")
             else:
                 state["step"] = "waiting_image"
                 state["timestamp"] = time.time()
+                self._schedule_prewarm([actual_engine])
                 yield event.plain_result(f"已选择引擎: {message_text}，请在{self.search_params_timeout}秒内发送一张图片，我会进行搜索")
         else:
             if actual_engine in ALL_ENGINES and actual_engine not in self.available_engines:
@@ -653,7 +780,7 @@ class ImgRevSearcherPlugin(Star):
                 state["invalid_attempts"] += 1
                 if state["invalid_attempts"] >= 2:
                     yield event.plain_result("连续两次输入错误的引擎名，已取消操作")
-                    del self.user_states[user_id]
+                    self._discard_user_state(user_id)
                 else:
                     yield event.plain_result(f"引擎 '{message_text}' 不存在，请回复有效的引擎名（如{example_engine}）")
                     state["timestamp"] = time.time()
@@ -698,7 +825,7 @@ class ImgRevSearcherPlugin(Star):
                 state["invalid_attempts"] += 1
                 if state["invalid_attempts"] >= 2:
                     yield event.plain_result("连续两次输入错误的引擎名，已取消操作")
-                    del self.user_states[user_id]
+                    self._discard_user_state(user_id)
                     event.stop_event()
                     return
                 else:
@@ -717,10 +844,14 @@ class ImgRevSearcherPlugin(Star):
         if img_buffer and not state.get('preloaded_img'):
             state["preloaded_img"] = img_buffer
             updated = True
+        elif img_buffer:
+            # 已有预载图片，新下载的图片不再使用
+            close_buffer(img_buffer)
         if state.get("engine") and state.get("preloaded_img"):
+            img_buffer = state.pop("preloaded_img")
             self._clear_waiting_states_before_search(user_id)
             try:
-                async for result in self._perform_search(event, state["engine"], state["preloaded_img"]):
+                async for result in self._perform_search(event, state["engine"], img_buffer):
                     yield result
             except Exception:
                 yield event.plain_result("搜索失败，请重试")
@@ -781,7 +912,7 @@ class ImgRevSearcherPlugin(Star):
         返回:
             tuple: (引擎名称或None, 图片缓冲区或None, 错误信息字典或None)
                 - 引擎名称: 有效的引擎名称或None
-                - 图片缓冲区: 图片数据的BytesIO对象或None
+                - 图片缓冲区: 图片数据流或None
                 - 错误信息: 包含错误类型和相关信息的字典或None
                     {
                         'type': 'invalid_engine' | 'disabled_engine',
@@ -843,8 +974,7 @@ class ImgRevSearcherPlugin(Star):
             yield event.plain_result("当前没有可用的搜索引擎，请联系管理员在配置中启用至少一个引擎")
             event.stop_event()
             return
-        if user_id in self.user_states:
-            del self.user_states[user_id]
+        self._discard_user_state(user_id)
         engine, img_buffer, error = await self._parse_initial_command(event)
         if error:
             state = {
@@ -856,6 +986,7 @@ class ImgRevSearcherPlugin(Star):
             if error['type'] == 'invalid_engine':
                 state["invalid_attempts"] = 1  
             self.user_states[user_id] = state
+            self._schedule_prewarm(self.available_engines)
             yield event.plain_result(error['message'])
             async for result in self._send_engine_prompt(event, state):
                 yield result
@@ -877,6 +1008,7 @@ class ImgRevSearcherPlugin(Star):
             "engine": engine
         }
         self.user_states[user_id] = state
+        self._schedule_prewarm([engine] if engine else self.available_engines)
         async for result in self._send_engine_prompt(event, state):
             yield result
         event.stop_event()
@@ -906,7 +1038,7 @@ class ImgRevSearcherPlugin(Star):
         if not state:
             return
         if state.get("step") == "waiting_text_confirm" and time.time() - state["timestamp"] > self.text_confirm_timeout:
-            del self.user_states[user_id]
+            self._discard_user_state(user_id)
             event.stop_event()
             return
         if time.time() - state["timestamp"] > self.search_params_timeout:
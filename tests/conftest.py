@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 插件根目录不是可安装的包，测试直接从源码目录导入ImgRevSearcher
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
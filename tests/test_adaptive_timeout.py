@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ImgRevSearcher.utils.adaptive_timeout import AdaptiveTimeout
+from ImgRevSearcher.utils.api_request import base_req as base_req_module
+from ImgRevSearcher.utils.api_request.base_req import BaseSearchReq
+from ImgRevSearcher.utils.latency import LatencyTracker
+
+
+class DummyReq(BaseSearchReq):
+    async def search(self, url=None, file=None, **kwargs):
+        raise NotImplementedError
+
+
+def tracker_with(samples, engine="engine", step="get"):
+    tracker = LatencyTracker()
+    for sample in samples:
+        tracker.record(engine, step, sample)
+    return tracker
+
+
+def test_disabled_or_insufficient_samples_use_static_timeout():
+    tracker = tracker_with([1.0] * 5)
+    assert AdaptiveTimeout(enabled=False, min_samples=1).timeout_for(tracker, "engine", "get") is None
+    assert AdaptiveTimeout(enabled=True, min_samples=6).timeout_for(tracker, "engine", "get") is None
+
+
+def test_timeout_is_clamped_between_min_and_max():
+    policy = AdaptiveTimeout(enabled=True, factor=3.0, min_timeout=5.0, max_timeout=20.0, min_samples=3)
+    assert policy.timeout_for(tracker_with([0.1] * 3), "engine", "get") == 5.0
+    assert policy.timeout_for(tracker_with([3.0] * 3), "engine", "get") == 9.0
+    assert policy.timeout_for(tracker_with([60.0] * 3), "engine", "get") == 20.0
+
+
+def test_timeout_widens_after_a_timed_out_attempt(monkeypatch):
+    tracker = tracker_with([0.02] * 3, engine="adaptive")
+    monkeypatch.setattr(base_req_module, "latency_tracker", tracker)
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        raise httpx.ReadTimeout("slow", request=request)
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        req = DummyReq(
+            "https://adaptive.test",
+            client=client,
+            engine="adaptive",
+            timeout_policy=AdaptiveTimeout(enabled=True, quantile=0.99, factor=2.0, min_timeout=0.01, min_samples=3),
+        )
+        try:
+            for _ in range(2):
+                with pytest.raises(httpx.ReadTimeout):
+                    await req._send_request("get", endpoint="page")
+        finally:
+            await client.aclose()
+
+    asyncio.run(scenario())
+    assert timeouts == [pytest.approx(0.04), pytest.approx(0.08)]
+    assert tracker.count("adaptive", "get") == 5
@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ImgRevSearcher.utils.api_request import base_req as base_req_module
+from ImgRevSearcher.utils.api_request.base_req import BaseSearchReq
+from ImgRevSearcher.utils.bandwidth import BandwidthMeter, measure_response
+from ImgRevSearcher.utils.hedge import HedgePolicy
+from ImgRevSearcher.utils.latency import LatencyTracker
+from ImgRevSearcher.utils.network import HEDGE_EXTENSION
+from ImgRevSearcher.utils.stream_match import MarkerMatcher
+
+
+class DummyReq(BaseSearchReq):
+    async def search(self, url=None, file=None, **kwargs):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def meter(monkeypatch):
+    meter = BandwidthMeter()
+    monkeypatch.setattr(base_req_module, "bandwidth_meter", meter)
+    monkeypatch.setattr(base_req_module, "latency_tracker", LatencyTracker())
+    return meter
+
+
+def test_measure_response_counts_headers_and_bodies():
+    request = httpx.Request("POST", "https://bandwidth.test/upload", content=b"12345")
+    response = httpx.Response(200, content=b"abc", request=request)
+    stats = measure_response(response, 3)
+    assert stats.requests == 1
+    assert stats.body_sent == 5 and stats.body_decoded == 3
+    assert stats.header_bytes > len("POST /upload HTTP/1.1")
+    assert stats.total_bytes == stats.header_bytes + 5 + stats.body_received
+
+
+def test_streamed_response_counts_only_bytes_read(meter):
+    head = b"x" * 1000
+    script = b"<script>window.cardData = [];</script>"
+    tail = b"y" * 100_000
+
+    async def body():
+        for chunk in (head, script, tail):
+            yield chunk
+
+    def handler(request):
+        return httpx.Response(200, content=body())
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        req = DummyReq("https://bandwidth.test", client=client, engine="stream")
+        try:
+            resp = await req._send_request(
+                "get", endpoint="page", step="page", matcher=MarkerMatcher(b"window.cardData", b"</script>")
+            )
+        finally:
+            await client.aclose()
+        return resp, req.transfer
+
+    resp, transfer = asyncio.run(scenario())
+    assert resp.content == b"window.cardData = [];"
+    assert transfer.body_decoded == len(head) + len(script)
+    assert transfer.body_received == len(head) + len(script)
+    assert meter.snapshot()["engines"]["stream"]["steps"]["page"]["body_decoded"] == len(head) + len(script)
+
+
+def test_hedged_request_counts_only_the_winning_response(meter):
+    base_req_module.latency_tracker.record("hedged", "get", 0.01)
+
+    async def handler(request):
+        if HEDGE_EXTENSION not in request.extensions:
+            await asyncio.sleep(1)
+            return httpx.Response(200, content=b"primary" * 100)
+        return httpx.Response(200, content=b"hedge")
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        req = DummyReq(
+            "https://bandwidth.test",
+            client=client,
+            engine="hedged",
+            hedge_policy=HedgePolicy(enabled=True, quantile=0.5, min_samples=1, min_delay=0.01),
+        )
+        try:
+            resp = await req._send_request("get", endpoint="page")
+        finally:
+            await client.aclose()
+        return resp, req.transfer
+
+    resp, transfer = asyncio.run(scenario())
+    assert resp.content == b"hedge"
+    assert transfer.requests == 1
+    assert transfer.body_decoded == len(b"hedge")
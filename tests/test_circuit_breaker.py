@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from ImgRevSearcher.model import BaseSearchModel
+from ImgRevSearcher.utils import circuit_breaker as circuit_breaker_module
+from ImgRevSearcher.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from ImgRevSearcher.utils.deadline import DeadlineExceeded
+from ImgRevSearcher.utils.rate_limiter import RateLimitExceeded
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_opens_after_threshold_and_probes_after_recovery(clock):
+    breaker = CircuitBreaker(failure_threshold=2, window=60, recovery_timeout=30)
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+    clock[0] += 30
+    assert breaker.allow_request() and breaker.state == HALF_OPEN
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow_request()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+
+
+def test_failures_outside_window_do_not_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, window=10)
+    breaker.record_failure()
+    clock[0] += 11
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+
+def test_released_probe_can_be_retried_immediately(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow_request()
+    breaker.release_probe()
+    assert breaker.state == HALF_OPEN and breaker.allow_request()
+
+
+def run_failing_search(error=None, status_codes=(200,)):
+    async def scenario():
+        model = BaseSearchModel(circuit_breaker={"failure_threshold": 1, "recovery_timeout": 30})
+
+        async def fake_search_engine(api, file=None, url=None, deadline=None, status_codes=None, **kwargs):
+            status_codes.extend(codes)
+            if error is not None:
+                raise error
+            response = SimpleNamespace(show_result=lambda: None, confirmed_empty=False)
+            return response, SimpleNamespace(status_codes=list(codes), transfer=SimpleNamespace(body_decoded=0))
+
+        codes = list(status_codes)
+        model._search_engine = fake_search_engine
+        try:
+            await model._search_once("saucenao", file=b"x")
+        except RateLimitExceeded:
+            pass
+        breaker = model._breakers["saucenao"]
+        await model.close()
+        return breaker
+
+    return asyncio.run(scenario())
+
+
+def test_transport_errors_and_server_statuses_open_the_breaker():
+    assert run_failing_search(httpx.ConnectError("unreachable")).state == OPEN
+    assert run_failing_search(status_codes=(200, 503)).state == OPEN
+    assert run_failing_search(status_codes=(429,)).state == OPEN
+    assert run_failing_search(ValueError("parser bug"), status_codes=(502,)).state == OPEN
+
+
+def test_local_errors_do_not_open_the_breaker():
+    assert run_failing_search(DeadlineExceeded("upload", 10)).state == CLOSED
+    assert run_failing_search(KeyError("parser bug")).state == CLOSED
+    assert run_failing_search(status_codes=(503, 200)).state == CLOSED
+    assert run_failing_search(status_codes=(404,)).state == CLOSED
+
+
+def test_rate_limited_probe_releases_the_slot(clock):
+    async def scenario():
+        model = BaseSearchModel(circuit_breaker={"failure_threshold": 1, "recovery_timeout": 30})
+        breaker = model._breakers["saucenao"]
+        breaker.record_failure()
+        clock[0] += 30
+
+        async def rate_limited(*args, **kwargs):
+            raise RateLimitExceeded("saucenao.com", 5)
+
+        model._search_engine = rate_limited
+        with pytest.raises(RateLimitExceeded):
+            await model._search_once("saucenao", file=b"x")
+        allowed = breaker.allow_request()
+        await model.close()
+        return allowed
+
+    assert asyncio.run(scenario())
+
+
+def test_open_breaker_rejects_search():
+    async def scenario():
+        model = BaseSearchModel(circuit_breaker={"failure_threshold": 1})
+        model._breakers["saucenao"].record_failure()
+        try:
+            await model._search_once("saucenao", file=b"x")
+        finally:
+            await model.close()
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(scenario())
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from ImgRevSearcher.utils.api_request import base_req as base_req_module
+from ImgRevSearcher.utils.api_request.base_req import EXPECTED_DURATION_MIN_SAMPLES, BaseSearchReq
+from ImgRevSearcher.utils import deadline as deadline_module
+from ImgRevSearcher.utils.deadline import Deadline, DeadlineExceeded
+from ImgRevSearcher.utils.latency import LatencyTracker
+
+
+class DummyReq(BaseSearchReq):
+    async def search(self, url=None, file=None, **kwargs):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    tracker = LatencyTracker()
+    monkeypatch.setattr(base_req_module, "latency_tracker", tracker)
+    return tracker
+
+
+def test_remaining_and_allows_follow_the_clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(deadline_module.time, "monotonic", lambda: now[0])
+    deadline = Deadline(10)
+    now[0] += 4
+    assert deadline.remaining() == 6
+    assert deadline.allows(5) and not deadline.allows(6)
+    with pytest.raises(DeadlineExceeded):
+        deadline.check("upload", 7)
+    now[0] += 20
+    assert deadline.remaining() == 0
+    assert Deadline(None).allows(1e9)
+
+
+def test_multi_hop_engine_shares_one_budget(tracker):
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.2)
+        return httpx.Response(200, text="ok")
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        req = DummyReq("https://deadline.test", client=client, engine="multi-hop", deadline=Deadline(0.3))
+        start = time.monotonic()
+        try:
+            await req._send_request("get", endpoint="upload", step="upload")
+            with pytest.raises(DeadlineExceeded) as info:
+                await req._send_request("get", endpoint="results", step="results")
+        finally:
+            await client.aclose()
+        return info.value.step, time.monotonic() - start
+
+    step, elapsed = asyncio.run(scenario())
+    assert step == "results"
+    assert elapsed < 0.4
+    assert calls == ["/upload", "/results"]
+
+
+def test_step_is_skipped_when_its_median_exceeds_the_remaining_budget(tracker):
+    for _ in range(EXPECTED_DURATION_MIN_SAMPLES):
+        tracker.record("slow-engine", "results", 5.0)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200)
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        req = DummyReq("https://deadline.test", client=client, engine="slow-engine", deadline=Deadline(1))
+        try:
+            await req._send_request("get", endpoint="results", step="results")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(scenario())
+    assert calls == []
@@ -0,0 +1,95 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ImgRevSearcher.utils.dns_cache import CachingNetworkBackend, DNSCache
+
+
+class SlowResolver:
+    def __init__(self, ttl, delay):
+        self.ttl = ttl
+        self.delay = delay
+        self.queries = 0
+
+    async def resolve(self, host, rdtype):
+        self.queries += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(rrset=SimpleNamespace(ttl=self.ttl))
+
+
+def make_cache(addresses, resolver=None, **kwargs):
+    cache = DNSCache(**kwargs)
+    cache._resolver = resolver
+    state = {"addresses": addresses, "queries": 0}
+
+    async def query(host):
+        state["queries"] += 1
+        if isinstance(state["addresses"], Exception):
+            raise state["addresses"]
+        return list(state["addresses"])
+
+    cache._query = query
+    return cache, state
+
+
+def test_resolve_does_not_wait_for_ttl_lookup():
+    async def scenario():
+        resolver = SlowResolver(ttl=120, delay=0.2)
+        cache, _ = make_cache(["10.0.0.1"], resolver, ttl=300, min_ttl=30)
+        start = time.monotonic()
+        addresses = await cache.resolve("engine.example")
+        elapsed = time.monotonic() - start
+        first_ttl = cache._entries["engine.example"].expires_at - cache._entries["engine.example"].resolved_at
+        await asyncio.sleep(0.3)
+        learned_ttl = cache._entries["engine.example"].expires_at - cache._entries["engine.example"].resolved_at
+        cache.invalidate("engine.example")
+        await cache.resolve("engine.example")
+        return addresses, elapsed, first_ttl, learned_ttl, resolver.queries
+
+    addresses, elapsed, first_ttl, learned_ttl, queries = asyncio.run(scenario())
+    assert addresses == ["10.0.0.1"]
+    assert elapsed < 0.1
+    assert first_ttl == pytest.approx(300)
+    assert learned_ttl == pytest.approx(120)
+    assert queries == 1
+
+
+def test_entries_are_served_from_cache_until_expiry():
+    async def scenario():
+        cache, state = make_cache(["10.0.0.1"])
+        await cache.resolve("engine.example")
+        await cache.resolve("engine.example")
+        return state["queries"], cache.hits
+
+    assert asyncio.run(scenario()) == (1, 1)
+
+
+def test_stale_entry_is_used_when_resolution_fails():
+    async def scenario():
+        cache, state = make_cache(["10.0.0.1"])
+        await cache.resolve("engine.example")
+        cache.mark_stale("engine.example")
+        state["addresses"] = OSError("resolver down")
+        return await cache.resolve("engine.example"), cache.stale_hits
+
+    assert asyncio.run(scenario()) == (["10.0.0.1"], 1)
+
+
+def test_failed_connect_marks_entry_for_refresh_instead_of_deleting():
+    class RefusingBackend:
+        async def connect_tcp(self, host, port, **kwargs):
+            raise OSError(f"refused {host}")
+
+    async def scenario():
+        cache, state = make_cache(["10.0.0.1", "10.0.0.2"])
+        backend = CachingNetworkBackend(cache, RefusingBackend())
+        with pytest.raises(OSError):
+            await backend.connect_tcp("engine.example", 443)
+        entry = cache._entries.get("engine.example")
+        state["addresses"] = OSError("resolver down")
+        stale = await cache.resolve("engine.example")
+        return entry is not None and entry.expires_at <= time.monotonic(), stale
+
+    assert asyncio.run(scenario()) == (True, ["10.0.0.1", "10.0.0.2"])
@@ -0,0 +1,81 @@
+import asyncio
+
+from httpx import MockTransport, Request, Response
+
+from ImgRevSearcher.utils.hedge import run_hedged
+from ImgRevSearcher.utils.network import HEDGE_EXTENSION, ROUTE_EXTENSION, ClientPool
+from ImgRevSearcher.utils.proxy_pool import ProxyPool
+
+
+def test_select_excludes_primary_proxy_when_another_is_healthy():
+    pool = ProxyPool("test", ["http://a:1", "http://b:1"])
+    assert pool.select(exclude="http://a:1") == "http://b:1"
+    assert pool.select(exclude="http://b:1") == "http://a:1"
+    single = ProxyPool("single", ["http://a:1"])
+    assert single.select(exclude="http://a:1") == "http://a:1"
+
+
+def test_hedge_uses_other_proxy_and_separate_http1_pool():
+    pool = ClientPool()
+    used = []
+
+    def get_raw_transport(proxy, verify_ssl, http2, limits=None, isolated=False):
+        used.append((proxy, http2, isolated))
+        return MockTransport(lambda request: Response(200, text="ok"))
+
+    pool._get_raw_transport = get_raw_transport
+    transport = pool.get_transport(ProxyPool("test", ["http://a:1", "http://b:1"]), http2="on")
+
+    async def scenario():
+        route = {}
+        await transport.handle_async_request(
+            Request("GET", "https://example.com/", extensions={ROUTE_EXTENSION: route})
+        )
+        await transport.handle_async_request(
+            Request("GET", "https://example.com/", extensions={HEDGE_EXTENSION: route})
+        )
+        return route
+
+    route = asyncio.run(scenario())
+    (primary_proxy, primary_http2, primary_isolated), (hedge_proxy, hedge_http2, hedge_isolated) = used
+    assert route["proxy"] == primary_proxy
+    assert hedge_proxy != primary_proxy
+    assert (primary_http2, primary_isolated) == (True, False)
+    assert (hedge_http2, hedge_isolated) == (False, True)
+
+
+def test_run_hedged_sends_copy_through_hedge_factory():
+    calls = []
+
+    async def primary():
+        calls.append("primary")
+        await asyncio.sleep(1)
+        return "primary"
+
+    async def hedge():
+        calls.append("hedge")
+        return "hedge"
+
+    result = asyncio.run(run_hedged(primary, 0.01, send_hedge=hedge))
+    assert result == "hedge"
+    assert calls == ["primary", "hedge"]
+
+
+def test_losing_request_is_cancelled_and_awaited():
+    cleaned_up = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            cleaned_up.append("primary")
+
+    async def fast():
+        return "hedge"
+
+    async def scenario():
+        result = await run_hedged(slow, 0.01, send_hedge=fast)
+        # 返回时落败的请求已经结束，而不是等到事件循环之后再处理
+        return result, list(cleaned_up)
+
+    assert asyncio.run(scenario()) == ("hedge", ["primary"])
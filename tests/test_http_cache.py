@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+
+from ImgRevSearcher.utils.http_cache import HttpCache, freshness_lifetime
+from ImgRevSearcher.utils.network import ClientPool, HandOver, Network
+
+
+def fetch_twice(response_headers, request_headers=None, cookies=(None, None)):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"Cache-Control": "max-age=60"})
+        return httpx.Response(200, text="payload", headers=response_headers)
+
+    async def scenario():
+        cache = HttpCache()
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        results = []
+        for cookie in cookies:
+            handover = HandOver(client=client, http_cache=cache, cookies=cookie)
+            results.append(await handover.get("https://engine.example/page", headers=request_headers))
+        await client.aclose()
+        return results
+
+    return asyncio.run(scenario()), calls
+
+
+def test_fresh_response_is_served_from_cache():
+    (first, second), calls = fetch_twice({"Cache-Control": "max-age=60"})
+    assert len(calls) == 1
+    assert not first.from_cache and second.from_cache
+    assert second.text == "payload"
+
+
+def test_private_and_no_store_responses_are_not_stored():
+    for value in ("private, max-age=60", "no-store"):
+        (_, second), calls = fetch_twice({"Cache-Control": value})
+        assert len(calls) == 2 and not second.from_cache
+
+
+def test_authorization_requests_bypass_cache():
+    _, calls = fetch_twice({"Cache-Control": "max-age=60"}, request_headers={"Authorization": "Bearer token"})
+    assert len(calls) == 2
+
+
+def test_cookies_are_part_of_the_key():
+    calls = []
+
+    def get_raw_transport(proxy, verify_ssl, http2, limits=None, isolated=False):
+        def handler(request):
+            calls.append(request.headers.get("cookie"))
+            return httpx.Response(200, text="payload", headers={"Cache-Control": "max-age=60"})
+
+        return httpx.MockTransport(handler)
+
+    pool = ClientPool()
+    pool._get_raw_transport = get_raw_transport
+
+    async def fetch(client, cache):
+        # 与model._search_engine相同：Cookie设置在Network上，引擎只接收client
+        return await HandOver(client=client, http_cache=cache).get("https://engine.example/page")
+
+    async def scenario():
+        cache = HttpCache()
+        async with Network(cookies="sid=a", pool=pool) as user_a, Network(cookies="sid=b", pool=pool) as user_b:
+            first = await fetch(user_a, cache)
+            repeated = await fetch(user_a, cache)
+            other_user = await fetch(user_b, cache)
+            user_a.cookies.set("sid", "refreshed")
+            refreshed = await fetch(user_a, cache)
+        return first, repeated, other_user, refreshed
+
+    first, repeated, other_user, refreshed = asyncio.run(scenario())
+    assert calls == ["sid=a", "sid=b", "sid=refreshed"]
+    assert repeated.from_cache
+    assert not first.from_cache and not other_user.from_cache and not refreshed.from_cache
+
+
+def test_stale_entry_is_revalidated_with_etag():
+    (first, second), calls = fetch_twice({"Cache-Control": "no-cache", "ETag": '"v1"'})
+    assert len(calls) == 2
+    assert calls[1].headers["if-none-match"] == '"v1"'
+    assert second.status_code == 200 and second.text == "payload"
+    assert second.transfer is not None and not second.from_cache
+
+
+def test_freshness_lifetime():
+    assert freshness_lifetime(httpx.Headers({"Cache-Control": "max-age=100", "Age": "40"})) == (True, 60.0)
+    assert freshness_lifetime(httpx.Headers({"Expires": "0"})) == (True, 0.0)
+    assert freshness_lifetime(httpx.Headers({})) == (True, None)
+    assert freshness_lifetime(httpx.Headers({"Cache-Control": "private"})) == (False, None)
@@ -0,0 +1,49 @@
+import asyncio
+import io
+
+from PIL import Image
+
+from ImgRevSearcher import model as model_module
+from ImgRevSearcher.model import BaseSearchModel
+
+
+def test_source_download_follows_engine_proxy_route(monkeypatch):
+    seen = []
+
+    class RecordingNetwork:
+        def __init__(self, **kwargs):
+            seen.append(kwargs.get("proxies"))
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            return None
+
+    async def fake_stream_download(client, url, limits):
+        buffer = io.BytesIO()
+        Image.new("RGB", (4, 4)).save(buffer, "PNG")
+        buffer.seek(0)
+        return buffer, None
+
+    monkeypatch.setattr(model_module, "Network", RecordingNetwork)
+    monkeypatch.setattr(model_module, "stream_download", fake_stream_download)
+
+    async def scenario():
+        model = BaseSearchModel(
+            proxies="http://default:8080",
+            proxy_routing={"bing": "direct", "saucenao": "eu"},
+            proxy_servers=["eu=http://eu:3128"],
+        )
+
+        async def fake_search(**kwargs):
+            return None
+
+        model.search = fake_search
+        model.draw_results = lambda api, result, source_image: source_image
+        for api in ("bing", "saucenao", "tineye"):
+            assert await model.search_and_draw(api, url="https://example.com/a.png") is not None
+        await model.close()
+
+    asyncio.run(scenario())
+    assert seen == [None, "http://eu:3128", "http://default:8080"]
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+
+from ImgRevSearcher.model import BaseSearchModel
+from ImgRevSearcher.utils.response_parser import (
+    AnimeTraceResponse,
+    EHentaiResponse,
+    SauceNAOResponse,
+    TineyeResponse,
+)
+
+
+def run_search_once(response, status_codes=(200,)):
+    async def scenario():
+        model = BaseSearchModel(negative_cache={"enabled": True})
+        engine = SimpleNamespace(status_codes=list(status_codes), transfer=SimpleNamespace(body_decoded=0))
+
+        async def fake_search_engine(*args, **kwargs):
+            return response, engine
+
+        model._search_engine = fake_search_engine
+        key = ("animetrace", "digest", "{}")
+        result = await model._search_once("animetrace", file=b"x", cache_key=key)
+        cached = model.negative_cache.get(key)
+        await model.close()
+        return result, cached
+
+    return asyncio.run(scenario())
+
+
+def test_animetrace_error_code_is_not_cached():
+    response = AnimeTraceResponse({"code": 17701, "trace_id": "t", "data": []}, "")
+    assert not response.confirmed_empty
+    assert run_search_once(response) == (None, None)
+
+
+def test_animetrace_empty_success_is_cached():
+    response = AnimeTraceResponse({"code": 0, "trace_id": "t", "data": []}, "")
+    assert response.confirmed_empty
+    assert run_search_once(response) == (None, True)
+
+
+def test_confirmed_empty_with_error_status_is_not_cached():
+    response = AnimeTraceResponse({"code": 0, "trace_id": "t", "data": []}, "")
+    assert run_search_once(response, status_codes=(200, 503)) == (None, None)
+
+
+def test_saucenao_header_status():
+    data = {"status_code": 200, "header": {"status": -2}, "results": []}
+    assert not SauceNAOResponse(data, "").confirmed_empty
+    data["header"]["status"] = 0
+    assert SauceNAOResponse(data, "").confirmed_empty
+
+
+def test_ehentai_only_explicit_no_result_page():
+    assert EHentaiResponse("<html><p>No unfiltered results in this page.</p></html>", "").confirmed_empty
+    rate_limited = "<html>You are opening pages too fast, thus placing a heavy load on the server.</html>"
+    assert not EHentaiResponse(rate_limited, "").confirmed_empty
+
+
+def test_tineye_empty_matches():
+    data = {"query_hash": "h", "status_code": 200, "total_pages": 0, "matches": []}
+    assert TineyeResponse(data, "", domains=[]).confirmed_empty
+    data["status_code"] = 429
+    assert not TineyeResponse(data, "", domains=[]).confirmed_empty
+
+
+def test_client_and_server_errors_are_not_cached():
+    response = AnimeTraceResponse({"code": 0, "trace_id": "t", "data": []}, "")
+    for status in (404, 429, 500):
+        assert run_search_once(response, status_codes=(status,)) == (None, None)
+
+
+def test_parse_errors_are_not_cached():
+    class BrokenResponse:
+        confirmed_empty = True
+
+        def show_result(self):
+            raise KeyError("layout changed")
+
+    assert run_search_once(BrokenResponse()) == (None, None)
+
+
+def test_transport_errors_are_not_cached():
+    async def scenario():
+        model = BaseSearchModel(negative_cache={"enabled": True}, result_cache={"enabled": True})
+
+        async def failing_search_engine(*args, **kwargs):
+            raise httpx.ConnectError("unreachable")
+
+        model._search_engine = failing_search_engine
+        key = ("animetrace", "digest", "{}")
+        result = await model._search_once("animetrace", file=b"x", cache_key=key)
+        cached = (model.negative_cache.get(key), model.result_cache.get(key))
+        await model.close()
+        return result, cached
+
+    assert asyncio.run(scenario()) == (None, (None, None))
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+from httpx import MockTransport, RemoteProtocolError, Request, Response
+
+import pytest
+
+from ImgRevSearcher.utils.network import HTTP1_ONLY_TTL, HTTP2_FAILURE_THRESHOLD, ClientPool, Network
+
+
+@pytest.fixture(autouse=True)
+def clean_proxy_environment(monkeypatch):
+    for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+
+
+async def start_recording_proxy(seen):
+    async def handle(reader, writer):
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        seen.append(request_line.decode().strip())
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_environment_proxy_is_used_without_configured_proxy(monkeypatch):
+    async def scenario():
+        seen = []
+        server, port = await start_recording_proxy(seen)
+        monkeypatch.setenv("HTTP_PROXY", f"http://127.0.0.1:{port}")
+        pool = ClientPool()
+        pool.dns_cache = None
+        try:
+            async with Network(pool=pool, timeout=5) as client:
+                resp = await client.get("http://search.example.invalid/path")
+        finally:
+            await pool.close()
+            server.close()
+        return resp.text, seen
+
+    text, seen = asyncio.run(scenario())
+    assert text == "ok"
+    assert seen == ["GET http://search.example.invalid/path HTTP/1.1"]
+
+
+def test_environment_proxy_respects_no_proxy_and_configured_proxy(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://env-proxy:3128")
+    monkeypatch.setenv("NO_PROXY", "internal.example")
+    pool = ClientPool()
+    transport = pool.get_transport()
+    assert transport._environment_proxy(Request("GET", "https://saucenao.com/")) == "http://env-proxy:3128"
+    assert transport._environment_proxy(Request("GET", "https://api.internal.example/")) is None
+    assert transport._environment_proxy(Request("GET", "http://saucenao.com/")) is None
+    assert pool.get_transport("http://configured:8080")._env_proxies == {}
+    assert pool.get_transport(trust_env=False)._env_proxies == {}
+
+
+def make_http2_pool(fail_http2):
+    pool = ClientPool()
+    sent = []
+
+    def get_raw_transport(proxy, verify_ssl, http2, limits=None, isolated=False):
+        def handler(request):
+            sent.append((request.method, http2))
+            if http2 and fail_http2():
+                raise RemoteProtocolError("stream reset", request=request)
+            return Response(200, extensions={"http_version": b"HTTP/2" if http2 else b"HTTP/1.1"})
+
+        return MockTransport(handler)
+
+    pool._get_raw_transport = get_raw_transport
+    return pool, sent
+
+
+def test_http2_negotiation_failure_falls_back_for_safe_methods_only():
+    pool, sent = make_http2_pool(lambda: True)
+    transport = pool.get_transport(http2="auto")
+
+    async def scenario():
+        resp = await transport.handle_async_request(Request("GET", "https://h1.example/"))
+        assert resp.status_code == 200
+        with pytest.raises(RemoteProtocolError):
+            await pool.get_transport(http2="auto").handle_async_request(
+                Request("POST", "https://h1-post.example/", content=b"upload")
+            )
+
+    asyncio.run(scenario())
+    assert sent == [("GET", True), ("GET", False), ("POST", True)]
+    assert pool.is_http1_only("h1.example")
+    assert pool.is_http1_only("h1-post.example")
+
+
+def test_transient_http2_errors_need_several_failures_and_downgrade_expires(monkeypatch):
+    failing = [False]
+    pool, sent = make_http2_pool(lambda: failing[0])
+    transport = pool.get_transport(http2="auto")
+
+    async def request():
+        return await transport.handle_async_request(Request("GET", "https://h2.example/"))
+
+    async def scenario():
+        await request()
+        failing[0] = True
+        for _ in range(HTTP2_FAILURE_THRESHOLD - 1):
+            with pytest.raises(RemoteProtocolError):
+                await request()
+            assert not pool.is_http1_only("h2.example")
+        with pytest.raises(RemoteProtocolError):
+            await request()
+
+    asyncio.run(scenario())
+    assert pool.is_http1_only("h2.example")
+    assert all(http2 for _, http2 in sent)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + HTTP1_ONLY_TTL + 1)
+    assert not pool.is_http1_only("h2.example")
+    assert pool.resolve_http2("h2.example", "auto")
+
+
+def test_engines_default_to_http1():
+    from ImgRevSearcher.model import BaseSearchModel
+
+    assert BaseSearchModel()._build_network_kwargs("bing")["http2"] == "off"
@@ -0,0 +1,66 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from ImgRevSearcher.utils.perceptual import BKTree, NearDuplicateIndex, hamming, image_hashes
+
+
+def encode(img, size=None, quality=90):
+    if size is not None:
+        img = img.resize(size, Image.LANCZOS)
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def scene(shapes):
+    img = Image.new("RGB", (640, 480), "white")
+    draw = ImageDraw.Draw(img)
+    for x in range(0, 640, 8):
+        draw.rectangle([x, 0, x + 8, 480], fill=(x * 255 // 640, 90, 160))
+    for box, color in shapes:
+        draw.ellipse(box, fill=color)
+    return img
+
+
+PICTURE = scene([((60, 40, 300, 260), "yellow"), ((380, 200, 600, 460), "black")])
+OTHER = scene([((360, 20, 620, 200), "black"), ((20, 240, 260, 470), "yellow")])
+
+
+def test_flat_images_have_no_hashes():
+    for color in ("red", "blue", "white"):
+        assert image_hashes(encode(Image.new("RGB", (400, 300), color))) is None
+
+
+def test_undecodable_data_has_no_hashes():
+    assert image_hashes(b"not an image") is None
+
+
+def test_recompressed_copy_matches_and_other_image_does_not():
+    index = NearDuplicateIndex()
+    original = image_hashes(encode(PICTURE))
+    index.add("scope", original, "result")
+    copy = image_hashes(encode(PICTURE, size=(320, 240), quality=60))
+    assert index.lookup("scope", copy)[1] == "result"
+    assert index.lookup("other-scope", copy) is None
+    assert index.lookup("scope", image_hashes(encode(OTHER))) is None
+
+
+def test_phash_must_confirm_dhash_candidate():
+    index = NearDuplicateIndex(max_distance=64, max_phash_distance=0)
+    original = image_hashes(encode(PICTURE))
+    index.add("scope", original, "result")
+    other = image_hashes(encode(OTHER))
+    assert hamming(original.phash, other.phash) > 0
+    assert index.lookup("scope", other) is None
+    assert index.lookup("scope", original)[1] == "result"
+
+
+def test_bktree_search_matches_linear_scan():
+    values = [(i * 2654435761) & 0xFFFFFFFFFFFFFFFF for i in range(500)]
+    tree = BKTree()
+    for value in values:
+        tree.add(value, value)
+    query = values[123] ^ 0b1011
+    expected = sorted(hamming(query, v) for v in set(values) if hamming(query, v) <= 12)
+    assert [d for d, _, _ in tree.search(query, 12)] == expected
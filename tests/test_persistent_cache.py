@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+from ImgRevSearcher.model import BaseSearchModel
+from ImgRevSearcher.utils.persistent_cache import PersistentResultCache
+
+KEY = ("saucenao", "digest", "{}")
+
+
+def test_round_trip_across_instances(tmp_path):
+    async def scenario():
+        cache = PersistentResultCache(tmp_path / "cache.sqlite3")
+        cache.put(KEY, "saucenao", "result text", ttl=60)
+        await cache.close()
+        reopened = PersistentResultCache(tmp_path / "cache.sqlite3")
+        try:
+            return await reopened.get(KEY), await reopened.get(("saucenao", "other", "{}"))
+        finally:
+            await reopened.close()
+
+    (result, expires_at), missing = asyncio.run(scenario())
+    assert result == "result text" and missing is None
+    assert 0 < expires_at - time.time() <= 60
+
+
+def test_expired_entry_is_a_miss(tmp_path):
+    async def scenario():
+        cache = PersistentResultCache(tmp_path / "cache.sqlite3")
+        cache.put(KEY, "saucenao", "result text", ttl=0.01)
+        await cache.flush()
+        await asyncio.sleep(0.02)
+        try:
+            return await cache.get(KEY)
+        finally:
+            await cache.close()
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_unwritable_data_dir_degrades_to_miss(tmp_path):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_bytes(b"")
+
+    async def scenario():
+        cache = PersistentResultCache(blocker / "cache.sqlite3", flush_interval=0)
+        result = await cache.get(KEY)
+        cache.put(KEY, "saucenao", "result text", ttl=60)
+        await cache.flush()
+        stats = await cache.snapshot()
+        await cache.close()
+        return result, stats
+
+    result, stats = asyncio.run(scenario())
+    assert result is None
+    assert stats["writes"] == 0 and stats["entries"] is None
+
+
+def test_corrupt_payload_is_a_miss(tmp_path):
+    async def scenario():
+        cache = PersistentResultCache(tmp_path / "cache.sqlite3")
+        cache.put(KEY, "saucenao", "result text", ttl=60)
+        await cache.flush()
+        await cache._run(
+            lambda: cache._connect().execute("UPDATE results SET payload = ?", (b"garbage",))
+        )
+        try:
+            return await cache.get(KEY)
+        finally:
+            await cache.close()
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_promotion_keeps_remaining_lifetime(tmp_path):
+    async def scenario():
+        model = BaseSearchModel(
+            data_dir=str(tmp_path),
+            result_cache={"enabled": True, "saucenao": {"ttl": 3600}},
+            persistent_cache={"enabled": True},
+        )
+        model.persistent_cache.put(KEY, "saucenao", "result text", ttl=0.2)
+        await model.persistent_cache.flush()
+        model._flight_key = lambda api, file, url, kwargs: KEY
+        first = await model.search("saucenao", url="https://images.example/a.jpg")
+        remaining = model.result_cache._entries[KEY].expires_at - time.monotonic()
+        await asyncio.sleep(0.25)
+        expired = model.result_cache.get(KEY)
+        await model.close()
+        return first, remaining, expired
+
+    first, remaining, expired = asyncio.run(scenario())
+    assert first == "result text"
+    assert 0 < remaining <= 0.2
+    assert expired is None
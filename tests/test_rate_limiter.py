@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from ImgRevSearcher.utils.api_request.base_req import BaseSearchReq
+from ImgRevSearcher.utils.http_cache import HttpCache
+from ImgRevSearcher.utils.rate_limiter import DEFAULT_MAX_WAIT, RateLimit, RateLimiter, RateLimitExceeded
+
+
+class DummyReq(BaseSearchReq):
+    async def search(self, url=None, file=None, **kwargs):
+        raise NotImplementedError
+
+
+def test_penalized_host_without_config_queues_instead_of_failing():
+    async def scenario():
+        limiter = RateLimiter()
+        limiter.penalize("learned.example", 0.05)
+        start = time.monotonic()
+        await limiter.acquire("learned.example")
+        return time.monotonic() - start
+
+    assert asyncio.run(scenario()) >= 0.04
+
+
+def test_penalty_longer_than_default_max_wait_fails_fast():
+    async def scenario():
+        limiter = RateLimiter()
+        limiter.penalize("learned.example", DEFAULT_MAX_WAIT + 10)
+        await limiter.acquire("learned.example")
+
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(scenario())
+
+
+def test_configured_max_wait_is_respected():
+    async def scenario():
+        limiter = RateLimiter()
+        rate_limit = RateLimit(requests_per_minute=60, burst=1, max_wait=0.5)
+        await limiter.acquire("static.example", rate_limit)
+        await limiter.acquire("static.example", rate_limit)
+
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(scenario())
+
+
+def test_http_cache_hits_do_not_consume_tokens():
+    calls = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, text="payload", headers={"Cache-Control": "max-age=60"})
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        req = DummyReq(
+            "https://cached.rate-limit.test",
+            client=client,
+            http_cache=HttpCache(),
+            rate_limit=RateLimit(requests_per_minute=1, burst=1, max_wait=0),
+        )
+        first = await req._send_request("get", endpoint="page")
+        second = await req._send_request("get", endpoint="page")
+        with pytest.raises(RateLimitExceeded):
+            await req._send_request("get", endpoint="other")
+        await client.aclose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert not first.from_cache and second.from_cache
+    assert calls == ["https://cached.rate-limit.test/page"]
@@ -0,0 +1,83 @@
+import asyncio
+import io
+
+from PIL import Image
+
+from ImgRevSearcher import model as model_module
+from ImgRevSearcher.model import BaseSearchModel
+from ImgRevSearcher.utils.render_cache import RenderCache
+
+
+def make_model(monkeypatch, fail=False):
+    model = BaseSearchModel(render_cache={"enabled": True})
+    draws = []
+
+    def draw_results(api, result, source_image):
+        draws.append((api, result, source_image is not None))
+        if fail:
+            raise ValueError("broken layout")
+        return Image.new("RGB", (8, 8), "white")
+
+    monkeypatch.setattr(model, "draw_results", draw_results)
+    return model, draws
+
+
+def render(model, *calls):
+    async def scenario():
+        try:
+            return [await model.render_results(*call) for call in calls]
+        finally:
+            await model.close()
+
+    return asyncio.run(scenario())
+
+
+def source_bytes(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_render_cache_keys_on_engine_result_and_source(monkeypatch):
+    model, draws = make_model(monkeypatch)
+    red, blue = source_bytes("red"), source_bytes("blue")
+    first, repeated, *_ = render(
+        model,
+        ("saucenao", "result", red),
+        ("saucenao", "result", red),
+        ("saucenao", "other result", red),
+        ("saucenao", "result", blue),
+        ("bing", "result", red),
+    )
+    assert first == repeated
+    assert draws == [
+        ("saucenao", "result", True),
+        ("saucenao", "other result", True),
+        ("saucenao", "result", True),
+        ("bing", "result", True),
+    ]
+
+
+def test_render_version_bump_invalidates_cached_images(monkeypatch):
+    model, draws = make_model(monkeypatch)
+    model._render_results("saucenao", "result", None)
+    model._render_results("saucenao", "result", None)
+    monkeypatch.setattr(model_module, "RENDER_VERSION", model_module.RENDER_VERSION + 1)
+    model._render_results("saucenao", "result", None)
+    assert len(draws) == 2
+    asyncio.run(model.close())
+
+
+def test_error_images_are_not_cached(monkeypatch):
+    model, draws = make_model(monkeypatch, fail=True)
+    render(model, ("saucenao", "result", None), ("saucenao", "result", None))
+    assert len(draws) == 2
+    assert model.render_cache.snapshot()["entries"] == 0
+
+
+def test_evicted_images_spill_to_disk_and_come_back(tmp_path):
+    cache = RenderCache(max_bytes=10, spill_dir=tmp_path, max_spill_bytes=100)
+    cache.put("a", b"a" * 8)
+    cache.put("b", b"b" * 8)
+    assert cache.get("a") == b"a" * 8
+    assert cache.disk_hits == 1 and cache.evictions >= 1
@@ -0,0 +1,76 @@
+import asyncio
+from types import SimpleNamespace
+
+from ImgRevSearcher.model import BaseSearchModel
+from ImgRevSearcher.utils import result_cache as result_cache_module
+from ImgRevSearcher.utils.result_cache import ResultCache
+
+
+def test_evicts_least_recently_used_by_bytes():
+    cache = ResultCache(max_bytes=100)
+    cache.put("a", "A", ttl=60, size=40)
+    cache.put("b", "B", ttl=60, size=40)
+    assert cache.get("a") == "A"
+    cache.put("c", "C", ttl=60, size=40)
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    assert cache.snapshot()["bytes"] == 80
+    assert cache.evictions == 1
+
+
+def test_oversized_and_zero_ttl_entries_are_not_stored():
+    cache = ResultCache(max_bytes=100)
+    cache.put("big", "B", ttl=60, size=101)
+    cache.put("zero", "Z", ttl=0, size=1)
+    assert len(cache) == 0
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = ResultCache()
+    cache.put("key", "value", ttl=10, size=1)
+    now[0] += 9
+    assert cache.get("key") == "value"
+    now[0] += 2
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+class FakeResponse:
+    confirmed_empty = False
+
+    def show_result(self):
+        return "formatted result"
+
+
+def search_twice(**model_kwargs):
+    calls = []
+
+    async def scenario():
+        model = BaseSearchModel(**model_kwargs)
+
+        async def fake_search_engine(api, file=None, url=None, deadline=None, **kwargs):
+            calls.append(api)
+            engine = SimpleNamespace(status_codes=[200], transfer=SimpleNamespace(body_decoded=10))
+            return FakeResponse(), engine
+
+        model._search_engine = fake_search_engine
+        try:
+            return [await model.search("saucenao", file=b"\xff\xd8image") for _ in range(2)]
+        finally:
+            await model.close()
+
+    return asyncio.run(scenario()), calls
+
+
+def test_cache_hit_short_circuits_search():
+    results, calls = search_twice(result_cache={"enabled": True})
+    assert results == ["formatted result", "formatted result"]
+    assert calls == ["saucenao"]
+
+
+def test_result_cache_is_off_by_default():
+    results, calls = search_twice()
+    assert results == ["formatted result", "formatted result"]
+    assert calls == ["saucenao", "saucenao"]
@@ -0,0 +1,158 @@
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from ImgRevSearcher.utils.api_request.base_req import BaseSearchReq
+from ImgRevSearcher.utils.retry import (
+    RETRYABLE_STATUS_CODES,
+    RetryPolicy,
+    classify_error,
+    parse_retry_after,
+)
+
+
+class DummyReq(BaseSearchReq):
+    async def search(self, url=None, file=None, **kwargs):
+        raise NotImplementedError
+
+
+REQUEST = httpx.Request("GET", "https://retry.test/")
+
+
+@pytest.mark.parametrize(
+    "exc, expected",
+    [
+        (httpx.ConnectError("refused", request=REQUEST), "pre_send"),
+        (httpx.ConnectTimeout("slow", request=REQUEST), "pre_send"),
+        (httpx.PoolTimeout("busy", request=REQUEST), "pre_send"),
+        (httpx.ProxyError("proxy", request=REQUEST), "pre_send"),
+        (httpx.ReadError("reset", request=REQUEST), "in_flight"),
+        (httpx.ReadTimeout("slow", request=REQUEST), "in_flight"),
+        (httpx.RemoteProtocolError("closed", request=REQUEST), "in_flight"),
+        (httpx.WriteTimeout("slow", request=REQUEST), "in_flight"),
+        (httpx.UnsupportedProtocol("ftp", request=REQUEST), None),
+        (ValueError("parse"), None),
+    ],
+)
+def test_classify_error(exc, expected):
+    assert classify_error(exc) == expected
+
+
+def test_retryable_status_codes():
+    assert RETRYABLE_STATUS_CODES == {429, 502, 503, 504}
+
+
+def test_parse_retry_after_seconds_and_date():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(future) <= 30
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert parse_retry_after(past) == 0.0
+
+
+def test_should_retry_respects_kind_idempotency_and_attempts():
+    policy = RetryPolicy(max_attempts=3)
+    assert policy.should_retry("pre_send", idempotent=False, attempt=1)
+    assert policy.should_retry("in_flight", idempotent=True, attempt=1)
+    assert not policy.should_retry("in_flight", idempotent=False, attempt=1)
+    assert policy.should_retry("status", idempotent=True, attempt=2)
+    assert not policy.should_retry("status", idempotent=False, attempt=2)
+    assert not policy.should_retry("pre_send", idempotent=True, attempt=3)
+    assert not policy.should_retry(None, idempotent=True, attempt=1)
+
+
+def test_compute_delay_prefers_retry_after_and_caps_backoff():
+    policy = RetryPolicy(base_delay=0.5, max_delay=2.0)
+    assert policy.compute_delay(1, retry_after=9.0) == 9.0
+    assert all(0 <= policy.compute_delay(1) <= 0.5 for _ in range(50))
+    assert all(0 <= policy.compute_delay(10) <= 2.0 for _ in range(50))
+
+
+def test_fits_budget():
+    assert RetryPolicy().fits_budget(100, 100)
+    policy = RetryPolicy(budget=10)
+    assert policy.fits_budget(5, 4)
+    assert not policy.fits_budget(5, 5)
+
+
+def run_requests(handler, method="get", policy=None):
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        req = DummyReq(
+            "https://retry.test",
+            client=client,
+            retry_policy=policy or RetryPolicy(max_attempts=3, base_delay=0, max_delay=0),
+        )
+        try:
+            return await req._send_request(method, endpoint="search"), req.status_codes
+        finally:
+            await client.aclose()
+
+    return asyncio.run(scenario())
+
+
+def test_retryable_status_is_retried_after_retry_after():
+    attempts = []
+
+    def handler(request):
+        attempts.append(asyncio.get_running_loop().time())
+        if len(attempts) == 1:
+            return httpx.Response(503, headers={"Retry-After": "0.2"})
+        return httpx.Response(200, text="ok")
+
+    resp, status_codes = run_requests(handler)
+    assert resp.status_code == 200
+    assert status_codes == [503, 200]
+    assert attempts[1] - attempts[0] >= 0.15
+
+
+def test_non_retryable_status_is_returned_immediately():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    resp, status_codes = run_requests(handler)
+    assert resp.status_code == 404
+    assert len(calls) == 1
+
+
+def test_retry_after_beyond_budget_returns_last_response():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503, headers={"Retry-After": "60"})
+
+    resp, _ = run_requests(handler, policy=RetryPolicy(max_attempts=3, budget=5))
+    assert resp.status_code == 503
+    assert len(calls) == 1
+
+
+def test_post_is_retried_only_before_the_request_is_sent():
+    calls = []
+
+    def refuse_then_ok(request):
+        calls.append("connect")
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200)
+
+    resp, _ = run_requests(refuse_then_ok, method="post")
+    assert resp.status_code == 200
+    assert calls == ["connect", "connect"]
+
+    def reset(request):
+        calls.append("read")
+        raise httpx.ReadError("reset", request=request)
+
+    with pytest.raises(httpx.ReadError):
+        run_requests(reset, method="post")
+    assert calls.count("read") == 1
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from ImgRevSearcher.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    async def scenario():
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flights.do("k", work) for _ in range(5)))
+        return results, calls, flights.stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert results == [1] * 5
+    assert calls == 1
+    assert stats == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_exception_is_shared():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(flights.do("k", fail), flights.do("k", fail), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+def test_cancelling_one_waiter_keeps_the_flight():
+    async def scenario():
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.create_task(flights.do("k", work))
+        second = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+
+
+def test_caller_arriving_after_last_waiter_left_starts_new_flight():
+    async def scenario():
+        flights = SingleFlight()
+        started = 0
+
+        async def work():
+            nonlocal started
+            started += 1
+            try:
+                await asyncio.sleep(0.02)
+            except asyncio.CancelledError:
+                # 取消后仍需一段时间才能结束，模拟关闭连接等清理工作
+                await asyncio.sleep(0.01)
+                raise
+            return "done"
+
+        leaving = asyncio.create_task(flights.do("k", work))
+        await asyncio.sleep(0)
+        leaving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        result = await flights.do("k", work)
+        return result, started
+
+    assert asyncio.run(scenario()) == ("done", 2)
@@ -0,0 +1,57 @@
+import pytest
+
+from ImgRevSearcher.utils.stream_match import LineMatcher, MarkerMatcher
+
+
+def feed_all(matcher, chunks):
+    for chunk in chunks:
+        matched = matcher.feed(chunk)
+        if matched is not None:
+            return matched
+    return matcher.finish()
+
+
+def split_every(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+PAGE = b"<html><script>var a = 1;</script><script>window.cardData = [{\"x\": 1}];</script><p>tail</p></html>"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16, len(PAGE)])
+def test_marker_split_across_chunks(size):
+    matcher = MarkerMatcher(b"window.cardData", b"</script>")
+    assert feed_all(matcher, split_every(PAGE, size)) == b"window.cardData = [{\"x\": 1}];"
+
+
+def test_marker_missing_returns_none_and_keeps_buffer_small():
+    matcher = MarkerMatcher(b"window.cardData", b"</script>")
+    for chunk in split_every(b"z" * 10_000, 100):
+        assert matcher.feed(chunk) is None
+    assert len(matcher._buffer) < len(b"window.cardData")
+    assert matcher.finish() is None
+
+
+def test_marker_fresh_resets_state():
+    matcher = MarkerMatcher(b"start", b"end")
+    assert matcher.feed(b"xx sta") is None
+    assert matcher.feed(b"rt body") is None
+    fresh = matcher.fresh()
+    assert fresh.feed(b" body end") is None
+    assert matcher.feed(b" end") == b"start body "
+
+
+RSC = b"0:[\"$\",\"html\"]\n1:{\"ignored\":true}\n2:{\"results\":[1,2,3]}\n3:\"later\"\n"
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 9, len(RSC)])
+def test_line_split_across_chunks(size):
+    matcher = LineMatcher(b"2:")
+    assert feed_all(matcher, split_every(RSC, size)) == b"2:{\"results\":[1,2,3]}"
+
+
+def test_last_line_without_newline_matches_on_finish():
+    matcher = LineMatcher(b"2:")
+    assert matcher.feed(b"1:{}\n  2:{\"a\"") is None
+    assert matcher.feed(b":1}") is None
+    assert matcher.finish() == b"2:{\"a\":1}"
@@ -0,0 +1,77 @@
+import asyncio
+import tempfile
+
+import httpx
+import pytest
+
+from ImgRevSearcher.utils.api_request import BaiDu, EHentai
+from ImgRevSearcher.utils.upload import close_buffer, view_buffer
+
+
+def run_url_search(engine_cls, handler, max_size=16):
+    buffers = []
+    rolled = []
+
+    async def scenario():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        engine = engine_cls(client=client)
+
+        async def download(url, headers=None, on_progress=None):
+            buffer = tempfile.SpooledTemporaryFile(max_size=max_size)
+            buffer.write(b"\xff\xd8" + b"\0" * 64)
+            buffer.seek(0)
+            buffers.append(buffer)
+            return buffer
+
+        engine.download = download
+        real_send_request = engine._send_request
+
+        async def send_request(*args, **kwargs):
+            try:
+                return await real_send_request(*args, **kwargs)
+            finally:
+                rolled.extend(buffer._rolled for buffer in buffers)
+
+        engine._send_request = send_request
+        try:
+            return await engine.search(url="https://images.example/picture.jpg")
+        finally:
+            await client.aclose()
+
+    try:
+        result = asyncio.run(scenario())
+    finally:
+        assert buffers and all(buffer.closed for buffer in buffers)
+    return result, rolled
+
+
+def test_ehentai_closes_downloaded_buffer():
+    response, _ = run_url_search(EHentai, lambda request: httpx.Response(200, text="<html>No hits found</html>"))
+    assert response.confirmed_empty
+
+
+def test_upload_does_not_force_spooled_buffer_to_disk():
+    handler = lambda request: httpx.Response(200, text="<html>No hits found</html>")
+    _, rolled = run_url_search(EHentai, handler, max_size=1024)
+    assert rolled == [False]
+
+
+def test_close_buffer_releases_memory_and_mapped_views():
+    for max_size in (1024, 16):
+        buffer = tempfile.SpooledTemporaryFile(max_size=max_size)
+        buffer.write(b"\xff\xd8" + b"\0" * 64)
+        buffer.seek(0)
+        view = view_buffer(buffer)
+        assert bytes(view[:2]) == b"\xff\xd8"
+        close_buffer(buffer, view)
+        assert buffer.closed
+        with pytest.raises(ValueError):
+            view.tobytes()
+
+
+def test_baidu_closes_downloaded_buffer_on_failure():
+    def handler(request):
+        raise httpx.ConnectError("unreachable", request=request)
+
+    with pytest.raises(httpx.ConnectError):
+        run_url_search(BaiDu, handler)